@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Loading levels from asyncio code without blocking the event loop, see `Level.aread`.
+"""
+import asyncio
+import os
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+_T = TypeVar("_T")
+
+_DEFAULT_MAX_PENDING = 32
+
+
+class AsyncLevelLoader:
+    """
+    Reads level files in a worker thread and decodes them on a bounded executor.
+
+    At most `max_pending` loads are in flight at once. Further callers wait for a slot, so a burst of requests queues
+    up in the event loop instead of piling work onto the executor. Cancelling a waiting caller cancels its load. A
+    decode that has already started runs to completion in the background and its result is dropped.
+
+    :param executor: Executor to decode on. Defaults to a thread pool, which keeps the event loop responsive. A
+    `ProcessPoolExecutor` also spreads the decoding itself over several processors.
+    :param max_pending: Maximum number of loads in flight.
+    """
+    def __init__(self, executor: Executor | None = None, max_pending: int = _DEFAULT_MAX_PENDING):
+        self.executor = executor if executor is not None else ThreadPoolExecutor(thread_name_prefix="level-decode")
+        self.max_pending = max_pending
+        # semaphores belong to an event loop, keep one per loop the loader is used from
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+                weakref.WeakKeyDictionary()
+        )
+
+    async def load(self, path: str | os.PathLike, decode: Callable[[bytes], _T]) -> _T:
+        """
+        Read the file at `path` and decode its contents on the executor.
+        :param path: Path of the file.
+        :param decode: Function turning the file contents into the result, picklable if the executor is a process
+        pool.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+
+        async with semaphore:
+            data = await asyncio.to_thread(Path(path).read_bytes)
+            return await asyncio.wrap_future(self.executor.submit(decode, data))
+
+    def close(self) -> None:
+        """
+        Shut the executor down, cancelling decodes that have not started yet.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default_loader: AsyncLevelLoader | None = None
+
+
+def get_default_loader() -> AsyncLevelLoader:
+    """
+    Return the loader `Level.aread` uses when none is given, creating it on first use.
+    """
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = AsyncLevelLoader()
+    return _default_loader
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Parallel conversion of whole directory trees of level files, to JSON dumps or recompiled .dat files.
+
+    PYTHONPATH=src python -m level.batch levels/ dumps/ --format json --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from level.level_data import Level
+from level.level_reader import PeggleMappedReader
+from level.level_writer import PeggleDataWriter
+
+_SUFFIXES = {"json": ".json", "dat": ".dat"}
+
+
+@dataclass(slots=True)
+class ConversionResult:
+    """
+    Outcome of converting a single level file.
+
+    :param source: Path of the level file.
+    :param destination: Path of the converted file.
+    :param size: Size of the level file in bytes.
+    :param seconds: Time spent converting it in the worker.
+    :param error: Formatted exception if the conversion failed, otherwise None.
+    """
+    source: Path
+    destination: Path
+    size: int
+    seconds: float
+    error: str | None = None
+
+
+def iter_level_files(directory: str | os.PathLike) -> Iterator[Path]:
+    """
+    Yield every .dat file in the directory tree, in a stable order.
+    """
+    return iter(sorted(Path(directory).rglob("*.dat")))
+
+
+def convert_file(source: Path, destination: Path, output_format: str = "json") -> ConversionResult:
+    """
+    Read a level file and write it out as a JSON dump or a recompiled .dat file. Exceptions are captured in the
+    result rather than raised, so that one broken file does not abort a batch. The converted file is written to a
+    temporary file first, so a failed conversion never leaves a partial one at `destination`.
+    """
+    start = time.perf_counter()
+    try:
+        size = source.stat().st_size
+        with PeggleMappedReader(source) as f:
+            level = Level.read_data(f)
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        mode = "w" if output_format == "json" else "wb"
+        with tempfile.NamedTemporaryFile(mode, dir=destination.parent, suffix=".tmp", delete=False) as f:
+            try:
+                if output_format == "json":
+                    level.dump_json(f)
+                else:
+                    level.write_data(PeggleDataWriter(f))
+            except BaseException:
+                f.close()
+                os.remove(f.name)
+                raise
+        os.replace(f.name, destination)
+    except Exception as e:
+        return ConversionResult(source, destination, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+    return ConversionResult(source, destination, size, time.perf_counter() - start)
+
+
+def convert_directory(
+        source_directory: str | os.PathLike,
+        destination_directory: str | os.PathLike,
+        output_format: str = "json",
+        max_workers: int | None = None,
+) -> Iterator[ConversionResult]:
+    """
+    Convert every level file in a directory tree across a process pool, mirroring the tree in the destination.
+    :param source_directory: Root of the level files.
+    :param destination_directory: Root of the converted files.
+    :param output_format: "json" for `Level.dump_json` output, "dat" for `Level.write_data` output.
+    :param max_workers: Number of worker processes, defaults to the number of processors.
+    :return: Iterator yielding a `ConversionResult` per file, in completion order. Files whose worker died get a
+    failed result too.
+    """
+    if output_format not in _SUFFIXES:
+        raise ValueError(f"unknown output format {output_format!r}")
+
+    source_directory = Path(source_directory)
+    destination_directory = Path(destination_directory)
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {}
+        for source in iter_level_files(source_directory):
+            destination = (destination_directory / source.relative_to(source_directory)).with_suffix(
+                    _SUFFIXES[output_format]
+            )
+            futures[executor.submit(convert_file, source, destination, output_format)] = source, destination
+
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # e.g. `BrokenProcessPool` after a worker was killed, which fails every file still pending
+                source, destination = futures[future]
+                result = ConversionResult(source, destination, 0, 0.0, f"{type(e).__name__}: {e}")
+            yield result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a directory tree of Peggle level files.")
+    parser.add_argument("source", help="directory containing .dat level files")
+    parser.add_argument("destination", help="directory to write the converted files to")
+    parser.add_argument("--format", choices=sorted(_SUFFIXES), default="json", help="output format")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converted = failed = total_size = 0
+    for result in convert_directory(args.source, args.destination, args.format, args.workers):
+        if result.error is None:
+            converted += 1
+            total_size += result.size
+        else:
+            failed += 1
+            print(f"{result.source}: {result.error}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    print(
+            f"converted {converted} files ({total_size / 2 ** 20:.1f}MiB), {failed} failed, in {elapsed:.2f}s: "
+            f"{converted / elapsed:.1f} files/s, {total_size / 2 ** 20 / elapsed:.2f}MiB/s"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
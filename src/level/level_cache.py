@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Persistent, content-addressed cache of decoded levels.
+
+    cache = LevelCache("~/.cache/peggletools")
+    level = cache.read_file("levels/level1.dat")
+
+Entries are keyed by the hash of the file contents, its file version and a digest of the decoder's own source, so
+editing the level code invalidates every entry it might have produced. Decoded levels are stored as pickles, see
+`objects.pickling`, and the least recently used entries are evicted once the cache grows past its size limit.
+"""
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+_FILE_VERSION = struct.Struct("<i")
+_SUFFIX = ".pickle"
+_DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+_library_digest: str | None = None
+
+
+def get_library_digest() -> str:
+    """
+    Digest of the source files of the `level` and `objects` packages, standing in for a library version.
+    """
+    global _library_digest
+    if _library_digest is None:
+        digest = hashlib.sha256()
+        for package in (Path(__file__).parent, Path(__file__).parent.parent / "objects"):
+            for path in sorted(package.rglob("*.py")):
+                digest.update(path.relative_to(package.parent).as_posix().encode())
+                digest.update(path.read_bytes())
+        _library_digest = digest.hexdigest()
+    return _library_digest
+
+
+class LevelCache:
+    """
+    On-disk cache of decoded levels with size-bounded LRU eviction.
+
+    :param directory: Directory to keep entries in, created if needed.
+    :param max_bytes: Total size of the entries above which the least recently used ones are evicted.
+    """
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = _DEFAULT_MAX_BYTES):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def get_key(data: bytes) -> str:
+        """
+        Cache key of the level file contents `data`.
+        """
+        file_version = _FILE_VERSION.unpack_from(data)[0] if len(data) >= _FILE_VERSION.size else None
+        digest = hashlib.sha256(f"{get_library_digest()}:{file_version}:".encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def read_file(self, path: str | os.PathLike) -> Level:
+        """
+        Return the level stored in the file at `path`, decoding it only if it is not cached yet.
+        """
+        with open(path, "rb") as f:
+            return self.read_bytes(f.read())
+
+    def read_bytes(self, data: bytes) -> Level:
+        """
+        Return the level encoded in `data`, decoding it only if it is not cached yet.
+        """
+        entry = self.directory / f"{self.get_key(data)}{_SUFFIX}"
+        try:
+            with open(entry, "rb") as f:
+                level = pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            _logger.warning("discarding unreadable cache entry %s: %s", entry, e)
+            entry.unlink(missing_ok=True)
+        else:
+            # mark as recently used for eviction
+            os.utime(entry)
+            return level
+
+        level = Level.read_data(PeggleBufferReader(data))
+        self._store(entry, pickle.dumps(level, protocol=5))
+        return level
+
+    def _store(self, entry: Path, payload: bytes) -> None:
+        # write to a temporary file first, so that concurrent readers never see a partial entry
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(payload)
+        os.replace(f.name, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in `max_bytes`.
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # evicted by another process in the meantime
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        for entry in self.directory.glob(f"*{_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Columnar view of level data for bulk analytics over many levels, e.g.
+
+    columns = LevelColumns.read_data(PeggleBufferReader(data))
+    orange_density = sum(columns.can_be_orange) / len(columns)
+"""
+import math
+from array import array
+from typing import Any
+
+from level.level_index import LevelIndex
+
+
+class LevelColumns(LevelIndex):
+    """
+    Struct-of-arrays view of the objects of a level, read straight from the data stream without building
+    `PeggleObject`s.
+
+    Row `i` of every column describes `Level.level_objects[i]` of the same file:
+
+    - `object_type`: `TYPE_VALUE` of the object.
+    - `x`, `y`: fixed coordinates of circles, bricks and polygons, the midpoint of rods, NaN otherwise.
+    - `radius`: radius of circles, NaN otherwise.
+    - `peg_type`: `PegInfo.type`, -1 for objects without peg info.
+    - `can_be_orange`: 1 if the object has peg info that allows it to be orange, 0 otherwise.
+    - `movement_type`: `int(MovementType)` of the object's movement, 0 (no movement) for static objects.
+
+    The columns are `array`s, so they can be wrapped without copying, e.g. `numpy.frombuffer(columns.x, "f4")`.
+    """
+    def __init__(self, file_version: int):
+        super().__init__(file_version)
+        self.x = array("f")
+        self.y = array("f")
+        self.radius = array("f")
+        self.peg_type = array("b")
+        self.can_be_orange = array("B")
+        self.movement_type = array("B")
+
+        self._movement_types: list[int] = []
+
+    def _add_row(self, row: dict[str, Any]) -> None:
+        movement = row.get("movement")
+        self.x.append(row.get("x", math.nan))
+        self.y.append(row.get("y", math.nan))
+        self.radius.append(row.get("radius", math.nan))
+        self.peg_type.append(row.get("peg_type", -1))
+        self.can_be_orange.append(row.get("can_be_orange", False))
+        self.movement_type.append(
+                self._movement_types[movement[1]] if movement is not None and movement[0] == "movement" else 0
+        )
+
+    def _add_movement(self, movement_type: int) -> None:
+        self._movement_types.append(movement_type)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
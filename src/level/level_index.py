@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Skip-index over the object stream of a level, and a level that only decodes its objects when they are accessed.
+"""
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Self, Any, overload
+
+from level.level_data import Level
+from level.level_reader import PeggleDataReader, PeggleBufferReader
+from objects.movement_data import Movement
+from objects.object import PeggleObject
+
+_OBJECT = "object"
+_MOVEMENT = "movement"
+
+
+class LevelIndex:
+    """
+    Structural scan of a level: the byte range and type of every object and movement stored inline, found by skipping
+    over their fields with `scan_data` instead of decoding them.
+
+    Row `i` of `object_type`, `object_start` and `object_end` describes `Level.level_objects[i]` of the same file. The
+    start offset is that of the object type, right after the lead id. Entries of `joint_object_order` are
+    `("object", row)` and `("movement", index)` keys standing in for the entries of `Level.joint_object_order`.
+    """
+    def __init__(self, file_version: int):
+        self.file_version = file_version
+        self.object_type = array("i")
+        self.object_start = array("q")
+        self.object_end = array("q")
+        self.movement_start = array("q")
+        self.movement_end = array("q")
+
+        self.joint_object_order: list[tuple[str, int] | None] = [None, None, None]
+        self._joint_object_keys: set[tuple[str, int]] = set()
+        self._object_movements: list[tuple[str, int] | None] = []
+        self._submovements: list[tuple[str, int] | None] = []
+
+    def __len__(self) -> int:
+        return len(self.object_type)
+
+    @classmethod
+    def read_data(cls, f: PeggleDataReader) -> Self:
+        file_version = f.read_int()
+        f.read_byte()
+
+        object_count = f.read_int()
+        index = cls(file_version)
+
+        for _ in range(object_count):
+            index._add_to_joint_object_order(index._read_object(file_version, f))
+
+        return index
+
+    def _add_to_joint_object_order(self, key: Any) -> None:
+        """
+        Counterpart of `Level.add_to_joint_object_order`, so that link ids resolve to the same entries.
+        """
+        if key in self._joint_object_keys:
+            return
+
+        self.joint_object_order.append(key)
+        self._joint_object_keys.add(key)
+
+        movement = self._object_movements[key[1]] if key[0] == _OBJECT else None
+        while movement is not None and movement not in self._joint_object_keys:
+            self.joint_object_order.append(movement)
+            self._joint_object_keys.add(movement)
+            movement = self._submovements[movement[1]]
+
+    def _add_row(self, row: dict[str, Any]) -> None:
+        """
+        Hook for subclasses to store more of what `scan_data` found out about an object.
+        """
+
+    def _read_object(self, file_version: int, f: PeggleDataReader) -> Any:
+        lead_id = f.read_int()
+        if lead_id != 1:
+            return self.joint_object_order[lead_id]
+
+        start = f.position
+        row: dict[str, Any] = {}
+        PeggleObject.scan_data(
+                file_version,
+                f,
+                row,
+                object_callback=self._read_object,
+                movement_callback=self._read_movement,
+        )
+
+        self.object_type.append(row["object_type"])
+        self.object_start.append(start)
+        self.object_end.append(f.position)
+        self._object_movements.append(row.get("movement"))
+        self._add_row(row)
+        return _OBJECT, len(self.object_type) - 1
+
+    def _read_movement(self, file_version: int, f: PeggleDataReader) -> Any:
+        lead_id = f.read_int()
+        if lead_id != 1:
+            return self.joint_object_order[lead_id]
+
+        start = f.position
+        movement_type, submovement = Movement.scan_data(
+                file_version,
+                f,
+                object_callback=self._read_object,
+                movement_callback=self._read_movement,
+        )
+
+        self.movement_start.append(start)
+        self.movement_end.append(f.position)
+        self._submovements.append(submovement)
+        self._add_movement(movement_type)
+        return _MOVEMENT, len(self.movement_start) - 1
+
+    def _add_movement(self, movement_type: int) -> None:
+        """
+        Hook for subclasses to store more of what `scan_data` found out about a movement.
+        """
+
+
+class LazyLevel(Sequence[PeggleObject]):
+    """
+    Level whose objects are only decoded when they are accessed, in the order of `Level.level_objects`.
+
+    Reading one only scans the object stream into a `LevelIndex`. Indexing decodes the object at its recorded offset,
+    along with the objects and movements it links to, and caches the result so that shared entries keep their
+    identity like in a fully read `Level`.
+    """
+    def __init__(self, data: bytes | bytearray | memoryview, index: LevelIndex):
+        self.buffer = memoryview(data)
+        self.index = index
+        self._objects: dict[int, PeggleObject] = {}
+        self._movements: dict[int, Movement] = {}
+        self._strings: dict[bytes, str] = {}
+        self._object_rows = {start: row for row, start in enumerate(index.object_start)}
+        self._movement_rows = {start: row for row, start in enumerate(index.movement_start)}
+
+    @classmethod
+    def read_data(cls, f: PeggleBufferReader) -> Self:
+        """
+        Scan the level data in the buffer of `f`, starting at its current position.
+        """
+        return cls(f.buffer, LevelIndex.read_data(f))
+
+    @property
+    def file_version(self) -> int:
+        return self.index.file_version
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @overload
+    def __getitem__(self, item: int) -> PeggleObject:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> list[PeggleObject]:
+        ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._get_object(row) for row in range(*item.indices(len(self)))]
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("level object index out of range")
+        return self._get_object(item)
+
+    def __iter__(self) -> Iterator[PeggleObject]:
+        return (self._get_object(row) for row in range(len(self)))
+
+    def to_level(self) -> Level:
+        """
+        Decode every object and return the level `Level.read_data` would have returned for the same data.
+        """
+        level = Level(self.file_version, self)
+        level.movement_pool = [self._get_movement(row) for row in range(len(self.index.movement_start))]
+        for key in self.index.joint_object_order[3:]:
+            if key[0] == _OBJECT:
+                level.add_to_joint_object_order(self._get(key))
+        return level
+
+    def _get(self, key: Any) -> Any:
+        if key is None:
+            return None
+        kind, row = key
+        return self._get_object(row) if kind == _OBJECT else self._get_movement(row)
+
+    def _get_object(self, row: int) -> PeggleObject:
+        obj = self._objects.get(row)
+        if obj is None:
+            f = PeggleBufferReader(self.buffer, self.index.object_start[row], self._strings)
+            obj = PeggleObject.read_data(
+                    self.file_version,
+                    f,
+                    object_callback=self._read_object,
+                    movement_callback=self._read_movement,
+            )
+            self._objects[row] = obj
+        return obj
+
+    def _get_movement(self, row: int) -> Movement:
+        movement = self._movements.get(row)
+        if movement is None:
+            f = PeggleBufferReader(self.buffer, self.index.movement_start[row], self._strings)
+            movement = Movement.read_data(
+                    self.file_version,
+                    f,
+                    object_callback=self._read_object,
+                    movement_callback=self._read_movement,
+            )
+            self._movements[row] = movement
+        return movement
+
+    def _read_object(self, file_version: int, f: PeggleDataReader) -> Any:
+        lead_id = f.read_int()
+        if lead_id != 1:
+            return self._get(self.index.joint_object_order[lead_id])
+
+        row = self._object_rows[f.position]
+        f.position = self.index.object_end[row]
+        return self._get_object(row)
+
+    def _read_movement(self, file_version: int, f: PeggleDataReader) -> Any:
+        lead_id = f.read_int()
+        if lead_id != 1:
+            return self._get(self.index.joint_object_order[lead_id])
+
+        row = self._movement_rows[f.position]
+        f.position = self.index.movement_end[row]
+        return self._get_movement(row)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+In-place editing of object fields in a level file.
+
+    with LevelPatcher("levels/level1.dat") as patcher:
+        for row in range(len(patcher)):
+            if (position := patcher.get(row, "specific_data.position")) is not None:
+                patcher.set(row, "specific_data.position", Point2D(position.x + 5.0, position.y))
+            patcher.set(row, "generic_data.peg_data.can_be_orange", True)
+
+The fields of every object are located by a single structural scan of the file when it is opened, see
+`PeggleObject.locate_data`. Fixed-width values are then overwritten through a writable `mmap`, so only the pages
+holding them are touched. Edits that change the layout of an object, because they add or remove a
+flag-guarded payload or change a string, are queued instead and applied on `flush` by decoding the whole level and
+writing it again.
+"""
+import mmap
+import os
+from io import BytesIO
+from typing import Self, Any
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader, PeggleDataReader
+from level.level_writer import PeggleDataWriter
+from objects.flag_codec import FieldLocation
+from objects.movement_data import Movement
+from objects.object import PeggleObject
+
+
+def _set_attribute_path(obj: Any, path: str, value: Any) -> None:
+    *parents, name = path.split(".")
+    for parent in parents:
+        obj = getattr(obj, parent)
+    setattr(obj, name, value)
+
+
+class LevelPatcher:
+    """
+    Level file opened for editing object fields in place.
+
+    Objects are addressed by row, which is their index in `Level.level_objects` of the same file, and fields by their
+    attribute path from the object, like "specific_data.position" or "generic_data.peg_data.type".
+
+    :param path: Path of the .dat file.
+    """
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self._file = open(path, "r+b")
+        # field locations of every object, by row
+        self._locations: list[dict[str, FieldLocation]] = []
+        # edits waiting for a full re-encode, by row
+        self._pending: dict[int, list[tuple[str, Any]]] = {}
+        self._map()
+
+    def _map(self) -> None:
+        self._mapping = mmap.mmap(self._file.fileno(), 0)
+        f = PeggleBufferReader(self._mapping)
+        self.file_version = f.read_int()
+        f.read_byte()
+
+        object_count = f.read_int()
+        self._locations = []
+        for _ in range(object_count):
+            self._locate_object(self.file_version, f)
+        f.buffer.release()
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def locate(self, row: int) -> dict[str, FieldLocation]:
+        """
+        Locations of the fields of the object in `row`, by attribute path. Fields of movements and polygon vertices
+        are not located.
+        """
+        return self._locations[row]
+
+    def get(self, row: int, field: str) -> Any:
+        """
+        Value of `field` of the object in `row`, including edits not flushed yet.
+        :raises KeyError: If the field is not located, see `locate`.
+        """
+        for pending_field, value in reversed(self._pending.get(row, [])):
+            if pending_field == field:
+                return value
+        return self.locate(row)[field].read(self._mapping)
+
+    def set(self, row: int, field: str, value: Any) -> bool:
+        """
+        Set `field` of the object in `row` to `value`.
+        :return: Whether the field was overwritten in place. If not, the edit is applied on `flush`, along with any
+        later edit of the same object.
+        """
+        if row not in self._pending:
+            location = self.locate(row).get(field)
+            if location is not None and location.write(self._mapping, value):
+                return True
+
+        self._pending.setdefault(row, []).append((field, value))
+        return False
+
+    def flush(self) -> None:
+        """
+        Write out the edits made so far. If any of them changed the layout of an object, the level is decoded, edited
+        and encoded again, after which rows follow the order `Level.write_data` stored the objects in.
+        """
+        self._mapping.flush()
+        if not self._pending:
+            return
+
+        f = PeggleBufferReader(self._mapping)
+        level = Level.read_data(f)
+        f.buffer.release()
+        for row, edits in self._pending.items():
+            for field, value in edits:
+                _set_attribute_path(level.level_objects[row], field, value)
+
+        stream = BytesIO()
+        level.write_data(PeggleDataWriter(stream))
+
+        self._mapping.close()
+        self._file.seek(0)
+        self._file.write(stream.getbuffer())
+        self._file.truncate()
+        self._file.flush()
+
+        self._pending.clear()
+        self._map()
+
+    def close(self) -> None:
+        """
+        Flush the edits and close the file. The file is closed even if flushing fails.
+        """
+        try:
+            self.flush()
+        finally:
+            self._mapping.close()
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _locate_object(self, file_version: int, f: PeggleDataReader) -> None:
+        # rows follow `Level.level_objects`, where objects stored inline in another one come before it
+        if f.read_int() == 1:
+            locations: dict[str, FieldLocation] = {}
+            PeggleObject.locate_data(
+                    file_version,
+                    f,
+                    locations,
+                    object_callback=self._locate_object,
+                    movement_callback=self._skip_movement,
+            )
+            self._locations.append(locations)
+
+    def _skip_movement(self, file_version: int, f: PeggleDataReader) -> None:
+        if f.read_int() == 1:
+            Movement.scan_data(
+                    file_version,
+                    f,
+                    object_callback=self._locate_object,
+                    movement_callback=self._skip_movement,
+            )
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
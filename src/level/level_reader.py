@@ -5,67 +5,250 @@ Created on 2023/11/23
 @author: brassbeat
 """
 
+import mmap
+import os
 import struct
-from typing import BinaryIO
+import sys
+from array import array
+from typing import BinaryIO, Self
 
-import logging
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
+_INT = struct.Struct("<i")
+_SHORT = struct.Struct("<h")
+_BYTE = struct.Struct("<b")
+_FLOAT = struct.Struct("<f")
+_STRING_SIZE = struct.Struct("<H")
 
 
 class PeggleDataReader:
-    def __init__(self, file: BinaryIO):
+    """
+    Reads level data from a binary stream.
+
+    Strings repeat a lot within a level and across a level pack, mostly image names. Decoded strings are kept in
+    `strings`, keyed by their encoded bytes, so every repeat returns the same `str` object without decoding it again.
+    Pass the same dict to several readers to share it across levels.
+    """
+    def __init__(self, file: BinaryIO, strings: dict[bytes, str] | None = None):
         self.file = file
         self.position = 0
+        self.strings: dict[bytes, str] = {} if strings is None else strings
+
+    def label(self, field: str) -> None:
+        """
+        Name the field about to be read. Only called when tracing is enabled, see `level.tracing`.
+        """
 
     def read_int(self) -> int:
-        data = struct.unpack("<i", self.file.read(4))[0]
-        _logger.debug(f"Read int data point {data!r} from position {self.position}.")
+        data = _INT.unpack(self.file.read(4))[0]
         self.position += 4
         return data
 
     def read_short(self) -> int:
-        data = struct.unpack("<h", self.file.read(2))[0]
-        _logger.debug(f"Read short data point {data!r} from position {self.position}.")
+        data = _SHORT.unpack(self.file.read(2))[0]
         self.position += 2
         return data
 
     def read_byte(self) -> int:
-        data = struct.unpack("<b", self.file.read(1))[0]
-        _logger.debug(f"Read byte data point {data!r} from position {self.position}.")
+        data = _BYTE.unpack(self.file.read(1))[0]
         self.position += 1
         return data
 
     def read_float(self) -> float:
-        data = struct.unpack("<f", self.file.read(4))[0]
-        _logger.debug(f"Read float data point {data!r} from position {self.position}.")
+        data = _FLOAT.unpack(self.file.read(4))[0]
         self.position += 4
         return data
 
+    def read_struct(self, layout: struct.Struct) -> tuple:
+        """
+        Read a fixed-width run of fields in one go.
+        :param layout: Precompiled little-endian layout of the run.
+        :return: Unpacked field values.
+        """
+        data = layout.unpack(self.file.read(layout.size))
+        self.position += layout.size
+        return data
+
+    def read_array(self, typecode: str, count: int) -> array:
+        """
+        Read a run of `count` values of the same type straight into a compact array.
+        :param typecode: `array` typecode of the values.
+        :param count: Number of values to read.
+        """
+        data = array(typecode)
+        data.frombytes(self.file.read(count * data.itemsize))
+        if sys.byteorder == "big":
+            data.byteswap()
+        self.position += count * data.itemsize
+        return data
+
     def read_bitfield(self, size: int) -> int:  # I chose IntFlags to represent these internally, so return an int
         raw_data = self.file.read(size)
-        _logger.debug(f"Read raw bitfield data {raw_data} from position {self.position}")
         data = int.from_bytes(raw_data, byteorder="little", signed=False)
-        _logger.debug(f"Read bitfield data point {data!r} of size {size}.")
         self.position += size
         return data
 
     def read_string(self) -> str:
-        size: int = struct.unpack("<H", self.file.read(2))[0]
-        _logger.debug(f"Found string size of {size}.")
-        bytes_data = struct.unpack(f"<{size}s", self.file.read(size))[0]
-        data = str(bytes_data, encoding="ascii")
-        _logger.debug(f"Read string data point {data!r} from position {self.position}.")
+        size: int = _STRING_SIZE.unpack(self.file.read(2))[0]
+        bytes_data = self.file.read(size)
+        data = self.strings.get(bytes_data)
+        if data is None:
+            data = self.strings[bytes_data] = str(bytes_data, encoding="ascii")
         self.position += size + 2
         return data
 
     def read_raw(self, size: int) -> bytes:
         data = self.file.read(size)
-        _logger.debug(f"Read raw data point {data!r} of size {size} from position {self.position}.")
         self.position += size
         return data
 
+    def skip(self, size: int) -> None:
+        """
+        Advance past `size` bytes without decoding them.
+        """
+        self.file.read(size)
+        self.position += size
+
+    def skip_string(self) -> None:
+        """
+        Advance past a string without decoding it.
+        """
+        size: int = _STRING_SIZE.unpack(self.file.read(2))[0]
+        self.file.read(size)
+        self.position += size + 2
+
+    def get_raw(self, start: int, end: int) -> bytes:
+        """
+        Return the bytes between the stream positions `start` and `end` that were already read, by seeking back to
+        them. Needs a seekable stream, which is left at the position it was at.
+        """
+        current = self.file.tell()
+        self.file.seek(current - (self.position - start))
+        data = self.file.read(end - start)
+        self.file.seek(current)
+        return data
+
+
+class PeggleBufferReader(PeggleDataReader):
+    """
+    Reader over level data that is already in memory.
+
+    Accepts anything supporting the buffer protocol (`bytes`, `bytearray`, `memoryview`, `mmap`) and decodes fields
+    in place at an offset cursor, so no file read is issued per field.
+    """
+    def __init__(
+            self,
+            data: bytes | bytearray | memoryview,
+            position: int = 0,
+            strings: dict[bytes, str] | None = None,
+    ):
+        self.buffer = memoryview(data)
+        self.position = position
+        self.strings: dict[bytes, str] = {} if strings is None else strings
+
+    @classmethod
+    def from_file(cls, file: BinaryIO) -> Self:
+        """
+        Read the remainder of `file` in a single call and return a reader over it.
+        """
+        return cls(file.read())
+
+    def read_int(self) -> int:
+        data = _INT.unpack_from(self.buffer, self.position)[0]
+        self.position += 4
+        return data
+
+    def read_short(self) -> int:
+        data = _SHORT.unpack_from(self.buffer, self.position)[0]
+        self.position += 2
+        return data
+
+    def read_byte(self) -> int:
+        data = _BYTE.unpack_from(self.buffer, self.position)[0]
+        self.position += 1
+        return data
+
+    def read_float(self) -> float:
+        data = _FLOAT.unpack_from(self.buffer, self.position)[0]
+        self.position += 4
+        return data
+
+    def read_struct(self, layout: struct.Struct) -> tuple:
+        data = layout.unpack_from(self.buffer, self.position)
+        self.position += layout.size
+        return data
+
+    def read_array(self, typecode: str, count: int) -> array:
+        data = array(typecode)
+        end = self.position + count * data.itemsize
+        data.frombytes(self.buffer[self.position:end])
+        if sys.byteorder == "big":
+            data.byteswap()
+        self.position = end
+        return data
+
+    def read_bitfield(self, size: int) -> int:
+        end = self.position + size
+        data = int.from_bytes(self.buffer[self.position:end], byteorder="little", signed=False)
+        self.position = end
+        return data
+
+    def read_string(self) -> str:
+        size: int = _STRING_SIZE.unpack_from(self.buffer, self.position)[0]
+        start = self.position + 2
+        end = start + size
+        bytes_data = self.buffer[start:end].tobytes()
+        data = self.strings.get(bytes_data)
+        if data is None:
+            data = self.strings[bytes_data] = str(bytes_data, encoding="ascii")
+        self.position = end
+        return data
+
+    def read_raw(self, size: int) -> bytes:
+        end = self.position + size
+        data = bytes(self.buffer[self.position:end])
+        self.position = end
+        return data
+
+    def skip(self, size: int) -> None:
+        self.position += size
+
+    def skip_string(self) -> None:
+        self.position += 2 + _STRING_SIZE.unpack_from(self.buffer, self.position)[0]
+
+    def get_raw(self, start: int, end: int) -> bytes:
+        return self.buffer[start:end].tobytes()
+
+
+class PeggleMappedReader(PeggleBufferReader):
+    """
+    Reader over a level file mapped into memory, so fields are decoded straight from the page cache without copying
+    the file into a buffer first.
+
+        with PeggleMappedReader(path) as f:
+            level = Level.read_data(f)
+
+    The mapping stays open until `close` is called. Anything still holding on to `buffer`, like a `LazyLevel` read
+    from this reader, has to be dropped before that.
+    """
+    def __init__(self, path: str | os.PathLike, strings: dict[bytes, str] | None = None):
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size:
+                self.mapping: mmap.mmap | None = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # empty files cannot be mapped
+                self.mapping = None
+        super().__init__(self.mapping if self.mapping is not None else b"", strings=strings)
+
+    def close(self) -> None:
+        self.buffer.release()
+        if self.mapping is not None:
+            self.mapping.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
 
 def main():
     pass
@@ -6,56 +6,134 @@ Created on 2023/11/23
 """
 
 import struct
+import sys
+from array import array
 from typing import BinaryIO
 
-import logging
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
+_INT = struct.Struct("<i")
+_SHORT = struct.Struct("<h")
+_BYTE = struct.Struct("<b")
+_FLOAT = struct.Struct("<f")
+_STRING_SIZE = struct.Struct("<H")
 
 
 class PeggleDataWriter:
+    """
+    Writes level data to a binary stream.
+
+    Flags precede the fields they describe, but are only known once every field has been visited. Writers of flagged
+    blocks therefore `reserve` the flag, write the payload and then `patch_bitfield`/`patch_struct` the flag in. While
+    any reservation is open, output goes to a reusable scratch buffer that is handed to the file in a single write
+    once the outermost reservation is patched.
+    """
     def __init__(self, file: BinaryIO):
         self.file = file
         self.position = 0
+        self.scratch = bytearray()
+        self._scratch_position = 0
+        self._open_reservations = 0
+        self._sink = file.write
+        # encoded size prefix and payload of every string written so far
+        self._encoded_strings: dict[str, bytes] = {}
+
+    def label(self, field: str) -> None:
+        """
+        Name the field about to be written. Only called when tracing is enabled, see `level.tracing`.
+        """
 
     def write_int(self, data: int):
-        self.file.write(struct.pack("<i", data))
-        _logger.debug(f"Wrote int data point {data!r} at position {self.position}.")
+        self._sink(_INT.pack(data))
         self.position += 4
 
     def write_short(self, data: int):
-        self.file.write(struct.pack("<h", data))
-        _logger.debug(f"Wrote short data point {data!r} at position {self.position}.")
+        self._sink(_SHORT.pack(data))
         self.position += 2
 
     def write_byte(self, data: int):
-        self.file.write(struct.pack("<b", data))
-        _logger.debug(f"Wrote byte data point {data!r} at position {self.position}.")
+        self._sink(_BYTE.pack(data))
         self.position += 1
 
     def write_float(self, data: float):
-        self.file.write(struct.pack("<f", data))
-        _logger.debug(f"Wrote int data point {data!r} at position {self.position}.")
+        self._sink(_FLOAT.pack(data))
         self.position += 4
 
+    def write_struct(self, layout: struct.Struct, *data) -> None:
+        """
+        Write a fixed-width run of fields in one go.
+        :param layout: Precompiled little-endian layout of the run.
+        :param data: Field values, in layout order.
+        """
+        self._sink(layout.pack(*data))
+        self.position += layout.size
+
+    def write_array(self, data: array) -> None:
+        """
+        Write a compact array of same-typed values in one go.
+        """
+        if sys.byteorder == "big":
+            data = array(data.typecode, data)
+            data.byteswap()
+        self._sink(data.tobytes())
+        self.position += len(data) * data.itemsize
+
     def write_bitfield(self, data: int, size: int):
-        self.file.write(data.to_bytes(size, byteorder="little", signed=False))
-        _logger.debug(f"Wrote bitfield data point {data!r} of size {size} at position {self.position}.")
+        self._sink(data.to_bytes(size, byteorder="little", signed=False))
         self.position += size
 
     def write_string(self, data: str):
-        size = len(data)
-        bytes_data = data.encode(encoding="ascii")
-        self.file.write(struct.pack(f"<H{size}s", size, bytes_data))
-        _logger.debug(f"Wrote string data point {data!r} of size {size+2} at position {self.position}.")
-        self.position += size + 2
+        encoded = self._encoded_strings.get(data)
+        if encoded is None:
+            bytes_data = data.encode(encoding="ascii")
+            encoded = self._encoded_strings[data] = _STRING_SIZE.pack(len(bytes_data)) + bytes_data
+        self._sink(encoded)
+        self.position += len(encoded)
 
     def write_raw(self, data: bytes):
-        self.file.write(data)
-        _logger.debug(f"Wrote raw data point {data!r} of size {len(data)} at position {self.position}.")
+        self._sink(data)
         self.position += len(data)
 
+    def overwrite_int(self, position: int, data: int) -> None:
+        """
+        Overwrite an int that was already written, for counts that are only known once everything after them is.
+        Needs a seekable file, and no reservation may be open.
+        :param position: Stream position of the int, as `position` was right before it was written.
+        """
+        end = self.file.tell()
+        self.file.seek(end - (self.position - position))
+        self.file.write(_INT.pack(data))
+        self.file.seek(end)
+
+    def reserve(self, size: int) -> int:
+        """
+        Reserve `size` bytes to be filled in later by one of the `patch_*` methods.
+        :return: Stream position of the reserved bytes.
+        """
+        if not self._open_reservations:
+            self._scratch_position = self.position
+            self._sink = self.scratch.extend
+        self._open_reservations += 1
+
+        position = self.position
+        self._sink(bytes(size))
+        self.position += size
+        return position
+
+    def patch_bitfield(self, position: int, data: int, size: int) -> None:
+        self._patch(position, data.to_bytes(size, byteorder="little", signed=False))
+
+    def patch_struct(self, position: int, layout: struct.Struct, *data) -> None:
+        self._patch(position, layout.pack(*data))
+
+    def _patch(self, position: int, data: bytes) -> None:
+        start = position - self._scratch_position
+        self.scratch[start:start + len(data)] = data
+
+        self._open_reservations -= 1
+        if not self._open_reservations:
+            self.file.write(self.scratch)
+            self.scratch.clear()
+            self._sink = self.file.write
+
 
 def main():
     pass
@@ -4,10 +4,11 @@ Created on 2023/11/23
 
 @author: brassbeat
 """
-from typing import Protocol, Self
+from typing import Protocol, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from objects.flag_codec import FieldLocation
 
 
 class PeggleObjectData(Protocol):
@@ -18,10 +19,32 @@ class PeggleObjectData(Protocol):
     def write_data(self, file_version: int, f: PeggleDataWriter, **kwargs) -> None:
         ...
 
+    def to_json(self) -> dict[str, Any]:
+        ...
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        ...
+
 
 class SpecificObjectData(PeggleObjectData):
     TYPE_VALUE: int
 
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        ...
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        ...
+
 
 def main():
     pass
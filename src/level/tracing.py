@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Opt-in structured tracing for the level codec.
+
+The codec never formats or logs anything on its own. Field names are only reported to the reader/writer when the
+`PEGGLETOOLS_TRACE` environment variable is set before the package is imported, in which case every call site is
+guarded by the module-level `TRACE_ENABLED` constant. To record a trace, wrap a reader or writer:
+
+    reader = TracingReader(PeggleBufferReader(data))
+    level = Level.read_data(reader)
+    for offset, field, value in reader.trace:
+        ...
+"""
+import logging
+import os
+import struct
+from array import array
+from typing import Any, NamedTuple
+
+from level.level_reader import PeggleDataReader
+from level.level_writer import PeggleDataWriter
+
+TRACE_ENABLED: bool = os.environ.get("PEGGLETOOLS_TRACE", "") not in ("", "0")
+
+_logger = logging.getLogger(__name__)
+
+
+class TraceEntry(NamedTuple):
+    offset: int
+    field: str
+    value: Any
+
+
+class TracingReader(PeggleDataReader):
+    """
+    Wraps another reader and records an entry for every primitive read from it.
+
+    Entries are labelled with the most recent field name passed to `label`, or with the primitive type if no label
+    was given.
+    """
+    def __init__(self, inner: PeggleDataReader):
+        self.inner = inner
+        self.trace: list[TraceEntry] = []
+        self._field: str | None = None
+
+    @property
+    def position(self) -> int:
+        return self.inner.position
+
+    def label(self, field: str) -> None:
+        self._field = field
+
+    def _record(self, kind: str, offset: int, value: Any) -> Any:
+        field = self._field or kind
+        self.trace.append(TraceEntry(offset, field, value))
+        _logger.debug("%d: read %s %s = %r", offset, kind, field, value)
+        return value
+
+    def read_int(self) -> int:
+        return self._record("int", self.inner.position, self.inner.read_int())
+
+    def read_short(self) -> int:
+        return self._record("short", self.inner.position, self.inner.read_short())
+
+    def read_byte(self) -> int:
+        return self._record("byte", self.inner.position, self.inner.read_byte())
+
+    def read_float(self) -> float:
+        return self._record("float", self.inner.position, self.inner.read_float())
+
+    def read_struct(self, layout: struct.Struct) -> tuple:
+        return self._record(f"struct{layout.format}", self.inner.position, self.inner.read_struct(layout))
+
+    def read_array(self, typecode: str, count: int) -> array:
+        return self._record(f"array{typecode}", self.inner.position, self.inner.read_array(typecode, count))
+
+    def read_bitfield(self, size: int) -> int:
+        return self._record(f"bitfield{size}", self.inner.position, self.inner.read_bitfield(size))
+
+    def read_string(self) -> str:
+        return self._record("string", self.inner.position, self.inner.read_string())
+
+    def read_raw(self, size: int) -> bytes:
+        return self._record(f"raw{size}", self.inner.position, self.inner.read_raw(size))
+
+    def skip(self, size: int) -> None:
+        self._record(f"skip{size}", self.inner.position, self.inner.skip(size))
+
+    def skip_string(self) -> None:
+        self._record("skip_string", self.inner.position, self.inner.skip_string())
+
+    def get_raw(self, start: int, end: int) -> bytes:
+        return self.inner.get_raw(start, end)
+
+
+class TracingWriter(PeggleDataWriter):
+    """
+    Wraps another writer and records an entry for every primitive written to it.
+    """
+    def __init__(self, inner: PeggleDataWriter):
+        self.inner = inner
+        self.trace: list[TraceEntry] = []
+        self._field: str | None = None
+
+    @property
+    def position(self) -> int:
+        return self.inner.position
+
+    def label(self, field: str) -> None:
+        self._field = field
+
+    def _record(self, kind: str, value: Any) -> None:
+        field = self._field or kind
+        self.trace.append(TraceEntry(self.inner.position, field, value))
+        _logger.debug("%d: write %s %s = %r", self.inner.position, kind, field, value)
+
+    def write_int(self, data: int):
+        self._record("int", data)
+        self.inner.write_int(data)
+
+    def write_short(self, data: int):
+        self._record("short", data)
+        self.inner.write_short(data)
+
+    def write_byte(self, data: int):
+        self._record("byte", data)
+        self.inner.write_byte(data)
+
+    def write_float(self, data: float):
+        self._record("float", data)
+        self.inner.write_float(data)
+
+    def write_struct(self, layout: struct.Struct, *data) -> None:
+        self._record(f"struct{layout.format}", data)
+        self.inner.write_struct(layout, *data)
+
+    def write_array(self, data: array) -> None:
+        self._record(f"array{data.typecode}", data)
+        self.inner.write_array(data)
+
+    def write_bitfield(self, data: int, size: int):
+        self._record(f"bitfield{size}", data)
+        self.inner.write_bitfield(data, size)
+
+    def write_string(self, data: str):
+        self._record("string", data)
+        self.inner.write_string(data)
+
+    def write_raw(self, data: bytes):
+        self._record(f"raw{len(data)}", data)
+        self.inner.write_raw(data)
+
+    def reserve(self, size: int) -> int:
+        return self.inner.reserve(size)
+
+    def patch_bitfield(self, position: int, data: int, size: int) -> None:
+        self.trace.append(TraceEntry(position, f"patch bitfield{size}", data))
+        _logger.debug("%d: patch bitfield%d = %r", position, size, data)
+        self.inner.patch_bitfield(position, data, size)
+
+    def patch_struct(self, position: int, layout: struct.Struct, *data) -> None:
+        self.trace.append(TraceEntry(position, f"patch struct{layout.format}", data))
+        _logger.debug("%d: patch struct%s = %r", position, layout.format, data)
+        self.inner.patch_struct(position, layout, *data)
+
+    def overwrite_int(self, position: int, data: int) -> None:
+        self.trace.append(TraceEntry(position, "overwrite int", data))
+        _logger.debug("%d: overwrite int = %r", position, data)
+        self.inner.overwrite_int(position, data)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
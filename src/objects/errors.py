@@ -5,3 +5,8 @@ Created on 2023/12/10
 @author: brassbeat
 """
 
+
+class HierarchyCycleError(ValueError):
+    """
+    Raised when a level object or movement ends up nested inside itself, e.g. a movement that is its own submovement.
+    """
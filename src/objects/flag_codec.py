@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Table-driven codec for runs of flag-guarded fields.
+
+Most object blocks consist of a bitfield followed by the fields whose bits are set, in a fixed order. Instead of
+spelling out an `if Flag.X in flag:` branch per field for both directions, each block lists its fields once as
+`FlagField`s and a `FlagCodec` generates plain Python reader, writer and skip functions from that table at import
+time. The generated code only tests bits on plain ints, and only contains tracing calls when `TRACE_ENABLED` is set.
+"""
+import struct
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from level.level_reader import PeggleDataReader
+from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.point_2d import Point2D
+
+COLOR = struct.Struct("<4b")
+
+_STRING_SIZE = struct.Struct("<H")
+
+# field kind: (read expression, write statement with `{value}` placeholder)
+_KINDS: dict[str, tuple[str, str]] = {
+    "int": ("f.read_int()", "f.write_int({value})"),
+    "short": ("f.read_short()", "f.write_short({value})"),
+    "byte": ("f.read_byte()", "f.write_byte({value})"),
+    "float": ("f.read_float()", "f.write_float({value})"),
+    "string": ("f.read_string()", "f.write_string({value})"),
+    "bitfield": ("f.read_bitfield(1)", "f.write_bitfield({value}, 1)"),
+    "point": ("Point2D.read_data(file_version, f)", "{value}.write_data(file_version, f)"),
+    "color": ("list(f.read_struct(COLOR))", "f.write_struct(COLOR, *{value})"),
+}
+
+# field kind: payload size in bytes, None for strings
+_SIZES: dict[str, int | None] = {
+    "int": 4,
+    "short": 2,
+    "byte": 1,
+    "float": 4,
+    "string": None,
+    "bitfield": 1,
+    "point": 8,
+    "color": 4,
+}
+
+# field kind: layout of the payload, for the kinds that can be overwritten in place
+_LAYOUTS: dict[str, struct.Struct] = {
+    "int": struct.Struct("<i"),
+    "short": struct.Struct("<h"),
+    "byte": struct.Struct("<b"),
+    "float": struct.Struct("<f"),
+    "bitfield": struct.Struct("<B"),
+    "point": struct.Struct("<ff"),
+    "color": COLOR,
+}
+
+
+@dataclass(frozen=True)
+class FlagField:
+    """
+    One entry of a flag codec table.
+
+    :param bit: Flag bit guarding the field.
+    :param name: Attribute name of the field, or several attribute names if the bit guards consecutive values of the
+    same kind. The first one decides whether the bit is set when writing.
+    :param kind: "bool" for fields stored in the flag bit itself, otherwise the primitive type of the payload.
+    :param default: Value of a payload field whose bit is clear; the payload is only written when the value differs
+    from it. For "bool" fields, the value used when the file version predates the field.
+    :param min_version: First file version the field exists in.
+    :param attribute: Attribute the writer takes the payload from, if it differs from `name`, e.g. the raw int kept by
+    a `LazyFlag`.
+    """
+    bit: int
+    name: str | tuple[str, ...]
+    kind: str
+    default: Any = None
+    min_version: int | None = None
+    attribute: str | None = None
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return (self.name,) if isinstance(self.name, str) else self.name
+
+
+class FieldLocation(NamedTuple):
+    """
+    Where the value of a field is stored in a level file, as found by `FlagCodec.locate` and the `locate_data` methods
+    of the object model.
+
+    :param kind: Kind of the field, see `FlagField`.
+    :param offset: File offset of the payload, or None if the field is absent. For "bool" fields, offset of the flag.
+    :param bit: For "bool" fields, the bit of the flag holding the value.
+    :param flag_size: For "bool" fields, size of the flag in bytes.
+    :param default: Value of the field when it is absent.
+    :param optional: Whether a flag bit guards the payload, so that setting the field to None or `default` removes it.
+    """
+    kind: str
+    offset: int | None
+    bit: int = 0
+    flag_size: int = 0
+    default: Any = None
+    optional: bool = True
+
+    def read(self, buffer: bytes | bytearray | memoryview) -> Any:
+        """
+        Decode the value of the field from the level data in `buffer`.
+        """
+        if self.offset is None:
+            return self.default
+        if self.kind == "bool":
+            flag = int.from_bytes(buffer[self.offset:self.offset + self.flag_size], byteorder="little", signed=False)
+            return flag & self.bit != 0
+        if self.kind == "string":
+            size = _STRING_SIZE.unpack_from(buffer, self.offset)[0]
+            return str(buffer[self.offset + 2:self.offset + 2 + size], encoding="ascii")
+
+        values = _LAYOUTS[self.kind].unpack_from(buffer, self.offset)
+        if self.kind == "point":
+            return Point2D(*values)
+        if self.kind == "color":
+            return list(values)
+        return values[0]
+
+    def write(self, buffer: bytearray | memoryview, value: Any) -> bool:
+        """
+        Overwrite the field in the level data in `buffer` with `value`, if that leaves the layout of the object as it
+        is.
+        :return: Whether the field was overwritten. It is not if the field is not fixed-width, or if storing `value`
+        would add or remove its payload.
+        """
+        if self.kind == "bool":
+            end = self.offset + self.flag_size
+            flag = int.from_bytes(buffer[self.offset:end], byteorder="little", signed=False)
+            flag = flag | self.bit if value else flag & ~self.bit
+            buffer[self.offset:end] = flag.to_bytes(self.flag_size, byteorder="little", signed=False)
+            return True
+
+        layout = _LAYOUTS.get(self.kind)
+        if layout is None or self.offset is None or self.optional and (value is None or value == self.default):
+            return False
+        if self.kind == "point":
+            layout.pack_into(buffer, self.offset, value.x, value.y)
+        elif self.kind == "color":
+            layout.pack_into(buffer, self.offset, *value)
+        else:
+            layout.pack_into(buffer, self.offset, int(value) if self.kind == "bitfield" else value)
+        return True
+
+
+class FlagCodec:
+    """
+    Reader and writer for a run of flag-guarded fields, generated from a table of `FlagField`s in stream order.
+
+    `read(file_version, f, flag, values)` reads the fields whose bits are set in `flag` and stores every field of the
+    run in the `values` dict. `write(obj, file_version, f)` writes the set fields of `obj` and returns the flag bits
+    for them. `skip(file_version, f, flag)` advances past the fields whose bits are set in `flag` without decoding
+    them.
+
+    `locate(file_version, f, flag, flag_offset, flag_size, prefix, locations)` skips the same way, storing a
+    `FieldLocation` for every field of the run in `locations`, under `prefix` followed by the field name. Fields the
+    file version predates are left out, and so are "bool" fields if `flag_offset` is None (the flag is not stored in
+    the file) or their bit does not fit in `flag_size` bytes.
+    """
+    def __init__(self, name: str, fields: Sequence[FlagField]):
+        self.name = name
+        self.fields = tuple(fields)
+
+        namespace = {
+                "Point2D": Point2D,
+                "COLOR": COLOR,
+                "FieldLocation": FieldLocation,
+                "new_location": tuple.__new__,
+                # names of the fields in table order, and the keys `locate` stores them under, by prefix
+                "names": [name for field in self.fields for name in field.names],
+                "location_keys": {},
+        }
+        for index, field in enumerate(self.fields):
+            if field.kind == "bool" or field.default is not None:
+                namespace[f"_default_{index}"] = field.default
+            if field.kind != "bool":
+                for name_index, _ in enumerate(field.names):
+                    namespace[f"_absent_{index}_{name_index}"] = FieldLocation(
+                            field.kind,
+                            None,
+                            default=field.default,
+                            optional=name_index == 0,
+                    )
+
+        source = "\n".join(
+                self._reader_source()
+                + [""] + self._writer_source()
+                + [""] + self._skipper_source()
+                + [""] + self._locator_source()
+        )
+        exec(compile(source, f"<flag codec {name}>", "exec"), namespace)
+        self.read: Callable[[int, PeggleDataReader, int, dict[str, Any]], None] = namespace["read"]
+        self.write: Callable[[Any, int, PeggleDataWriter], int] = namespace["write"]
+        self.skip: Callable[[int, PeggleDataReader, int], None] = namespace["skip"]
+        self.locate: Callable[
+                [int, PeggleDataReader, int, int | None, int, str, dict[str, FieldLocation]],
+                None,
+        ] = namespace["locate"]
+
+    def _reader_source(self) -> list[str]:
+        lines = ["def read(file_version, f, flag, values):"]
+        for index, field in enumerate(self.fields):
+            bit = int(field.bit)
+            indent = "    "
+            if field.min_version is not None:
+                lines.append(f"    if file_version < {field.min_version}:")
+                lines.extend(f"        values[{name!r}] = _default_{index}" for name in field.names)
+                lines.append("    else:")
+                indent = "        "
+
+            if field.kind == "bool":
+                lines.extend(f"{indent}values[{name!r}] = flag & {bit} != 0" for name in field.names)
+                continue
+
+            read_expression, _ = _KINDS[field.kind]
+            default = "None" if field.default is None else f"_default_{index}"
+
+            lines.append(f"{indent}if flag & {bit}:")
+            for name in field.names:
+                if TRACE_ENABLED:
+                    lines.append(f"{indent}    f.label({name!r})")
+                lines.append(f"{indent}    values[{name!r}] = {read_expression}")
+            lines.append(f"{indent}else:")
+            lines.extend(f"{indent}    values[{name!r}] = {default}" for name in field.names)
+        lines.append("    return values")
+        return lines
+
+    def _writer_source(self) -> list[str]:
+        lines = ["def write(obj, file_version, f):", "    flag = 0"]
+        for index, field in enumerate(self.fields):
+            bit = int(field.bit)
+            indent = "    "
+            if field.min_version is not None:
+                lines.append(f"    if file_version >= {field.min_version}:")
+                indent = "        "
+
+            if field.kind == "bool":
+                lines.append(f"{indent}if obj.{field.names[0]}:")
+                lines.append(f"{indent}    flag |= {bit}")
+                continue
+
+            _, write_statement = _KINDS[field.kind]
+            attributes = field.names if field.attribute is None else (field.attribute,)
+            if field.default is None:
+                lines.append(f"{indent}if obj.{attributes[0]} is not None:")
+            else:
+                lines.append(f"{indent}if obj.{attributes[0]} != _default_{index}:")
+            lines.append(f"{indent}    flag |= {bit}")
+            lines.extend(f"{indent}    {write_statement.format(value=f'obj.{name}')}" for name in attributes)
+        lines.append("    return flag")
+        return lines
+
+    def _skipper_source(self) -> list[str]:
+        lines = ["def skip(file_version, f, flag):"]
+        for field in self.fields:
+            if field.kind == "bool":
+                continue
+
+            indent = "    "
+            if field.min_version is not None:
+                lines.append(f"    if file_version >= {field.min_version}:")
+                indent = "        "
+
+            lines.append(f"{indent}if flag & {int(field.bit)}:")
+            size = _SIZES[field.kind]
+            if size is None:
+                lines.extend(f"{indent}    f.skip_string()" for _ in field.names)
+            else:
+                lines.append(f"{indent}    f.skip({size * len(field.names)})")
+        lines.append("    return None")
+        return lines
+
+    def _locator_source(self) -> list[str]:
+        # locations of set fields are built with `tuple.__new__`, skipping the argument handling of
+        # `FieldLocation.__new__`, those of absent fields are the same for every object and built once in `__init__`
+        lines = [
+                "def locate(file_version, f, flag, flag_offset, flag_size, prefix, locations):",
+                "    keys = location_keys.get(prefix)",
+                "    if keys is None:",
+                "        keys = location_keys[prefix] = tuple([prefix + name for name in names])",
+                # bits past the end of a short flag cannot be stored
+                "    stored_bits = 0 if flag_offset is None else (1 << 8 * flag_size) - 1",
+        ]
+        key_index = 0
+        for index, field in enumerate(self.fields):
+            bit = int(field.bit)
+            indent = "    "
+            if field.min_version is not None:
+                lines.append(f"    if file_version >= {field.min_version}:")
+                indent = "        "
+
+            keys = [f"keys[{key_index + name_index}]" for name_index in range(len(field.names))]
+            key_index += len(field.names)
+
+            if field.kind == "bool":
+                lines.append(f"{indent}if stored_bits & {bit}:")
+                lines.extend(
+                        f"{indent}    locations[{key}] = "
+                        f"new_location(FieldLocation, ('bool', flag_offset, {bit}, flag_size, None, True))"
+                        for key in keys
+                )
+                continue
+
+            default = "None" if field.default is None else f"_default_{index}"
+            size = _SIZES[field.kind]
+            lines.append(f"{indent}if flag & {bit}:")
+            for name_index, key in enumerate(keys):
+                # only the first value decides whether the bit is set
+                location = f"({field.kind!r}, f.position, 0, 0, {default}, {name_index == 0})"
+                lines.append(f"{indent}    locations[{key}] = new_location(FieldLocation, {location})")
+                lines.append(f"{indent}    {'f.skip_string()' if size is None else f'f.skip({size})'}")
+            lines.append(f"{indent}else:")
+            lines.extend(
+                    f"{indent}    locations[{key}] = _absent_{index}_{name_index}"
+                    for name_index, key in enumerate(keys)
+            )
+        lines.append("    return None")
+        return lines
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
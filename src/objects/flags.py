@@ -6,6 +6,8 @@ Created on 2023/11/23
 """
 
 from enum import IntFlag, auto
+from collections.abc import Callable
+from typing import Any
 
 
 class GenericFlag(IntFlag):
@@ -189,3 +191,45 @@ class MovementFlag(IntFlag):
     HAS_MYSTERY_POINT = auto()
     HAS_ROTATION_VALUE = auto()
     UNKNOWN_15 = auto()
+
+
+class LazyFlag:
+    """
+    Descriptor keeping a bitfield as a plain int in a slot and only constructing the `IntFlag` when the attribute is
+    read. Installed on slotted dataclasses with `lazy_flags`.
+    """
+    def __init__(self, flag_type: type[IntFlag], slot: Any):
+        self.flag_type = flag_type
+        self.slot = slot
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+
+        raw = self.slot.__get__(instance, owner)
+        return None if raw is None else self.flag_type(raw)
+
+    def __set__(self, instance: Any, value: int | None):
+        self.slot.__set__(instance, None if value is None else int(value))
+
+
+def lazy_flags(**flag_types: type[IntFlag]) -> Callable[[type], type]:
+    """
+    Class decorator for slotted dataclasses, turning the given fields into `LazyFlag`s. The raw value, or None, stays
+    available as the field's name prefixed with an underscore.
+
+        @lazy_flags(flipper_flags=FlipperFlag)
+        @dataclass(slots=True)
+        class GenericObject:
+            ...
+
+    :param flag_types: `IntFlag` type for each field name.
+    """
+    def decorator(cls: type) -> type:
+        for name, flag_type in flag_types.items():
+            slot = cls.__dict__[name]
+            setattr(cls, f"_{name}", slot)
+            setattr(cls, name, LazyFlag(flag_type, slot))
+        return cls
+
+    return decorator
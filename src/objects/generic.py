@@ -4,18 +4,19 @@ Created on 2023/11/24
 
 @author: brassbeat
 """
-import functools as ft
-import logging
-from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Self
+from typing import Self, Any
 
 from objects.movement_data import Movement
-from .flags import GenericFlag, FlipperFlag
+from .flag_codec import FieldLocation, FlagCodec, FlagField
+from .flags import GenericFlag, FlipperFlag, lazy_flags
 from .peg_info import PegInfo
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 _FLAG_EXTENSION_FIRST_VERSION = 5
 
@@ -25,12 +26,62 @@ _DEFAULT_BOUNCINESS = 1.0
 
 _DEFAULT_ROLLINESS = 1.0
 
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
-
-@dataclass
-class GenericObject:
+_HAS_PEG_INFO = int(GenericFlag.HAS_PEG_INFO)
+_HAS_MOVEMENT_DATA = int(GenericFlag.HAS_MOVEMENT_DATA)
+
+# peg info and movement data come last and are handled by hand
+_FLAG_CODEC = FlagCodec(
+        "GenericObject",
+        [
+                FlagField(GenericFlag.HAS_CUSTOM_ROLLINESS, "rolliness", "float"),
+                FlagField(GenericFlag.HAS_CUSTOM_BOUNCINESS, "bounciness", "float"),
+                FlagField(GenericFlag.UNKNOWN_4, "unknown_4", "int"),
+                FlagField(GenericFlag.IS_INTERACTIBLE, "has_collision", "bool"),
+                FlagField(GenericFlag.IS_VISIBLE, "is_visible", "bool"),
+                FlagField(GenericFlag.IS_MOVABLE, "can_move", "bool"),
+                FlagField(GenericFlag.HAS_FILL_COLOR, "fill_color", "color"),
+                FlagField(GenericFlag.HAS_OUTLINE_COLOR, "outline_color", "color"),
+                FlagField(GenericFlag.HAS_IMAGE_DATA, "image_name", "string"),
+                FlagField(GenericFlag.HAS_IMAGE_DX, "image_dx", "float"),
+                FlagField(GenericFlag.HAS_IMAGE_DY, "image_dy", "float"),
+                FlagField(GenericFlag.HAS_IMAGE_ROTATION, "image_rotation", "float"),
+                FlagField(GenericFlag.IS_BACKGROUND, "is_background", "bool"),
+                FlagField(GenericFlag.IS_BASE_OBJECT, "is_base_object", "bool"),
+                FlagField(GenericFlag.UNKNOWN_16, "unknown_16", "int"),
+                FlagField(GenericFlag.HAS_ID, "id", "string"),
+                FlagField(GenericFlag.UNKNOWN_18, "unknown_18", "int"),
+                FlagField(GenericFlag.HAS_SOUND, "sound", "byte"),
+                FlagField(GenericFlag.BALL_STOP_RESET, "is_ball_stop_reset", "bool"),
+                FlagField(GenericFlag.HAS_LOGIC, "logic", "string"),
+                FlagField(GenericFlag.IS_FOREGROUND, "is_foreground", "bool"),
+                FlagField(GenericFlag.HAS_MAX_BOUNCE_VELOCITY, "max_bounce_velocity", "float"),
+                FlagField(GenericFlag.IS_DRAW_SORT, "is_draw_sort", "bool"),
+                FlagField(GenericFlag.IS_FOREGROUND_2, "is_foreground2", "bool"),
+                FlagField(GenericFlag.HAS_SUB_ID, "sub_id", "int"),
+                FlagField(
+                        GenericFlag.HAS_FLIPPER_FLAGS,
+                        "flipper_flags",
+                        "bitfield",
+                        attribute="_flipper_flags",
+                ),
+                FlagField(GenericFlag.IS_DRAW_FLOAT, "is_draw_float", "bool"),
+                FlagField(GenericFlag.UNKNOWN_29, "unknown_29", "bool"),
+                FlagField(
+                        GenericFlag.HAS_SHADOW,
+                        "has_shadow",
+                        "bool",
+                        default=True,
+                        min_version=_SHADOW_FIELD_MIN_VERSION,
+                ),
+                FlagField(GenericFlag.UNKNOWN_31, "unknown_31", "bool"),
+        ],
+)
+
+
+@positional_pickle
+@lazy_flags(flipper_flags=FlipperFlag)
+@dataclass(slots=True)
+class GenericObject(Trackable):
     rolliness: float | None
     bounciness: float | None
     peg_data: PegInfo | None
@@ -75,286 +126,174 @@ class GenericObject:
             movement_callback: Callable[[int, PeggleDataReader], Movement],
             **kwargs
     ) -> Self:
-        _logger.debug("reading in generic flags...")
+        if TRACE_ENABLED:
+            f.label("flag")
         flag_length = 4 if file_version >= _FLAG_EXTENSION_FIRST_VERSION else 3
-        flag = GenericFlag(f.read_bitfield(flag_length))
-
-        if GenericFlag.HAS_CUSTOM_ROLLINESS in flag:
-            _logger.debug("Reading in rolliness...")
-            rolliness = f.read_float()
-        else:
-            rolliness = None
-        if GenericFlag.HAS_CUSTOM_BOUNCINESS in flag:
-            _logger.debug("Reading in bounciness...")
-            bounciness = f.read_float()
-        else:
-            bounciness = None
-
-        if GenericFlag.UNKNOWN_4 in flag:
-            _logger.debug("Reading in unknown 4...")
-            unknown_4 = f.read_int()
-        else:
-            unknown_4 = None
-
-        has_collision = GenericFlag.IS_INTERACTIBLE in flag
-        is_visible = GenericFlag.IS_VISIBLE in flag
-        can_move = GenericFlag.IS_MOVABLE in flag
-
-        if GenericFlag.HAS_FILL_COLOR in flag:
-            _logger.debug("Reading in fill color...")
-            fill_color = list(f.read_byte() for _ in range(4))
-        else:
-            fill_color = None
-
-        if GenericFlag.HAS_OUTLINE_COLOR in flag:
-            _logger.debug("Reading in outline color...")
-            outline_color = list(f.read_byte() for _ in range(4))
-        else:
-            outline_color = None
+        flag = f.read_bitfield(flag_length)
 
-        if GenericFlag.HAS_IMAGE_DATA in flag:
-            _logger.debug("Reading in image name...")
-            image_name = f.read_string()
-        else:
-            image_name = None
-        if GenericFlag.HAS_IMAGE_DX in flag:
-            _logger.debug("Reading in image dx...")
-            image_dx = f.read_float()
-        else:
-            image_dx = None
-        if GenericFlag.HAS_IMAGE_DY in flag:
-            _logger.debug("Reading in image dy...")
-            image_dy = f.read_float()
-        else:
-            image_dy = None
-        if GenericFlag.HAS_IMAGE_ROTATION in flag:
-            _logger.debug("Reading in image rotation...")
-            image_rotation = f.read_float()
-        else:
-            image_rotation = None
-
-        is_background = GenericFlag.IS_BACKGROUND in flag
-        is_base_object = GenericFlag.IS_BASE_OBJECT in flag
-
-        if GenericFlag.UNKNOWN_16 in flag:
-            _logger.debug("Reading in unknown 16...")
-            unknown_16 = f.read_int()
-        else:
-            unknown_16 = None
-        if GenericFlag.HAS_ID in flag:
-            _logger.debug("Reading in ID...")
-            id_ = f.read_string()
-        else:
-            id_ = None
-
-        if GenericFlag.UNKNOWN_18 in flag:
-            _logger.debug("Reading in unknown 18...")
-            unknown_18 = f.read_int()
-        else:
-            unknown_18 = None
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
 
-        if GenericFlag.HAS_SOUND in flag:
-            _logger.debug("Reading in sound...")
-            sound = f.read_byte()
+        if flag & _HAS_PEG_INFO:
+            if TRACE_ENABLED:
+                f.label("peg_data")
+            values["peg_data"] = PegInfo.read_data(file_version, f)
         else:
-            sound = None
-
-        is_ball_stop_reset = GenericFlag.BALL_STOP_RESET in flag
+            values["peg_data"] = None
 
-        if GenericFlag.HAS_LOGIC in flag:
-            _logger.debug("Reading in logic...")
-            logic = f.read_string()
+        if flag & _HAS_MOVEMENT_DATA:
+            if TRACE_ENABLED:
+                f.label("movement_data")
+            values["movement_data"] = movement_callback(file_version, f)
         else:
-            logic = None
+            values["movement_data"] = None
 
-        is_foreground = GenericFlag.IS_FOREGROUND in flag
+        return cls(**values)
 
-        if GenericFlag.HAS_MAX_BOUNCE_VELOCITY in flag:
-            _logger.debug("Reading in max bounce velocity...")
-            max_bounce_velocity = f.read_float()
-        else:
-            max_bounce_velocity = None
+    @staticmethod
+    def scan_data(
+            file_version: int,
+            f: PeggleDataReader,
+            row: dict[str, Any],
+            *,
+            movement_callback: Callable[[int, PeggleDataReader], Any],
+            **kwargs
+    ) -> None:
+        """
+        Skip over generic object data in the data stream, only storing what `LevelColumns` needs in `row`.
+        """
+        flag_length = 4 if file_version >= _FLAG_EXTENSION_FIRST_VERSION else 3
+        flag = f.read_bitfield(flag_length)
 
-        is_draw_sort = GenericFlag.IS_DRAW_SORT in flag
-        is_foreground2 = GenericFlag.IS_FOREGROUND_2 in flag
+        _FLAG_CODEC.skip(file_version, f, flag)
 
-        if GenericFlag.HAS_SUB_ID in flag:
-            _logger.debug("Reading in sub-ID...")
-            sub_id = f.read_int()
-        else:
-            sub_id = None
-        if GenericFlag.HAS_FLIPPER_FLAGS in flag:
-            _logger.debug("Reading in flipper flags...")
-            flipper_flags = FlipperFlag(f.read_bitfield(1))
-        else:
-            flipper_flags = None
+        if flag & _HAS_PEG_INFO:
+            row["peg_type"], row["can_be_orange"] = PegInfo.scan_data(file_version, f)
 
-        is_draw_float = GenericFlag.IS_DRAW_FLOAT in flag
-        unknown_29 = GenericFlag.UNKNOWN_29 in flag
+        if flag & _HAS_MOVEMENT_DATA:
+            row["movement"] = movement_callback(file_version, f)
 
-        if file_version >= _SHADOW_FIELD_MIN_VERSION:
-            has_shadow = GenericFlag.HAS_SHADOW in flag
-        else:
-            has_shadow = True
+    @staticmethod
+    def locate_data(
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            *,
+            movement_callback: Callable[[int, PeggleDataReader], Any],
+            **kwargs
+    ) -> None:
+        """
+        Skip over generic object data in the data stream, storing where its fields are in `locations`, see
+        `FlagCodec.locate`. Fields of the movement are not located.
+        """
+        flag_length = 4 if file_version >= _FLAG_EXTENSION_FIRST_VERSION else 3
+        flag_offset = f.position
+        flag = f.read_bitfield(flag_length)
 
-        unknown_31 = GenericFlag.UNKNOWN_31 in flag
+        _FLAG_CODEC.locate(file_version, f, flag, flag_offset, flag_length, prefix, locations)
 
-        if GenericFlag.HAS_PEG_INFO in flag:
-            _logger.debug("Reading in peg info...")
-            peg_data = PegInfo.read_data(file_version, f)
-        else:
-            peg_data = None
-
-        if GenericFlag.HAS_MOVEMENT_DATA in flag:
-            # _logger.debug("Reading in movement link id...")
-            # main_link_id = f.read_int()
-            # if main_link_id == 1:
-            #     _logger.debug("Reading in movement data...")
-            #     movement_data = movement_callback(file_version, f)
-            #     movement_link_id = None
-            # else:
-            #     movement_data = None
-            #     movement_link_id = main_link_id
-            _logger.debug("Reading in movement data...")
-            movement_data = movement_callback(file_version, f)
-            movement_link_id = None
-        else:
-            movement_data = None
-            movement_link_id = None
+        if flag & _HAS_PEG_INFO:
+            PegInfo.locate_data(file_version, f, f"{prefix}peg_data.", locations)
 
-        return cls(
-                rolliness=rolliness,
-                bounciness=bounciness,
-                peg_data=peg_data,
-                movement_data=movement_data,
-                unknown_4=unknown_4,
-                has_collision=has_collision,
-                is_visible=is_visible,
-                can_move=can_move,
-                fill_color=fill_color,
-                outline_color=outline_color,
-                image_name=image_name,
-                image_dx=image_dx,
-                image_dy=image_dy,
-                image_rotation=image_rotation,
-                is_background=is_background,
-                is_base_object=is_base_object,
-                unknown_16=unknown_16,
-                id=id_,
-                unknown_18=unknown_18,
-                sound=sound,
-                is_ball_stop_reset=is_ball_stop_reset,
-                logic=logic,
-                is_foreground=is_foreground,
-                max_bounce_velocity=max_bounce_velocity,
-                is_draw_sort=is_draw_sort,
-                is_foreground2=is_foreground2,
-                sub_id=sub_id,
-                flipper_flags=flipper_flags,
-                is_draw_float=is_draw_float,
-                unknown_29=unknown_29,
-                has_shadow=has_shadow,
-                unknown_31=unknown_31,
-                movement_link_id=movement_link_id,
-        )
+        if flag & _HAS_MOVEMENT_DATA:
+            movement_callback(file_version, f)
 
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
+        flag_length = 4 if file_version >= _FLAG_EXTENSION_FIRST_VERSION else 3
+        flag_offset = f.reserve(flag_length)
+
+        flag = _FLAG_CODEC.write(self, file_version, f)
 
-        write_queue = deque()
-        flag = GenericFlag(0)
-
-        if self.rolliness is not None:
-            flag |= GenericFlag.HAS_CUSTOM_ROLLINESS
-            write_queue.append(ft.partial(f.write_float, self.rolliness))
-        if self.bounciness is not None:
-            flag |= GenericFlag.HAS_CUSTOM_BOUNCINESS
-            write_queue.append(ft.partial(f.write_float, self.bounciness))
-        if self.unknown_4 is not None:
-            flag |= GenericFlag.UNKNOWN_4
-            write_queue.append(ft.partial(f.write_int, self.unknown_4))
-        if self.has_collision:
-            flag |= GenericFlag.IS_INTERACTIBLE
-        if self.is_visible:
-            flag |= GenericFlag.IS_VISIBLE
-        if self.can_move:
-            flag |= GenericFlag.IS_MOVABLE
-        if self.fill_color is not None:
-            flag |= GenericFlag.HAS_FILL_COLOR
-            write_queue.extend(ft.partial(f.write_byte, n) for n in self.fill_color)
-        if self.outline_color is not None:
-            flag |= GenericFlag.HAS_OUTLINE_COLOR
-            write_queue.extend(ft.partial(f.write_byte, n) for n in self.outline_color)
-        if self.image_name is not None:
-            flag |= GenericFlag.HAS_IMAGE_DATA
-            write_queue.append(ft.partial(f.write_string, self.image_name))
-        if self.image_dx is not None:
-            flag |= GenericFlag.HAS_IMAGE_DX
-            write_queue.append(ft.partial(f.write_float, self.image_dx))
-        if self.image_dy is not None:
-            flag |= GenericFlag.HAS_IMAGE_DY
-            write_queue.append(ft.partial(f.write_float, self.image_dy))
-        if self.image_rotation is not None:
-            flag |= GenericFlag.HAS_IMAGE_ROTATION
-            write_queue.append(ft.partial(f.write_float, self.image_rotation))
-        if self.is_background:
-            flag |= GenericFlag.IS_BACKGROUND
-        if self.is_base_object:
-            flag |= GenericFlag.IS_BASE_OBJECT
-        if self.unknown_16 is not None:
-            flag |= GenericFlag.UNKNOWN_16
-            write_queue.append(ft.partial(f.write_int, self.unknown_16))
-        if self.id is not None:
-            flag |= GenericFlag.HAS_ID
-            write_queue.append(ft.partial(f.write_string, self.id))
-        if self.unknown_18 is not None:
-            flag |= GenericFlag.UNKNOWN_18
-            write_queue.append(ft.partial(f.write_int, self.unknown_18))
-        if self.sound is not None:
-            flag |= GenericFlag.HAS_SOUND
-            write_queue.append(ft.partial(f.write_byte, self.sound))
-        if self.is_ball_stop_reset:
-            flag |= GenericFlag.BALL_STOP_RESET
-        if self.logic is not None:
-            flag |= GenericFlag.HAS_LOGIC
-            write_queue.append(ft.partial(f.write_string, self.logic))
-        if self.is_foreground:
-            flag |= GenericFlag.IS_FOREGROUND
-        if self.max_bounce_velocity is not None:
-            flag |= GenericFlag.HAS_MAX_BOUNCE_VELOCITY
-            write_queue.append(ft.partial(f.write_float, self.max_bounce_velocity))
-        if self.is_draw_sort:
-            flag |= GenericFlag.IS_DRAW_SORT
-        if self.is_foreground2:
-            flag |= GenericFlag.IS_FOREGROUND_2
-        if self.sub_id is not None:
-            flag |= GenericFlag.HAS_SUB_ID
-            write_queue.append(ft.partial(f.write_int, self.sub_id))
-        if self.flipper_flags is not None:
-            flag |= GenericFlag.HAS_FLIPPER_FLAGS
-            write_queue.append(ft.partial(f.write_bitfield, self.flipper_flags, 1))
-        if self.is_draw_float:
-            flag |= GenericFlag.IS_DRAW_FLOAT
-        if self.unknown_29:
-            flag |= GenericFlag.UNKNOWN_29
-        if self.has_shadow and file_version >= _SHADOW_FIELD_MIN_VERSION:
-            flag |= GenericFlag.HAS_SHADOW
-        if self.unknown_31:
-            flag |= GenericFlag.UNKNOWN_31
         if self.peg_data is not None:
-            flag |= GenericFlag.HAS_PEG_INFO
-            write_queue.append(ft.partial(self.peg_data.write_data, file_version, f))
+            flag |= _HAS_PEG_INFO
+            self.peg_data.write_data(file_version, f)
 
         if self.movement_link_id is not None:
-            flag |= GenericFlag.HAS_MOVEMENT_DATA
-            write_queue.append(ft.partial(f.write_int, self.movement_link_id))
+            flag |= _HAS_MOVEMENT_DATA
+            f.write_int(self.movement_link_id)
         elif self.movement_data is not None:
-            flag |= GenericFlag.HAS_MOVEMENT_DATA
-            write_queue.append(ft.partial(self.movement_data.write_data, file_version, f))
+            flag |= _HAS_MOVEMENT_DATA
+            self.movement_data.write_data(file_version, f)
+
+        f.patch_bitfield(flag_offset, flag, flag_length)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "rolliness": self.rolliness,
+                "bounciness": self.bounciness,
+                "peg_data": None if self.peg_data is None else self.peg_data.to_json(),
+                "movement_data": None if self.movement_data is None else self.movement_data.to_json(),
+                "unknown_4": self.unknown_4,
+                "has_collision": self.has_collision,
+                "is_visible": self.is_visible,
+                "can_move": self.can_move,
+                "fill_color": None if self.fill_color is None else list(self.fill_color),
+                "outline_color": None if self.outline_color is None else list(self.outline_color),
+                "image_name": self.image_name,
+                "image_dx": self.image_dx,
+                "image_dy": self.image_dy,
+                "image_rotation": self.image_rotation,
+                "is_background": self.is_background,
+                "is_base_object": self.is_base_object,
+                "unknown_16": self.unknown_16,
+                "id": self.id,
+                "unknown_18": self.unknown_18,
+                "sound": self.sound,
+                "is_ball_stop_reset": self.is_ball_stop_reset,
+                "logic": self.logic,
+                "is_foreground": self.is_foreground,
+                "max_bounce_velocity": self.max_bounce_velocity,
+                "is_draw_sort": self.is_draw_sort,
+                "is_foreground2": self.is_foreground2,
+                "sub_id": self.sub_id,
+                "flipper_flags": self._flipper_flags,
+                "is_draw_float": self.is_draw_float,
+                "unknown_29": self.unknown_29,
+                "has_shadow": self.has_shadow,
+                "unknown_31": self.unknown_31,
+                "movement_link_id": self.movement_link_id,
+        }
 
-        flag_length = 4 if file_version >= _FLAG_EXTENSION_FIRST_VERSION else 3
-        f.write_bitfield(flag, flag_length)
-        for write_action in write_queue:
-            write_action()
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        return cls(
+                rolliness=data["rolliness"],
+                bounciness=data["bounciness"],
+                peg_data=None if data["peg_data"] is None else PegInfo.from_json(data["peg_data"]),
+                movement_data=(
+                        None if data["movement_data"] is None
+                        else Movement.from_json(data["movement_data"], **kwargs)
+                ),
+                unknown_4=data["unknown_4"],
+                has_collision=data["has_collision"],
+                is_visible=data["is_visible"],
+                can_move=data["can_move"],
+                fill_color=data["fill_color"],
+                outline_color=data["outline_color"],
+                image_name=data["image_name"],
+                image_dx=data["image_dx"],
+                image_dy=data["image_dy"],
+                image_rotation=data["image_rotation"],
+                is_background=data["is_background"],
+                is_base_object=data["is_base_object"],
+                unknown_16=data["unknown_16"],
+                id=data["id"],
+                unknown_18=data["unknown_18"],
+                sound=data["sound"],
+                is_ball_stop_reset=data["is_ball_stop_reset"],
+                logic=data["logic"],
+                is_foreground=data["is_foreground"],
+                max_bounce_velocity=data["max_bounce_velocity"],
+                is_draw_sort=data["is_draw_sort"],
+                is_foreground2=data["is_foreground2"],
+                sub_id=data["sub_id"],
+                flipper_flags=data["flipper_flags"],
+                is_draw_float=data["is_draw_float"],
+                unknown_29=data["unknown_29"],
+                has_shadow=data["has_shadow"],
+                unknown_31=data["unknown_31"],
+                movement_link_id=data["movement_link_id"],
+        )
 
 
 def main():
@@ -4,27 +4,66 @@ Created on 2023/12/05
 
 @author: brassbeat
 """
-import functools as ft
 import itertools
-import logging
-from collections import deque
+import struct
 from dataclasses import dataclass
-from typing import Self, Callable
+from typing import Self, Callable, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
 from objects.enums import MovementType
+from objects.flag_codec import FlagCodec, FlagField
 from objects.flags import MovementFlag
 from objects.point_2d import Point2D
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 _INDEXER = itertools.count()
 
+# movement value, anchor point, time period, flag
+_HEADER = struct.Struct("<bffhH")
+# main link id followed by the header above
+_LINKED_HEADER = struct.Struct("<ibffhH")
+
+_HAS_SUBMOVEMENT = int(MovementFlag.HAS_SUBMOVEMENT)
+
+# x and y of the submovement offset
+_SUBMOVEMENT_OFFSET_SIZE = 8
+
+# fields before the submovement, which is handled by hand
+_FLAG_CODEC = FlagCodec(
+        "Movement",
+        [
+                FlagField(MovementFlag.HAS_INITIAL_FRAME, "initial_frame", "short"),
+                FlagField(MovementFlag.HAS_RADIUS_1, "radius_1", "short"),
+                FlagField(MovementFlag.HAS_INITIAL_PHASE, "initial_phase", "float"),
+                FlagField(MovementFlag.HAS_MOVE_ROTATION, "move_rotation", "float"),
+                FlagField(MovementFlag.HAS_RADIUS_2, "radius_2", "short"),
+                FlagField(MovementFlag.HAS_PAUSE_1_DURATION, "pause_1_duration", "short"),
+                FlagField(MovementFlag.HAS_PAUSE_2_DURATION, "pause_2_duration", "short"),
+                FlagField(MovementFlag.HAS_PAUSE_1_PHASE, "pause_1_phase_percentage", "byte"),
+                FlagField(MovementFlag.HAS_PAUSE_2_PHASE, "pause_2_phase_percentage", "byte"),
+                FlagField(MovementFlag.HAS_POST_DELAY_PHASE, "post_delay_phase", "float"),
+                FlagField(MovementFlag.HAS_MAX_ANGLE, "max_angle", "float"),
+                FlagField(MovementFlag.UNKNOWN_11, "unknown_11", "float"),
+                FlagField(MovementFlag.HAS_ROTATION_VALUE, "rotation_value", "float"),
+        ],
+)
 
-@dataclass
-class Movement:
+# fields after the submovement
+_TAIL_FLAG_CODEC = FlagCodec(
+        "Movement tail",
+        [
+                FlagField(MovementFlag.HAS_MYSTERY_POINT, "mystery_point", "point"),
+                FlagField(MovementFlag.UNKNOWN_15, "unknown_15", "bool"),
+        ],
+)
+
+
+@positional_pickle
+@dataclass(slots=True)
+class Movement(Trackable):
     main_link_id: int
     is_reversed: bool
     movement_type: MovementType
@@ -70,193 +109,146 @@ class Movement:
             movement_callback: Callable[[int, PeggleDataReader], Self],
             **kwargs,
     ) -> Self:
-        main_link_id = 1
-
-        _logger.debug("Reading in movement type + direction...")
-        movement_value = f.read_byte()
-        is_reversed = movement_value < 0
-        movement_type = MovementType.from_int(abs(movement_value))
+        if TRACE_ENABLED:
+            f.label("header")
+        movement_value, anchor_x, anchor_y, time_period, flag = f.read_struct(_HEADER)
 
-        _logger.debug("Reading in anchor point...")
-        anchor_point = Point2D(f.read_float(), f.read_float())
-        _logger.debug("Reading in time period...")
-        time_period = f.read_short()
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
 
-        flag = MovementFlag(f.read_bitfield(2))
-
-        if MovementFlag.HAS_INITIAL_FRAME in flag:
-            _logger.debug("Reading in initial frame...")
-            initial_frame = f.read_short()
-        else:
-            initial_frame = None
-        if MovementFlag.HAS_RADIUS_1 in flag:
-            _logger.debug("Reading in radius 1...")
-            radius_1 = f.read_short()
-        else:
-            radius_1 = None
-        if MovementFlag.HAS_INITIAL_PHASE in flag:
-            _logger.debug("Reading in initial phase...")
-            initial_phase = f.read_float()
-        else:
-            initial_phase = None
-        if MovementFlag.HAS_MOVE_ROTATION in flag:
-            _logger.debug("Reading in move rotation...")
-            move_rotation = f.read_float()
-        else:
-            move_rotation = None
-        if MovementFlag.HAS_RADIUS_2 in flag:
-            _logger.debug("Reading in radius 2...")
-            radius_2 = f.read_short()
-        else:
-            radius_2 = None
-        if MovementFlag.HAS_PAUSE_1_DURATION in flag:
-            _logger.debug("Reading in pause 1 duration...")
-            pause_1_duration = f.read_short()
+        if flag & _HAS_SUBMOVEMENT:
+            if TRACE_ENABLED:
+                f.label("submovement_offset")
+            values["submovement_offset"] = Point2D.read_data(file_version, f)
+            values["submovement_"] = movement_callback(file_version, f)
         else:
-            pause_1_duration = None
-        if MovementFlag.HAS_PAUSE_2_DURATION in flag:
-            _logger.debug("Reading in pause 2 duration...")
-            pause_2_duration = f.read_short()
-        else:
-            pause_2_duration = None
-        if MovementFlag.HAS_PAUSE_1_PHASE in flag:
-            _logger.debug("Reading in pause 1 phase...")
-            pause_1_phase_percentage = f.read_byte()
-        else:
-            pause_1_phase_percentage = None
-        if MovementFlag.HAS_PAUSE_2_PHASE in flag:
-            _logger.debug("Reading in pause 2 phase...")
-            pause_2_phase_percentage = f.read_byte()
-        else:
-            pause_2_phase_percentage = None
-        if MovementFlag.HAS_POST_DELAY_PHASE in flag:
-            _logger.debug("Reading in post delay phase...")
-            post_delay_phase = f.read_float()
-        else:
-            post_delay_phase = None
-        if MovementFlag.HAS_MAX_ANGLE in flag:
-            _logger.debug("Reading in max angle...")
-            max_angle = f.read_float()
-        else:
-            max_angle = None
-        if MovementFlag.UNKNOWN_11 in flag:
-            _logger.debug("Reading in unknown 11...")
-            unknown_11 = f.read_float()
-        else:
-            unknown_11 = None
-        if MovementFlag.HAS_ROTATION_VALUE in flag:
-            _logger.debug("Reading in rotation value...")
-            rotation_value = f.read_float()
-        else:
-            rotation_value = None
-        if MovementFlag.HAS_SUBMOVEMENT in flag:
-            _logger.debug("Reading in submovement offset...")
-            submovement_offset = Point2D(f.read_float(), f.read_float())
-            submovement = movement_callback(file_version, f)
-            submovement_link_id = None
+            values["submovement_offset"] = None
+            values["submovement_"] = None
+
+        _TAIL_FLAG_CODEC.read(file_version, f, flag, values)
 
-        else:
-            submovement_offset = None
-            submovement_link_id = None
-            submovement = None
-        if MovementFlag.HAS_MYSTERY_POINT in flag:
-            _logger.debug("Reading in mystery point...")
-            mystery_point = Point2D(f.read_float(), f.read_float())
-        else:
-            mystery_point = None
-        
-        unknown_15 = MovementFlag.UNKNOWN_15 in flag
-        
         return cls(
-                main_link_id=main_link_id,
-                is_reversed=is_reversed,
-                movement_type=movement_type,
-                anchor_point=anchor_point,
+                main_link_id=1,
+                is_reversed=movement_value < 0,
+                movement_type=MovementType.from_int(abs(movement_value)),
+                anchor_point=Point2D(anchor_x, anchor_y),
                 time_period=time_period,
-                initial_frame=initial_frame,
-                radius_1=radius_1,
-                radius_2=radius_2,
-                initial_phase=initial_phase,
-                move_rotation=move_rotation,
-                pause_1_duration=pause_1_duration,
-                pause_2_duration=pause_2_duration,
-                pause_1_phase_percentage=pause_1_phase_percentage,
-                pause_2_phase_percentage=pause_2_phase_percentage,
-                post_delay_phase=post_delay_phase,
-                max_angle=max_angle,
-                unknown_11=unknown_11,
-                rotation_value=rotation_value,
-                submovement_offset=submovement_offset,
-                submovement_link_id=submovement_link_id,
-                submovement_=submovement,
-                mystery_point=mystery_point,
-                unknown_15=unknown_15,
+                submovement_link_id=None,
+                **values,
         )
 
+    @staticmethod
+    def scan_data(
+            file_version: int,
+            f: PeggleDataReader,
+            *,
+            movement_callback: Callable[[int, PeggleDataReader], Any],
+            **kwargs,
+    ) -> tuple[int, Any]:
+        """
+        Skip over movement data in the data stream, only decoding what `LevelColumns` needs.
+        :return: Movement type as stored in the file, and the submovement as returned by `movement_callback`, or None.
+        """
+        movement_value, _, _, _, flag = f.read_struct(_HEADER)
+
+        _FLAG_CODEC.skip(file_version, f, flag)
+
+        if flag & _HAS_SUBMOVEMENT:
+            f.skip(_SUBMOVEMENT_OFFSET_SIZE)
+            submovement = movement_callback(file_version, f)
+        else:
+            submovement = None
+
+        _TAIL_FLAG_CODEC.skip(file_version, f, flag)
+
+        return abs(movement_value), submovement
+
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
-        write_queue: deque[Callable[[], None]] = deque()
-
-        flag = MovementFlag(0)
-
-        if self.initial_frame is not None:
-            flag |= MovementFlag.HAS_INITIAL_FRAME
-            write_queue.append(ft.partial(f.write_short, self.initial_frame))
-        if self.radius_1 is not None:
-            flag |= MovementFlag.HAS_RADIUS_1
-            write_queue.append(ft.partial(f.write_short, self.radius_1))
-        if self.initial_phase is not None:
-            flag |= MovementFlag.HAS_INITIAL_PHASE
-            write_queue.append(ft.partial(f.write_float, self.initial_phase))
-        if self.move_rotation is not None:
-            flag |= MovementFlag.HAS_MOVE_ROTATION
-            write_queue.append(ft.partial(f.write_float, self.move_rotation))
-        if self.radius_2 is not None:
-            flag |= MovementFlag.HAS_RADIUS_2
-            write_queue.append(ft.partial(f.write_short, self.radius_2))
-        if self.pause_1_duration is not None:
-            flag |= MovementFlag.HAS_PAUSE_1_DURATION
-            write_queue.append(ft.partial(f.write_short, self.pause_1_duration))
-        if self.pause_2_duration is not None:
-            flag |= MovementFlag.HAS_PAUSE_2_DURATION
-            write_queue.append(ft.partial(f.write_short, self.pause_2_duration))
-        if self.pause_1_phase_percentage is not None:
-            flag |= MovementFlag.HAS_PAUSE_1_PHASE
-            write_queue.append(ft.partial(f.write_byte, self.pause_1_phase_percentage))
-        if self.pause_2_phase_percentage is not None:
-            flag |= MovementFlag.HAS_PAUSE_2_PHASE
-            write_queue.append(ft.partial(f.write_byte, self.pause_2_phase_percentage))
-        if self.post_delay_phase is not None:
-            flag |= MovementFlag.HAS_POST_DELAY_PHASE
-            write_queue.append(ft.partial(f.write_float, self.post_delay_phase))
-        if self.max_angle is not None:
-            flag |= MovementFlag.HAS_MAX_ANGLE
-            write_queue.append(ft.partial(f.write_float, self.max_angle))
-        if self.unknown_11 is not None:
-            flag |= MovementFlag.UNKNOWN_11
-            write_queue.append(ft.partial(f.write_float, self.unknown_11))
-        if self.rotation_value is not None:
-            flag |= MovementFlag.HAS_ROTATION_VALUE
-            write_queue.append(ft.partial(f.write_float, self.rotation_value))
+        header_offset = f.reserve(_LINKED_HEADER.size)
+
+        flag = _FLAG_CODEC.write(self, file_version, f)
+
         if self.submovement_offset is not None:
-            flag |= MovementFlag.HAS_SUBMOVEMENT
-            write_queue.append(ft.partial(f.write_float, self.submovement_offset.x))
-            write_queue.append(ft.partial(f.write_float, self.submovement_offset.y))
-            write_queue.append(ft.partial(f.write_int, self.submovement_link_id))
-        if self.mystery_point is not None:
-            flag |= MovementFlag.HAS_MYSTERY_POINT
-            write_queue.append(ft.partial(f.write_float, self.mystery_point.x))
-            write_queue.append(ft.partial(f.write_float, self.mystery_point.y))
-
-        f.write_int(self.main_link_id)
+            flag |= _HAS_SUBMOVEMENT
+            self.submovement_offset.write_data(file_version, f)
+            f.write_int(self.submovement_link_id)
+
+        flag |= _TAIL_FLAG_CODEC.write(self, file_version, f)
+
         movement_value = -int(self.movement_type) if self.is_reversed else int(self.movement_type)
-        f.write_byte(movement_value)
-        f.write_float(self.anchor_point.x)
-        f.write_float(self.anchor_point.y)
-        f.write_short(self.time_period)
-        f.write_bitfield(flag, 2)
-
-        for write_action in write_queue:
-            write_action()
+        f.patch_struct(
+                header_offset,
+                _LINKED_HEADER,
+                self.main_link_id,
+                movement_value,
+                self.anchor_point.x,
+                self.anchor_point.y,
+                self.time_period,
+                flag,
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "main_link_id": self.main_link_id,
+                "is_reversed": self.is_reversed,
+                "movement_type": self.movement_type.value,
+                "anchor_point": self.anchor_point.to_json(),
+                "time_period": self.time_period,
+                "initial_frame": self.initial_frame,
+                "radius_1": self.radius_1,
+                "radius_2": self.radius_2,
+                "initial_phase": self.initial_phase,
+                "move_rotation": self.move_rotation,
+                "pause_1_duration": self.pause_1_duration,
+                "pause_2_duration": self.pause_2_duration,
+                "pause_1_phase_percentage": self.pause_1_phase_percentage,
+                "pause_2_phase_percentage": self.pause_2_phase_percentage,
+                "post_delay_phase": self.post_delay_phase,
+                "max_angle": self.max_angle,
+                "unknown_11": self.unknown_11,
+                "rotation_value": self.rotation_value,
+                "submovement_offset": None if self.submovement_offset is None else self.submovement_offset.to_json(),
+                "submovement_link_id": self.submovement_link_id,
+                "submovement_": None if self.submovement_ is None else self.submovement_.to_json(),
+                "mystery_point": None if self.mystery_point is None else self.mystery_point.to_json(),
+                "unknown_15": self.unknown_15,
+        }
+
+    @classmethod
+    def from_json(
+            cls,
+            data: dict[str, Any],
+            *,
+            movement_callback: Callable[[dict[str, Any]], Self],
+            **kwargs,
+    ) -> Self:
+        return cls(
+                main_link_id=data["main_link_id"],
+                is_reversed=data["is_reversed"],
+                movement_type=MovementType(data["movement_type"]),
+                anchor_point=Point2D.from_json(data["anchor_point"]),
+                time_period=data["time_period"],
+                initial_frame=data["initial_frame"],
+                radius_1=data["radius_1"],
+                radius_2=data["radius_2"],
+                initial_phase=data["initial_phase"],
+                move_rotation=data["move_rotation"],
+                pause_1_duration=data["pause_1_duration"],
+                pause_2_duration=data["pause_2_duration"],
+                pause_1_phase_percentage=data["pause_1_phase_percentage"],
+                pause_2_phase_percentage=data["pause_2_phase_percentage"],
+                post_delay_phase=data["post_delay_phase"],
+                max_angle=data["max_angle"],
+                unknown_11=data["unknown_11"],
+                rotation_value=data["rotation_value"],
+                submovement_offset=(
+                        None if data["submovement_offset"] is None
+                        else Point2D.from_json(data["submovement_offset"])
+                ),
+                submovement_link_id=data["submovement_link_id"],
+                submovement_=None if data["submovement_"] is None else movement_callback(data["submovement_"]),
+                mystery_point=None if data["mystery_point"] is None else Point2D.from_json(data["mystery_point"]),
+                unknown_15=data["unknown_15"],
+        )
 
     @property
     def complexity(self) -> int:
@@ -4,9 +4,7 @@ Created on 2023/11/27
 
 @author: brassbeat
 """
-import dataclasses
 import json
-import logging
 from collections.abc import Iterator, Callable
 from dataclasses import dataclass
 from typing import Self, TextIO, Any
@@ -22,9 +20,10 @@ from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
 from .generic import GenericObject
 from level.protocols import SpecificObjectData
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 
 _OBJECT_TYPES: dict[int, type[SpecificObjectData]] = {
@@ -34,8 +33,9 @@ _OBJECT_TYPES: dict[int, type[SpecificObjectData]] = {
 }
 
 
-@dataclass
-class PeggleObject:
+@positional_pickle
+@dataclass(slots=True)
+class PeggleObject(Trackable):
     generic_data: GenericObject
     specific_data: SpecificObjectData
     is_parent_object: bool = True
@@ -80,47 +80,105 @@ class PeggleObject:
         looked up,
         and `setter` is a setter function for its corresponding attribute.
         """
-        _logger.debug("Searching for submovement to unlink...")
         if (movement := self.movement_data) is not None:
-            _logger.debug("Found movement data...")
             if movement.submovement_ is not None:
                 yield movement.submovement_, self.unlink_submovement
 
-        _logger.debug("Searching for teleport to unlink...")
         if isinstance(self.specific_data, Teleport):
-            _logger.debug("Found teleport data, searching for exit to unlink...")
             if self.specific_data.subobject is not None:
                 yield self.specific_data.subobject, self.unlink_teleport_exit
 
     def unlink_submovement(self, link_id: int):
-        _logger.debug(f"Unlinking submovement ({link_id=})..")
         self.movement_data.submovement_ = None
         self.movement_data.submovement_link_id = link_id
 
     def unlink_teleport_exit(self, link_id: int):
-        _logger.debug(f"Unlinking teleport exit ({link_id=})..")
         self.specific_data: Teleport
         self.specific_data.subobject = None
         self.specific_data.subobject_link_id = link_id
 
+    def get_link_ids(self) -> Iterator[tuple[int, Callable[[Any], None]]]:
+        """
+        Counterpart of `get_linked_entries` for objects whose nested entries have been replaced by link ids.
+        :return: Iterator yielding (`link_id`, `setter`) tuples, where `link_id` is the link id to be resolved and
+        `setter` is a setter function for its corresponding attribute.
+        """
+        if (movement := self.movement_data) is not None:
+            if movement.submovement_ is None and movement.submovement_link_id is not None:
+                yield movement.submovement_link_id, self.link_submovement
+
+        if isinstance(self.specific_data, Teleport):
+            if self.specific_data.subobject is None and self.specific_data.subobject_link_id is not None:
+                yield self.specific_data.subobject_link_id, self.link_teleport_exit
+
+    def link_submovement(self, submovement: Movement):
+        self.movement_data.submovement_ = submovement
+        self.movement_data.submovement_link_id = None
+
+    def link_teleport_exit(self, subobject: Self):
+        self.specific_data: Teleport
+        self.specific_data.subobject = subobject
+        self.specific_data.subobject_link_id = None
+
     @classmethod
     def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
-        _logger.debug("Reading in object type...")
+        if TRACE_ENABLED:
+            f.label("object_type")
         object_type = _OBJECT_TYPES.get(f.read_int(), InvalidPeggleObject)
-        _logger.debug(f"Found object type: {object_type.__name__}")
 
         generic_data = GenericObject.read_data(file_version, f, **kwargs)
         specific_data = object_type.read_data(file_version, f, **kwargs)
 
         return cls(generic_data, specific_data)
 
+    @staticmethod
+    def scan_data(file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        """
+        Skip over an object in the data stream, only storing what `LevelColumns` needs in `row`.
+        """
+        row["object_type"] = object_type = f.read_int()
+        GenericObject.scan_data(file_version, f, row, **kwargs)
+        _OBJECT_TYPES.get(object_type, InvalidPeggleObject).scan_data(file_version, f, row, **kwargs)
+
+    @staticmethod
+    def locate_data(file_version: int, f: PeggleDataReader, locations: dict[str, FieldLocation], **kwargs) -> None:
+        """
+        Skip over an object in the data stream, storing where its fields are in `locations`, keyed by their attribute
+        path from the object, like "specific_data.position" or "generic_data.peg_data.type".
+        """
+        object_type = f.read_int()
+        GenericObject.locate_data(file_version, f, "generic_data.", locations, **kwargs)
+        _OBJECT_TYPES.get(object_type, InvalidPeggleObject).locate_data(
+                file_version,
+                f,
+                "specific_data.",
+                locations,
+                **kwargs,
+        )
+
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
         f.write_int(self.specific_data.TYPE_VALUE)
         self.generic_data.write_data(file_version, f)
         self.specific_data.write_data(file_version, f)
 
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "generic_data": self.generic_data.to_json(),
+                "specific_data": self.specific_data.to_json(),
+                "is_parent_object": self.is_parent_object,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        object_type = _OBJECT_TYPES.get(data["specific_data"]["TYPE_VALUE"], InvalidPeggleObject)
+
+        generic_data = GenericObject.from_json(data["generic_data"], **kwargs)
+        specific_data = object_type.from_json(data["specific_data"], **kwargs)
+
+        return cls(generic_data, specific_data, data["is_parent_object"])
+
     def export_json(self, f: TextIO):
-        json.dump(dataclasses.asdict(self), f, indent=2)
+        json.dump(self.to_json(), f, indent=2)
 
 
 def main():
@@ -4,22 +4,41 @@ Created on 2023/11/27
 
 @author: brassbeat
 """
-import functools as ft
-import logging
-from collections import deque
+import struct
 from dataclasses import dataclass
-from typing import Self
+from typing import Self, Any
 
+from .flag_codec import FieldLocation, FlagCodec, FlagField
 from .flags import PegInfoFlag
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
-
-@dataclass
-class PegInfo:
+from level.tracing import TRACE_ENABLED
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
+
+# type, flag
+_HEADER = struct.Struct("<bB")
+
+_CAN_BE_ORANGE = int(PegInfoFlag.CAN_BE_ORANGE)
+
+_FLAG_CODEC = FlagCodec(
+        "PegInfo",
+        [
+                FlagField(PegInfoFlag.UNKNOWN_0, "unknown_0", "bool"),
+                FlagField(PegInfoFlag.CAN_BE_ORANGE, "can_be_orange", "bool"),
+                FlagField(PegInfoFlag.UNKNOWN_2, "unknown_2", "int"),
+                FlagField(PegInfoFlag.CAN_QUICK_DISAPPEAR, "can_quick_disappear", "bool"),
+                FlagField(PegInfoFlag.UNKNOWN_4, "unknown_4", "int"),
+                FlagField(PegInfoFlag.UNKNOWN_5, "unknown_5", "byte"),
+                FlagField(PegInfoFlag.UNKNOWN_6, "unknown_6", "bool"),
+                FlagField(PegInfoFlag.UNKNOWN_7, "unknown_7", "byte"),
+        ],
+)
+
+
+@positional_pickle
+@dataclass(slots=True)
+class PegInfo(Trackable):
     type: int
     unknown_0: bool
     can_be_orange: bool
@@ -31,80 +50,65 @@ class PegInfo:
     unknown_7: int | None
 
     @classmethod
-    def read_data(cls, _: int, f: PeggleDataReader) -> Self:
-        _logger.debug("Reading in peginfo type...")
-        type_ = f.read_byte()
-        _logger.debug("reading in peginfo flags...")
-        flag = PegInfoFlag(f.read_bitfield(1))
-
-        unknown_0 = PegInfoFlag.UNKNOWN_0 in flag
-        can_be_orange = PegInfoFlag.CAN_BE_ORANGE in flag
-        if PegInfoFlag.UNKNOWN_2 in flag:
-            _logger.debug("Reading in peginfo field 2...")
-            unknown_2 = f.read_int()
-        else:
-            unknown_2 = None
-        can_quick_disappear = PegInfoFlag.CAN_QUICK_DISAPPEAR in flag
-        if PegInfoFlag.UNKNOWN_4 in flag:
-            _logger.debug("Reading in peginfo field 4...")
-            unknown_4 = f.read_int()
-        else:
-            unknown_4 = None
-        if PegInfoFlag.UNKNOWN_5 in flag:
-            _logger.debug("Reading in peginfo field 5...")
-            unknown_5 = f.read_byte()
-        else:
-            unknown_5 = None
-        unknown_6 = PegInfoFlag.UNKNOWN_6 in flag
-        if PegInfoFlag.UNKNOWN_7 in flag:
-            _logger.debug("Reading in peginfo field 7...")
-            unknown_7 = f.read_byte()
-        else:
-            unknown_7 = None
+    def read_data(cls, file_version: int, f: PeggleDataReader) -> Self:
+        if TRACE_ENABLED:
+            f.label("header")
+        type_, flag = f.read_struct(_HEADER)
+
+        return cls(type=type_, **_FLAG_CODEC.read(file_version, f, flag, {}))
+
+    @staticmethod
+    def scan_data(file_version: int, f: PeggleDataReader) -> tuple[int, bool]:
+        """
+        Skip over peg info in the data stream, only decoding what `LevelColumns` needs.
+        :return: Peg type and whether the peg can be orange.
+        """
+        type_, flag = f.read_struct(_HEADER)
+        _FLAG_CODEC.skip(file_version, f, flag)
+        return type_, flag & _CAN_BE_ORANGE != 0
+
+    @staticmethod
+    def locate_data(file_version: int, f: PeggleDataReader, prefix: str, locations: dict[str, FieldLocation]) -> None:
+        """
+        Skip over peg info in the data stream, storing where its fields are in `locations`, see `FlagCodec.locate`.
+        """
+        header_offset = f.position
+        _, flag = f.read_struct(_HEADER)
+        locations[f"{prefix}type"] = FieldLocation("byte", header_offset, optional=False)
+        _FLAG_CODEC.locate(file_version, f, flag, header_offset + 1, 1, prefix, locations)
+
+    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
+        header_offset = f.reserve(_HEADER.size)
+        flag = _FLAG_CODEC.write(self, file_version, f)
+        f.patch_struct(header_offset, _HEADER, self.type, flag)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "type": self.type,
+                "unknown_0": self.unknown_0,
+                "can_be_orange": self.can_be_orange,
+                "unknown_2": self.unknown_2,
+                "can_quick_disappear": self.can_quick_disappear,
+                "unknown_4": self.unknown_4,
+                "unknown_5": self.unknown_5,
+                "unknown_6": self.unknown_6,
+                "unknown_7": self.unknown_7,
+        }
 
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Self:
         return cls(
-                type=type_,
-                unknown_0=unknown_0,
-                can_be_orange=can_be_orange,
-                unknown_2=unknown_2,
-                can_quick_disappear=can_quick_disappear,
-                unknown_4=unknown_4,
-                unknown_5=unknown_5,
-                unknown_6=unknown_6,
-                unknown_7=unknown_7,
+                type=data["type"],
+                unknown_0=data["unknown_0"],
+                can_be_orange=data["can_be_orange"],
+                unknown_2=data["unknown_2"],
+                can_quick_disappear=data["can_quick_disappear"],
+                unknown_4=data["unknown_4"],
+                unknown_5=data["unknown_5"],
+                unknown_6=data["unknown_6"],
+                unknown_7=data["unknown_7"],
         )
 
-    def write_data(self, _: int, f: PeggleDataWriter) -> None:
-        f.write_byte(self.type)
-
-        write_queue = deque()
-        flag = PegInfoFlag(0)
-
-        if self.unknown_0:
-            flag |= PegInfoFlag.UNKNOWN_0
-        if self.can_be_orange:
-            flag |= PegInfoFlag.CAN_BE_ORANGE
-        if self.unknown_2 is not None:
-            flag |= PegInfoFlag.UNKNOWN_2
-            write_queue.append(ft.partial(f.write_int, self.unknown_2))
-        if self.can_quick_disappear:
-            flag |= PegInfoFlag.CAN_QUICK_DISAPPEAR
-        if self.unknown_4 is not None:
-            flag |= PegInfoFlag.UNKNOWN_4
-            write_queue.append(ft.partial(f.write_int, self.unknown_4))
-        if self.unknown_5 is not None:
-            flag |= PegInfoFlag.UNKNOWN_5
-            write_queue.append(ft.partial(f.write_byte, self.unknown_5))
-        if self.unknown_6:
-            flag |= PegInfoFlag.UNKNOWN_6
-        if self.unknown_7 is not None:
-            flag |= PegInfoFlag.UNKNOWN_7
-            write_queue.append(ft.partial(f.write_byte, self.unknown_7))
-
-        f.write_bitfield(flag, 1)
-        for write_action in write_queue:
-            write_action()
-
 
 def main():
     pass
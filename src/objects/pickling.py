@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Compact pickling for the object model dataclasses.
+
+By default a slotted dataclass pickles as a dict of slot names to values, repeating every field name for every
+object. `positional_pickle` makes it pickle as its class and a tuple of its init arguments instead, which is about
+half the size and twice as fast to load for a whole level.
+"""
+import dataclasses
+from typing import Any, TypeVar
+
+from objects.flags import LazyFlag
+
+_T = TypeVar("_T", bound=type)
+
+
+def positional_pickle(cls: _T) -> _T:
+    """
+    Class decorator making a dataclass pickle as `(cls, (field values...))`. Fields that are `LazyFlag`s are stored as
+    their raw int.
+    """
+    attributes: list[str] | None = None
+
+    def __reduce__(self) -> tuple[type, tuple[Any, ...]]:
+        nonlocal attributes
+        if attributes is None:
+            attributes = [
+                f"_{field.name}" if isinstance(cls.__dict__.get(field.name), LazyFlag) else field.name
+                for field in dataclasses.fields(cls)
+                if field.init
+            ]
+        return cls, tuple([getattr(self, name) for name in attributes])
+
+    cls.__reduce__ = __reduce__
+    return cls
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,34 @@ Created on 2023/12/04
 
 @author: brassbeat
 """
+import struct
 from dataclasses import dataclass
+from typing import Self, Any
 
+from level.level_reader import PeggleDataReader
+from level.level_writer import PeggleDataWriter
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
-@dataclass
-class Point2D:
+_LAYOUT = struct.Struct("<ff")
+
+
+@positional_pickle
+@dataclass(slots=True)
+class Point2D(Trackable):
     x: float
     y: float
+
+    @classmethod
+    def read_data(cls, _: int, f: PeggleDataReader) -> Self:
+        return cls(*f.read_struct(_LAYOUT))
+
+    def write_data(self, _: int, f: PeggleDataWriter) -> None:
+        f.write_struct(_LAYOUT, self.x, self.y)
+
+    def to_json(self) -> dict[str, Any]:
+        return {"x": self.x, "y": self.y}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Self:
+        return cls(data["x"], data["y"])
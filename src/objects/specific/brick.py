@@ -4,30 +4,82 @@ Created on 2023/12/02
 
 @author: brassbeat
 """
-import dataclasses
-import functools as ft
-import logging
-from collections import deque
+import struct
 from dataclasses import dataclass
-from typing import Self, Callable
+from typing import ClassVar, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation, FlagCodec, FlagField
 from objects.flags import BrickFlagA, BrickFlagAExtended, BrickFlagB
 from objects.point_2d import Point2D
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 _DEFAULT_CURVE_POINTS = 2
 
 _DEFAULT_WIDTH = 20.0
 
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
 _FLAG_A_EXTENDED_MIN_VERSION = int("0x23", 16)
 
-
-@dataclass
-class Brick:
+# length, rotation angle, unknown bytes
+_TAIL = struct.Struct("<ff4B")
+
+_FLAG_A_CODEC = FlagCodec(
+        "Brick flag A",
+        [
+                FlagField(BrickFlagA.UNKNOWN_0, "unknown_a0", "bool"),
+                FlagField(BrickFlagA.UNKNOWN_2, "unknown_a2", "float"),
+                FlagField(BrickFlagA.UNKNOWN_3, "unknown_a3", "float"),
+                FlagField(BrickFlagA.UNKNOWN_5, "unknown_a5", "float"),
+                FlagField(BrickFlagA.UNKNOWN_1, "unknown_a1", "byte"),
+                FlagField(BrickFlagA.HAS_FIXED_COORDINATES, "position", "point"),
+                FlagField(BrickFlagA.UNKNOWN_6, "unknown_a6", "bool"),
+                FlagField(BrickFlagA.UNKNOWN_7, "unknown_a7", "bool"),
+        ],
+)
+
+_FLAG_A_EXTENDED_CODEC = FlagCodec(
+        "Brick flag A extended",
+        [
+                FlagField(BrickFlagAExtended.UNKNOWN_8, "unknown_a8", "byte"),
+                FlagField(BrickFlagAExtended.UNKNOWN_9, "unknown_a9", "int"),
+                FlagField(BrickFlagAExtended.UNKNOWN_10, "unknown_a10", "short"),
+                FlagField(BrickFlagAExtended.UNKNOWN_11, "unknown_a11", "bool"),
+                FlagField(BrickFlagAExtended.UNKNOWN_12, "unknown_a12", "bool"),
+                FlagField(BrickFlagAExtended.UNKNOWN_13, "unknown_a13", "bool"),
+                FlagField(BrickFlagAExtended.UNKNOWN_14, "unknown_a14", "bool"),
+                FlagField(BrickFlagAExtended.UNKNOWN_15, "unknown_a15", "bool"),
+        ],
+)
+
+_FLAG_B_CODEC = FlagCodec(
+        "Brick flag B",
+        [
+                FlagField(BrickFlagB.UNKNOWN_8, "unknown_b8", "float"),
+                FlagField(BrickFlagB.UNKNOWN_9, "unknown_b9", "float"),
+                FlagField(BrickFlagB.IS_FLIPPED_TEXTURE, "is_flipped_texture", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_11, "unknown_b11", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_12, "unknown_b12", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_13, "unknown_b13", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_14, "unknown_b14", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_15, "unknown_b15", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_0, "unknown_b0", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_1, "unknown_b1", "bool"),
+                FlagField(BrickFlagB.UNKNOWN_2, "unknown_b2", "byte"),
+                FlagField(BrickFlagB.HAS_CUSTOM_CURVE_POINTS, "curve_points", "byte", default=_DEFAULT_CURVE_POINTS),
+                FlagField(BrickFlagB.HAS_LEFT_SLANT, "left_slant", "float"),
+                FlagField(BrickFlagB.HAS_RIGHT_SLANT, ("unknown_b6", "right_slant"), "float"),
+                FlagField(BrickFlagB.HAS_SECTOR_ANGLE, "sector_angle", "float"),
+                FlagField(BrickFlagB.HAS_CUSTOM_WIDTH, "width", "float", default=_DEFAULT_WIDTH),
+        ],
+)
+
+
+@positional_pickle
+@dataclass(slots=True)
+class Brick(Trackable):
     length: float
     rotation_angle: float
     unknown_bytes: list[int]
@@ -67,296 +119,197 @@ class Brick:
     unknown_b14: bool
     unknown_b15: bool
 
-    TYPE_VALUE: int = dataclasses.field(default=6, init=False, repr=False)
+    TYPE_VALUE: ClassVar[int] = 6
 
     @classmethod
     def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
-        _logger.debug("reading in flag A...")
-        flag_a = BrickFlagA(f.read_bitfield(1))
+        if TRACE_ENABLED:
+            f.label("flag_a")
+        flag_a = f.read_bitfield(1)
         if file_version >= _FLAG_A_EXTENDED_MIN_VERSION:
-            _logger.debug("reading in flag A extension...")
-            flag_a_extended = BrickFlagAExtended(f.read_bitfield(1))
+            if TRACE_ENABLED:
+                f.label("flag_a_extended")
+            flag_a_extended = f.read_bitfield(1)
+        else:
+            flag_a_extended = 0
 
-        unknown_a0 = BrickFlagA.UNKNOWN_0 in flag_a
+        values = _FLAG_A_CODEC.read(file_version, f, flag_a, {})
+        # without an extended flag, every extended field reads as absent
+        _FLAG_A_EXTENDED_CODEC.read(file_version, f, flag_a_extended, values)
 
-        if BrickFlagA.UNKNOWN_2 in flag_a:
-            _logger.debug("Reading in unknown a2...")
-            unknown_a2 = f.read_float()
-        else:
-            unknown_a2 = None
-        if BrickFlagA.UNKNOWN_3 in flag_a:
-            _logger.debug("Reading in unknown a3...")
-            unknown_a3 = f.read_float()
-        else:
-            unknown_a3 = None
-        if BrickFlagA.UNKNOWN_5 in flag_a:
-            _logger.debug("Reading in unknown a5...")
-            unknown_a5 = f.read_float()
-        else:
-            unknown_a5 = None
-        if BrickFlagA.UNKNOWN_1 in flag_a:
-            _logger.debug("Reading in unknown a1...")
-            unknown_a1 = f.read_byte()
-        else:
-            unknown_a1 = None
-        if BrickFlagA.HAS_FIXED_COORDINATES in flag_a:
-            _logger.debug("Reading in coordinates...")
-            position = Point2D(f.read_float(), f.read_float())
-        else:
-            position = None
-
-        unknown_a6 = BrickFlagA.UNKNOWN_6 in flag_a
-        unknown_a7 = BrickFlagA.UNKNOWN_7 in flag_a
-
-        if file_version < _FLAG_A_EXTENDED_MIN_VERSION:
-            unknown_a8 = None
-            unknown_a9 = None
-            unknown_a10 = None
-            unknown_a11 = False
-            unknown_a12 = False
-            unknown_a13 = False
-            unknown_a14 = False
-            unknown_a15 = False
-        else:
-            # noinspection PyUnboundLocalVariable
-            if BrickFlagAExtended.UNKNOWN_8 in flag_a_extended:
-                _logger.debug("Reading in unknown a8...")
-                unknown_a8 = f.read_byte()
-            else:
-                unknown_a8 = None
-            if BrickFlagAExtended.UNKNOWN_9 in flag_a_extended:
-                _logger.debug("Reading in unknown a9...")
-                unknown_a9 = f.read_int()
-            else:
-                unknown_a9 = None
-            if BrickFlagAExtended.UNKNOWN_10 in flag_a_extended:
-                _logger.debug("Reading in unknown a10...")
-                unknown_a10 = f.read_short()
-            else:
-                unknown_a10 = None
-
-            unknown_a11 = BrickFlagAExtended.UNKNOWN_11 in flag_a_extended
-            unknown_a12 = BrickFlagAExtended.UNKNOWN_12 in flag_a_extended
-            unknown_a13 = BrickFlagAExtended.UNKNOWN_13 in flag_a_extended
-            unknown_a14 = BrickFlagAExtended.UNKNOWN_14 in flag_a_extended
-            unknown_a15 = BrickFlagAExtended.UNKNOWN_15 in flag_a_extended
-
-        _logger.debug("Reading in flag B...")
-        flag_b = BrickFlagB(f.read_bitfield(2))
-
-        if BrickFlagB.UNKNOWN_8 in flag_b:
-            _logger.debug("Reading in unknown b8...")
-            unknown_b8 = f.read_float()
-        else:
-            unknown_b8 = None
-        if BrickFlagB.UNKNOWN_9 in flag_b:
-            _logger.debug("Reading in unknown b9...")
-            unknown_b9 = f.read_float()
-        else:
-            unknown_b9 = None
+        if TRACE_ENABLED:
+            f.label("flag_b")
+        flag_b = f.read_bitfield(2)
+        _FLAG_B_CODEC.read(file_version, f, flag_b, values)
 
-        unknown_b0 = BrickFlagB.UNKNOWN_0 in flag_b
-        unknown_b1 = BrickFlagB.UNKNOWN_1 in flag_b
+        if TRACE_ENABLED:
+            f.label("tail")
+        length, rotation_angle, *unknown_bytes = f.read_struct(_TAIL)
 
-        if BrickFlagB.UNKNOWN_2 in flag_b:
-            _logger.debug("Reading in unknown b2...")
-            unknown_b2 = f.read_byte()
-        else:
-            unknown_b2 = None
-        if BrickFlagB.HAS_CUSTOM_CURVE_POINTS in flag_b:
-            _logger.debug("Reading in curve points...")
-            curve_points = f.read_byte()
-        else:
-            curve_points = _DEFAULT_CURVE_POINTS
-        if BrickFlagB.HAS_LEFT_SLANT in flag_b:
-            _logger.debug("Reading in left slant...")
-            left_slant = f.read_float()
-        else:
-            left_slant = None
-        if BrickFlagB.HAS_RIGHT_SLANT in flag_b:
-            _logger.debug("Reading in unknown b6...")
-            unknown_b6 = f.read_float()
-            _logger.debug("Reading in right slant...")
-            right_slant = f.read_float()
-        else:
-            unknown_b6 = None
-            right_slant = None
-        if BrickFlagB.HAS_SECTOR_ANGLE in flag_b:
-            _logger.debug("Reading in sector angle...")
-            sector_angle = f.read_float()
-        else:
-            sector_angle = None
-        if BrickFlagB.HAS_CUSTOM_WIDTH in flag_b:
-            _logger.debug("Reading in width...")
-            width = f.read_float()
+        return cls(length=length, rotation_angle=rotation_angle, unknown_bytes=unknown_bytes, **values)
+
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        """
+        Skip over brick data in the data stream, only storing what `LevelColumns` needs in `row`.
+        """
+        flag_a = f.read_bitfield(1)
+        if file_version >= _FLAG_A_EXTENDED_MIN_VERSION:
+            flag_a_extended = f.read_bitfield(1)
         else:
-            width = _DEFAULT_WIDTH
-
-        is_flipped_texture = BrickFlagB.IS_FLIPPED_TEXTURE in flag_b
-        unknown_b11 = BrickFlagB.UNKNOWN_11 in flag_b
-        unknown_b12 = BrickFlagB.UNKNOWN_12 in flag_b
-        unknown_b13 = BrickFlagB.UNKNOWN_13 in flag_b
-        unknown_b14 = BrickFlagB.UNKNOWN_14 in flag_b
-        unknown_b15 = BrickFlagB.UNKNOWN_15 in flag_b
-
-        _logger.debug("Reading in length...")
-        length = f.read_float()
-        _logger.debug("Reading in rotation angle...")
-        rotation_angle = f.read_float()
-        _logger.debug("Reading in mystery bytes...")
-        unknown_bytes = list(f.read_raw(4))
+            flag_a_extended = 0
 
-        return cls(
-                length=length,
-                rotation_angle=rotation_angle,
-                unknown_bytes=unknown_bytes,
-                unknown_a0=unknown_a0,
-                unknown_a1=unknown_a1,
-                unknown_a2=unknown_a2,
-                unknown_a3=unknown_a3,
-                position=position,
-                unknown_a5=unknown_a5,
-                unknown_a6=unknown_a6,
-                unknown_a7=unknown_a7,
-                unknown_a8=unknown_a8,
-                unknown_a9=unknown_a9,
-                unknown_a10=unknown_a10,
-                unknown_a11=unknown_a11,
-                unknown_a12=unknown_a12,
-                unknown_a13=unknown_a13,
-                unknown_a14=unknown_a14,
-                unknown_a15=unknown_a15,
-                unknown_b0=unknown_b0,
-                unknown_b1=unknown_b1,
-                unknown_b2=unknown_b2,
-                curve_points=curve_points,
-                sector_angle=sector_angle,
-                left_slant=left_slant,
-                unknown_b6=unknown_b6,
-                right_slant=right_slant,
-                width=width,
-                unknown_b8=unknown_b8,
-                unknown_b9=unknown_b9,
-                is_flipped_texture=is_flipped_texture,
-                unknown_b11=unknown_b11,
-                unknown_b12=unknown_b12,
-                unknown_b13=unknown_b13,
-                unknown_b14=unknown_b14,
-                unknown_b15=unknown_b15,
+        values = _FLAG_A_CODEC.read(file_version, f, flag_a, {})
+        if (position := values["position"]) is not None:
+            row["x"], row["y"] = position.x, position.y
+        _FLAG_A_EXTENDED_CODEC.skip(file_version, f, flag_a_extended)
+
+        flag_b = f.read_bitfield(2)
+        _FLAG_B_CODEC.skip(file_version, f, flag_b)
+        f.skip(_TAIL.size)
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        """
+        Skip over brick data in the data stream, storing where its fields are in `locations`, see `FlagCodec.locate`.
+        The unknown bytes of the tail are not located.
+        """
+        flag_a_offset = f.position
+        flag_a = f.read_bitfield(1)
+        if file_version >= _FLAG_A_EXTENDED_MIN_VERSION:
+            flag_a_extended_offset = f.position
+            flag_a_extended = f.read_bitfield(1)
+        else:
+            flag_a_extended_offset = None
+            flag_a_extended = 0
+
+        _FLAG_A_CODEC.locate(file_version, f, flag_a, flag_a_offset, 1, prefix, locations)
+        _FLAG_A_EXTENDED_CODEC.locate(
+                file_version,
+                f,
+                flag_a_extended,
+                flag_a_extended_offset,
+                1,
+                prefix,
+                locations,
         )
 
+        flag_b_offset = f.position
+        flag_b = f.read_bitfield(2)
+        _FLAG_B_CODEC.locate(file_version, f, flag_b, flag_b_offset, 2, prefix, locations)
+
+        locations[f"{prefix}length"] = FieldLocation("float", f.position, optional=False)
+        locations[f"{prefix}rotation_angle"] = FieldLocation("float", f.position + 4, optional=False)
+        f.skip(_TAIL.size)
+
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
-        write_queue_a: deque[Callable[[], None]] = deque()
-
-        flag_a = BrickFlagA(0)
-
-        if self.unknown_a0:
-            flag_a |= BrickFlagA.UNKNOWN_0
-        if self.unknown_a2 is not None:
-            flag_a |= BrickFlagA.UNKNOWN_2
-            write_queue_a.append(ft.partial(f.write_float, self.unknown_a2))
-        if self.unknown_a3 is not None:
-            flag_a |= BrickFlagA.UNKNOWN_3
-            write_queue_a.append(ft.partial(f.write_float, self.unknown_a3))
-        if self.unknown_a5 is not None:
-            flag_a |= BrickFlagA.UNKNOWN_5
-            write_queue_a.append(ft.partial(f.write_float, self.unknown_a5))
-        if self.unknown_a1 is not None:
-            flag_a |= BrickFlagA.UNKNOWN_1
-            write_queue_a.append(ft.partial(f.write_byte, self.unknown_a1))
-        if self.position is not None:
-            flag_a |= BrickFlagA.HAS_FIXED_COORDINATES
-            write_queue_a.append(ft.partial(f.write_float, self.position.x))
-            write_queue_a.append(ft.partial(f.write_float, self.position.y))
-        if self.unknown_a6:
-            flag_a |= BrickFlagA.UNKNOWN_6
-        if self.unknown_a7:
-            flag_a |= BrickFlagA.UNKNOWN_7
-
-        f.write_bitfield(flag_a, 1)
+        has_flag_a_extended = file_version >= _FLAG_A_EXTENDED_MIN_VERSION
+        flag_a_offset = f.reserve(1)
+        if has_flag_a_extended:
+            flag_a_extended_offset = f.reserve(1)
 
-        if file_version >= _FLAG_A_EXTENDED_MIN_VERSION:
-            flag_a_extended = BrickFlagAExtended(0)
-
-            if self.unknown_a8 is not None:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_8
-                write_queue_a.append(ft.partial(f.write_byte, self.unknown_a8))
-            if self.unknown_a9 is not None:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_9
-                write_queue_a.append(ft.partial(f.write_int, self.unknown_a9))
-            if self.unknown_a10 is not None:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_10
-                write_queue_a.append(ft.partial(f.write_short, self.unknown_a10))
-            if self.unknown_a11:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_11
-            if self.unknown_a12:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_12
-            if self.unknown_a13:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_13
-            if self.unknown_a14:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_14
-            if self.unknown_a15:
-                flag_a_extended |= BrickFlagAExtended.UNKNOWN_15
-
-            f.write_bitfield(flag_a_extended, 1)
-
-        for write_action in write_queue_a:
-            write_action()
-
-        write_queue_b: deque[Callable[[], None]] = deque()
-        flag_b = BrickFlagB(0)
-
-        if self.unknown_b8 is not None:
-            flag_b |= BrickFlagB.UNKNOWN_8
-            write_queue_b.append(ft.partial(f.write_float, self.unknown_b8))
-        if self.unknown_b9 is not None:
-            flag_b |= BrickFlagB.UNKNOWN_9
-            write_queue_b.append(ft.partial(f.write_float, self.unknown_b9))
-        if self.is_flipped_texture:
-            flag_b |= BrickFlagB.IS_FLIPPED_TEXTURE
-        if self.unknown_b11:
-            flag_b |= BrickFlagB.UNKNOWN_11
-        if self.unknown_b12:
-            flag_b |= BrickFlagB.UNKNOWN_12
-        if self.unknown_b13:
-            flag_b |= BrickFlagB.UNKNOWN_13
-        if self.unknown_b14:
-            flag_b |= BrickFlagB.UNKNOWN_14
-        if self.unknown_b15:
-            flag_b |= BrickFlagB.UNKNOWN_15
-
-        if self.unknown_b0:
-            flag_b |= BrickFlagB.UNKNOWN_0
-        if self.unknown_b1:
-            flag_b |= BrickFlagB.UNKNOWN_1
-        if self.unknown_b2 is not None:
-            flag_b |= BrickFlagB.UNKNOWN_2
-            write_queue_b.append(ft.partial(f.write_byte, self.unknown_b2))
-        if self.curve_points != _DEFAULT_CURVE_POINTS:
-            flag_b |= BrickFlagB.HAS_CUSTOM_CURVE_POINTS
-            write_queue_b.append(ft.partial(f.write_byte, self.curve_points))
-        if self.left_slant is not None:
-            flag_b |= BrickFlagB.HAS_LEFT_SLANT
-            write_queue_b.append(ft.partial(f.write_float, self.left_slant))
-        if self.unknown_b6 is not None:
-            flag_b |= BrickFlagB.HAS_RIGHT_SLANT
-            write_queue_b.append(ft.partial(f.write_float, self.unknown_b6))
-            write_queue_b.append(ft.partial(f.write_float, self.right_slant))
-        if self.sector_angle is not None:
-            flag_b |= BrickFlagB.HAS_SECTOR_ANGLE
-            write_queue_b.append(ft.partial(f.write_float, self.sector_angle))
-        if self.width != _DEFAULT_WIDTH:
-            flag_b |= BrickFlagB.HAS_CUSTOM_WIDTH
-            write_queue_b.append(ft.partial(f.write_float, self.width))
-
-        f.write_bitfield(flag_b, 2)
-
-        for write_action in write_queue_b:
-            write_action()
-
-        f.write_float(self.length)
-        f.write_float(self.rotation_angle)
-        f.write_raw(bytes(self.unknown_bytes))
+        flag_a = _FLAG_A_CODEC.write(self, file_version, f)
+        f.patch_bitfield(flag_a_offset, flag_a, 1)
+
+        if has_flag_a_extended:
+            flag_a_extended = _FLAG_A_EXTENDED_CODEC.write(self, file_version, f)
+            # noinspection PyUnboundLocalVariable
+            f.patch_bitfield(flag_a_extended_offset, flag_a_extended, 1)
+
+        flag_b_offset = f.reserve(2)
+        flag_b = _FLAG_B_CODEC.write(self, file_version, f)
+        f.patch_bitfield(flag_b_offset, flag_b, 2)
+
+        f.write_struct(_TAIL, self.length, self.rotation_angle, *self.unknown_bytes)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "length": self.length,
+                "rotation_angle": self.rotation_angle,
+                "unknown_bytes": list(self.unknown_bytes),
+                "unknown_a0": self.unknown_a0,
+                "unknown_a1": self.unknown_a1,
+                "unknown_a2": self.unknown_a2,
+                "unknown_a3": self.unknown_a3,
+                "position": None if self.position is None else self.position.to_json(),
+                "unknown_a5": self.unknown_a5,
+                "unknown_a6": self.unknown_a6,
+                "unknown_a7": self.unknown_a7,
+                "unknown_a8": self.unknown_a8,
+                "unknown_a9": self.unknown_a9,
+                "unknown_a10": self.unknown_a10,
+                "unknown_a11": self.unknown_a11,
+                "unknown_a12": self.unknown_a12,
+                "unknown_a13": self.unknown_a13,
+                "unknown_a14": self.unknown_a14,
+                "unknown_a15": self.unknown_a15,
+                "unknown_b0": self.unknown_b0,
+                "unknown_b1": self.unknown_b1,
+                "unknown_b2": self.unknown_b2,
+                "curve_points": self.curve_points,
+                "sector_angle": self.sector_angle,
+                "left_slant": self.left_slant,
+                "unknown_b6": self.unknown_b6,
+                "right_slant": self.right_slant,
+                "width": self.width,
+                "unknown_b8": self.unknown_b8,
+                "unknown_b9": self.unknown_b9,
+                "is_flipped_texture": self.is_flipped_texture,
+                "unknown_b11": self.unknown_b11,
+                "unknown_b12": self.unknown_b12,
+                "unknown_b13": self.unknown_b13,
+                "unknown_b14": self.unknown_b14,
+                "unknown_b15": self.unknown_b15,
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        return cls(
+                length=data["length"],
+                rotation_angle=data["rotation_angle"],
+                unknown_bytes=data["unknown_bytes"],
+                unknown_a0=data["unknown_a0"],
+                unknown_a1=data["unknown_a1"],
+                unknown_a2=data["unknown_a2"],
+                unknown_a3=data["unknown_a3"],
+                position=None if data["position"] is None else Point2D.from_json(data["position"]),
+                unknown_a5=data["unknown_a5"],
+                unknown_a6=data["unknown_a6"],
+                unknown_a7=data["unknown_a7"],
+                unknown_a8=data["unknown_a8"],
+                unknown_a9=data["unknown_a9"],
+                unknown_a10=data["unknown_a10"],
+                unknown_a11=data["unknown_a11"],
+                unknown_a12=data["unknown_a12"],
+                unknown_a13=data["unknown_a13"],
+                unknown_a14=data["unknown_a14"],
+                unknown_a15=data["unknown_a15"],
+                unknown_b0=data["unknown_b0"],
+                unknown_b1=data["unknown_b1"],
+                unknown_b2=data["unknown_b2"],
+                curve_points=data["curve_points"],
+                sector_angle=data["sector_angle"],
+                left_slant=data["left_slant"],
+                unknown_b6=data["unknown_b6"],
+                right_slant=data["right_slant"],
+                width=data["width"],
+                unknown_b8=data["unknown_b8"],
+                unknown_b9=data["unknown_b9"],
+                is_flipped_texture=data["is_flipped_texture"],
+                unknown_b11=data["unknown_b11"],
+                unknown_b12=data["unknown_b12"],
+                unknown_b13=data["unknown_b13"],
+                unknown_b14=data["unknown_b14"],
+                unknown_b15=data["unknown_b15"],
+        )
 
 
 def main():
@@ -4,26 +4,39 @@ Created on 2023/11/28
 
 @author: brassbeat
 """
-import dataclasses
-import functools as ft
-import logging
-from collections import deque
 from dataclasses import dataclass
-from typing import Self
+from typing import ClassVar, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
-from objects.flags import CircleFlag, CircleExtendedFlag
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation, FlagCodec, FlagField
+from objects.flags import CircleFlag, CircleExtendedFlag, lazy_flags
 from objects.point_2d import Point2D
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 _EXTENDED_FLAG_MIN_VERSION = int("0x52", 16)
 
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
-
-@dataclass
-class Circle:
+_FLAG_CODEC = FlagCodec(
+        "Circle",
+        [
+                FlagField(CircleFlag.HAS_NORMAL_PHYSICS, "has_normal_physics", "bool"),
+                FlagField(CircleFlag.HAS_FIXED_COORDINATES, "position", "point"),
+                FlagField(CircleFlag.UNKNOWN_2, "unknown_2", "bool"),
+                FlagField(CircleFlag.UNKNOWN_3, "unknown_3", "bool"),
+                FlagField(CircleFlag.UNKNOWN_4, "unknown_4", "bool"),
+                FlagField(CircleFlag.UNKNOWN_5, "unknown_5", "bool"),
+                FlagField(CircleFlag.UNKNOWN_6, "unknown_6", "bool"),
+                FlagField(CircleFlag.UNKNOWN_7, "unknown_7", "bool"),
+        ],
+)
+
+
+@positional_pickle
+@lazy_flags(extended_flag=CircleExtendedFlag)
+@dataclass(slots=True)
+class Circle(Trackable):
     radius: float
     
     has_normal_physics: bool
@@ -36,83 +49,106 @@ class Circle:
     unknown_7: bool
     
     extended_flag: CircleExtendedFlag | None
-    TYPE_VALUE: int = dataclasses.field(default=5, init=False, repr=False)
+    TYPE_VALUE: ClassVar[int] = 5
 
     @classmethod
     def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
-        _logger.debug("reading in circle flags...")
-        flag = CircleFlag(f.read_bitfield(1))
+        if TRACE_ENABLED:
+            f.label("flag")
+        flag = f.read_bitfield(1)
 
         if file_version >= _EXTENDED_FLAG_MIN_VERSION:
-            _logger.debug("reading in extended circle flags...")
-            extended_flag = CircleExtendedFlag(f.read_bitfield(1))
+            if TRACE_ENABLED:
+                f.label("extended_flag")
+            extended_flag = f.read_bitfield(1)
         else:
             extended_flag = None
 
-        has_normal_physics = CircleFlag.HAS_NORMAL_PHYSICS in flag
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
 
-        if CircleFlag.HAS_FIXED_COORDINATES in flag:
-            _logger.debug("Reading in coordinates...")
-            position = Point2D(f.read_float(), f.read_float())
-        else:
-            position = None
+        if TRACE_ENABLED:
+            f.label("radius")
+        radius = f.read_float()
 
-        unknown_2 = CircleFlag.UNKNOWN_2 in flag
-        unknown_3 = CircleFlag.UNKNOWN_3 in flag
-        unknown_4 = CircleFlag.UNKNOWN_4 in flag
-        unknown_5 = CircleFlag.UNKNOWN_5 in flag
-        unknown_6 = CircleFlag.UNKNOWN_6 in flag
-        unknown_7 = CircleFlag.UNKNOWN_7 in flag
+        return cls(radius=radius, extended_flag=extended_flag, **values)
 
-        _logger.debug("Reading in radius...")
-        radius = f.read_float()
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        """
+        Skip over circle data in the data stream, only storing what `LevelColumns` needs in `row`.
+        """
+        flag = f.read_bitfield(1)
+        if file_version >= _EXTENDED_FLAG_MIN_VERSION:
+            f.skip(1)
 
-        return cls(
-                has_normal_physics=has_normal_physics,
-                position=position,
-                unknown_2=unknown_2,
-                unknown_3=unknown_3,
-                unknown_4=unknown_4,
-                unknown_5=unknown_5,
-                unknown_6=unknown_6,
-                unknown_7=unknown_7,
-                extended_flag=extended_flag,
-                radius=radius
-        )
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
+        if (position := values["position"]) is not None:
+            row["x"], row["y"] = position.x, position.y
+        row["radius"] = f.read_float()
 
-    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
-        flag = CircleFlag(0)
-        write_queue = deque()
-
-        if self.has_normal_physics:
-            flag |= CircleFlag.HAS_NORMAL_PHYSICS
-        if self.position is not None:
-            flag |= CircleFlag.HAS_FIXED_COORDINATES
-            write_queue.append(ft.partial(f.write_float, self.position.x))
-            write_queue.append(ft.partial(f.write_float, self.position.y))
-        if self.unknown_2:
-            flag |= CircleFlag.UNKNOWN_2
-        if self.unknown_3:
-            flag |= CircleFlag.UNKNOWN_3
-        if self.unknown_4:
-            flag |= CircleFlag.UNKNOWN_4
-        if self.unknown_5:
-            flag |= CircleFlag.UNKNOWN_5
-        if self.unknown_6:
-            flag |= CircleFlag.UNKNOWN_6
-        if self.unknown_7:
-            flag |= CircleFlag.UNKNOWN_7
-
-        f.write_bitfield(flag, 1)
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        """
+        Skip over circle data in the data stream, storing where its fields are in `locations`, see
+        `FlagCodec.locate`.
+        """
+        flag_offset = f.position
+        flag = f.read_bitfield(1)
+        if file_version >= _EXTENDED_FLAG_MIN_VERSION:
+            locations[f"{prefix}extended_flag"] = FieldLocation("bitfield", f.position, optional=False)
+            f.skip(1)
+
+        _FLAG_CODEC.locate(file_version, f, flag, flag_offset, 1, prefix, locations)
+        locations[f"{prefix}radius"] = FieldLocation("float", f.position, optional=False)
+        f.skip(4)
 
+    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
+        flag_offset = f.reserve(1)
         if file_version >= _EXTENDED_FLAG_MIN_VERSION:
-            f.write_bitfield(self.extended_flag, 1)
+            f.write_bitfield(self._extended_flag, 1)
 
-        for write_action in write_queue:
-            write_action()
+        flag = _FLAG_CODEC.write(self, file_version, f)
+        f.patch_bitfield(flag_offset, flag, 1)
 
         f.write_float(self.radius)
 
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "radius": self.radius,
+                "has_normal_physics": self.has_normal_physics,
+                "position": None if self.position is None else self.position.to_json(),
+                "unknown_2": self.unknown_2,
+                "unknown_3": self.unknown_3,
+                "unknown_4": self.unknown_4,
+                "unknown_5": self.unknown_5,
+                "unknown_6": self.unknown_6,
+                "unknown_7": self.unknown_7,
+                "extended_flag": self._extended_flag,
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        return cls(
+                radius=data["radius"],
+                has_normal_physics=data["has_normal_physics"],
+                position=None if data["position"] is None else Point2D.from_json(data["position"]),
+                unknown_2=data["unknown_2"],
+                unknown_3=data["unknown_3"],
+                unknown_4=data["unknown_4"],
+                unknown_5=data["unknown_5"],
+                unknown_6=data["unknown_6"],
+                unknown_7=data["unknown_7"],
+                extended_flag=data["extended_flag"],
+        )
+
 
 def main():
     pass
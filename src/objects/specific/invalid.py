@@ -4,25 +4,52 @@ Created on 2023/11/29
 
 @author: brassbeat
 """
-import dataclasses
 from dataclasses import dataclass
-from typing import Self
+from typing import ClassVar, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from objects.flag_codec import FieldLocation
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 
-@dataclass
-class InvalidPeggleObject:
-    TYPE_VALUE: int = dataclasses.field(default=5, init=False, repr=False)
+@positional_pickle
+@dataclass(slots=True)
+class InvalidPeggleObject(Trackable):
+    TYPE_VALUE: ClassVar[int] = 5
 
     @classmethod
     def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
         pass
 
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        pass
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        pass
+
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
         raise ...
 
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        return cls()
+
 
 def main():
     pass
@@ -4,27 +4,56 @@ Created on _
 
 @author: brassbeat
 """
-import dataclasses
-import functools as ft
-import logging
-from collections import deque
+import itertools
+from array import array
+from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Self, Callable
+from typing import ClassVar, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation, FlagCodec, FlagField
 from objects.flags import PolygonFlag, PolygonFlagExtended
 from objects.point_2d import Point2D
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
 _FLAG_EXTENDED_MIN_VERSION = int("0x23", 16)
 
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
-
-@dataclass
-class Polygon:
-    vertices: list[Point2D]
+_FLAG_CODEC = FlagCodec(
+        "Polygon",
+        [
+                FlagField(PolygonFlag.UNKNOWN_0, "unknown_0", "bool"),
+                FlagField(PolygonFlag.HAS_ROTATION_VALUE, "rotation_angle", "float"),
+                FlagField(PolygonFlag.UNKNOWN_3, "unknown_3", "float"),
+                FlagField(PolygonFlag.HAS_SCALE, "scale", "float"),
+                FlagField(PolygonFlag.HAS_NORMAL_DIRECTION, "normal_direction", "byte"),
+                FlagField(PolygonFlag.HAS_FIXED_COORDINATES, "position", "point"),
+                FlagField(PolygonFlag.UNKNOWN_6, "unknown_6", "bool"),
+                FlagField(PolygonFlag.UNKNOWN_7, "unknown_7", "bool"),
+        ],
+)
+
+_EXTENDED_FLAG_CODEC = FlagCodec(
+        "Polygon extended",
+        [
+                FlagField(PolygonFlagExtended.UNKNOWN_8, "unknown_8", "byte"),
+                FlagField(PolygonFlagExtended.HAS_GROW_TYPE, "grow_type", "int"),
+                FlagField(PolygonFlagExtended.UNKNOWN_10, "unknown_10", "bool"),
+                FlagField(PolygonFlagExtended.UNKNOWN_11, "unknown_11", "bool"),
+                FlagField(PolygonFlagExtended.UNKNOWN_12, "unknown_12", "bool"),
+                FlagField(PolygonFlagExtended.UNKNOWN_13, "unknown_13", "bool"),
+                FlagField(PolygonFlagExtended.UNKNOWN_14, "unknown_14", "bool"),
+                FlagField(PolygonFlagExtended.UNKNOWN_15, "unknown_15", "bool"),
+        ],
+)
+
+
+@positional_pickle
+@dataclass(slots=True)
+class Polygon(Trackable):
+    vertices: array  # flat float32 x, y pairs
 
     unknown_0: bool
     normal_direction: int | None
@@ -44,142 +73,154 @@ class Polygon:
     unknown_14: bool
     unknown_15: bool
 
-    TYPE_VALUE: int = dataclasses.field(default=3, init=False, repr=False)
+    TYPE_VALUE: ClassVar[int] = 3
+
+    @property
+    def points(self) -> list[Point2D]:
+        """
+        Vertices as `Point2D`s. The list is built on every access, so assign to this property (or edit `vertices`)
+        to change the shape.
+        """
+        return [Point2D(x, y) for x, y in zip(self.vertices[::2], self.vertices[1::2])]
+
+    @points.setter
+    def points(self, value: Iterable[Point2D]):
+        self.vertices = array("f", itertools.chain.from_iterable((point.x, point.y) for point in value))
 
     @classmethod
     def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
-        flag = PolygonFlag(f.read_bitfield(1))
-        if file_version >= _FLAG_EXTENDED_MIN_VERSION:
-            flag_extended = PolygonFlagExtended(f.read_bitfield(1))
-
-        unknown_0 = PolygonFlag.UNKNOWN_0 in flag
-        if PolygonFlag.HAS_ROTATION_VALUE in flag:
-            rotation_angle = f.read_float()
-        else:
-            rotation_angle = None
-        if PolygonFlag.UNKNOWN_3 in flag:
-            unknown_3 = f.read_float()
-        else:
-            unknown_3 = None
-        if PolygonFlag.HAS_SCALE in flag:
-            scale = f.read_float()
-        else:
-            scale = None
-        if PolygonFlag.HAS_NORMAL_DIRECTION in flag:
-            normal_direction = f.read_byte()
+        has_flag_extended = file_version >= _FLAG_EXTENDED_MIN_VERSION
+        if TRACE_ENABLED:
+            f.label("flag")
+        flag = f.read_bitfield(1)
+        if has_flag_extended:
+            if TRACE_ENABLED:
+                f.label("flag_extended")
+            flag_extended = f.read_bitfield(1)
         else:
-            normal_direction = None
-        if PolygonFlag.HAS_FIXED_COORDINATES in flag:
-            position = Point2D(f.read_float(), f.read_float())
+            flag_extended = 0
+
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
+
+        if TRACE_ENABLED:
+            f.label("vertex_count")
+        vertex_count = f.read_int()
+        if TRACE_ENABLED:
+            f.label("vertices")
+        values["vertices"] = f.read_array("f", 2 * vertex_count)
+
+        # without an extended flag, every extended field reads as absent
+        _EXTENDED_FLAG_CODEC.read(file_version, f, flag_extended, values)
+
+        return cls(**values)
+
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        """
+        Skip over polygon data in the data stream, only storing what `LevelColumns` needs in `row`.
+        """
+        flag = f.read_bitfield(1)
+        if file_version >= _FLAG_EXTENDED_MIN_VERSION:
+            flag_extended = f.read_bitfield(1)
         else:
-            position = None
-        unknown_6 = PolygonFlag.UNKNOWN_6 in flag
-        unknown_7 = PolygonFlag.UNKNOWN_7 in flag
+            flag_extended = 0
+
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
+        if (position := values["position"]) is not None:
+            row["x"], row["y"] = position.x, position.y
 
         vertex_count = f.read_int()
-        vertices = [Point2D(f.read_float(), f.read_float()) for _ in range(vertex_count)]
-
-        if file_version < _FLAG_EXTENDED_MIN_VERSION:
-            unknown_8 = None
-            grow_type = None
-            unknown_10 = False
-            unknown_11 = False
-            unknown_12 = False
-            unknown_13 = False
-            unknown_14 = False
-            unknown_15 = False
+        f.skip(8 * vertex_count)
+
+        _EXTENDED_FLAG_CODEC.skip(file_version, f, flag_extended)
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        """
+        Skip over polygon data in the data stream, storing where its fields are in `locations`, see
+        `FlagCodec.locate`. The vertices are not located.
+        """
+        flag_offset = f.position
+        flag = f.read_bitfield(1)
+        if file_version >= _FLAG_EXTENDED_MIN_VERSION:
+            flag_extended_offset = f.position
+            flag_extended = f.read_bitfield(1)
         else:
+            flag_extended_offset = None
+            flag_extended = 0
+
+        _FLAG_CODEC.locate(file_version, f, flag, flag_offset, 1, prefix, locations)
+
+        vertex_count = f.read_int()
+        f.skip(8 * vertex_count)
+
+        _EXTENDED_FLAG_CODEC.locate(file_version, f, flag_extended, flag_extended_offset, 1, prefix, locations)
+
+    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
+        has_flag_extended = file_version >= _FLAG_EXTENDED_MIN_VERSION
+        flag_offset = f.reserve(1)
+        if has_flag_extended:
+            flag_extended_offset = f.reserve(1)
+
+        flag = _FLAG_CODEC.write(self, file_version, f)
+        f.patch_bitfield(flag_offset, flag, 1)
+
+        f.write_int(len(self.vertices) // 2)
+        f.write_array(self.vertices)
+
+        if has_flag_extended:
+            flag_extended = _EXTENDED_FLAG_CODEC.write(self, file_version, f)
             # noinspection PyUnboundLocalVariable
-            if PolygonFlagExtended.UNKNOWN_8 in flag_extended:
-                unknown_8 = f.read_byte()
-            else:
-                unknown_8 = None
-            if PolygonFlagExtended.HAS_GROW_TYPE in flag_extended:
-                grow_type = f.read_int()
-            else:
-                grow_type = None
-
-            unknown_10 = PolygonFlagExtended.UNKNOWN_10 in flag_extended
-            unknown_11 = PolygonFlagExtended.UNKNOWN_11 in flag_extended
-            unknown_12 = PolygonFlagExtended.UNKNOWN_12 in flag_extended
-            unknown_13 = PolygonFlagExtended.UNKNOWN_13 in flag_extended
-            unknown_14 = PolygonFlagExtended.UNKNOWN_14 in flag_extended
-            unknown_15 = PolygonFlagExtended.UNKNOWN_15 in flag_extended
+            f.patch_bitfield(flag_extended_offset, flag_extended, 1)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "vertices": [{"x": x, "y": y} for x, y in zip(self.vertices[::2], self.vertices[1::2])],
+                "unknown_0": self.unknown_0,
+                "normal_direction": self.normal_direction,
+                "rotation_angle": self.rotation_angle,
+                "unknown_3": self.unknown_3,
+                "position": None if self.position is None else self.position.to_json(),
+                "scale": self.scale,
+                "unknown_6": self.unknown_6,
+                "unknown_7": self.unknown_7,
+                "unknown_8": self.unknown_8,
+                "grow_type": self.grow_type,
+                "unknown_10": self.unknown_10,
+                "unknown_11": self.unknown_11,
+                "unknown_12": self.unknown_12,
+                "unknown_13": self.unknown_13,
+                "unknown_14": self.unknown_14,
+                "unknown_15": self.unknown_15,
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
 
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        vertices = array("f", itertools.chain.from_iterable((vertex["x"], vertex["y"]) for vertex in data["vertices"]))
         return cls(
                 vertices=vertices,
-                unknown_0=unknown_0,
-                normal_direction=normal_direction,
-                rotation_angle=rotation_angle,
-                unknown_3=unknown_3,
-                position=position,
-                scale=scale,
-                unknown_6=unknown_6,
-                unknown_7=unknown_7,
-                unknown_8=unknown_8,
-                grow_type=grow_type,
-                unknown_10=unknown_10,
-                unknown_11=unknown_11,
-                unknown_12=unknown_12,
-                unknown_13=unknown_13,
-                unknown_14=unknown_14,
-                unknown_15=unknown_15,
+                unknown_0=data["unknown_0"],
+                normal_direction=data["normal_direction"],
+                rotation_angle=data["rotation_angle"],
+                unknown_3=data["unknown_3"],
+                position=None if data["position"] is None else Point2D.from_json(data["position"]),
+                scale=data["scale"],
+                unknown_6=data["unknown_6"],
+                unknown_7=data["unknown_7"],
+                unknown_8=data["unknown_8"],
+                grow_type=data["grow_type"],
+                unknown_10=data["unknown_10"],
+                unknown_11=data["unknown_11"],
+                unknown_12=data["unknown_12"],
+                unknown_13=data["unknown_13"],
+                unknown_14=data["unknown_14"],
+                unknown_15=data["unknown_15"],
         )
-
-    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
-        write_queue: deque[Callable[[], None]] = deque()
-
-        flag = PolygonFlag(0)
-
-        if self.unknown_0:
-            flag |= PolygonFlag.UNKNOWN_0
-        if self.rotation_angle is not None:
-            flag |= PolygonFlag.HAS_ROTATION_VALUE
-            write_queue.append(ft.partial(f.write_float, self.rotation_angle))
-        if self.unknown_3 is not None:
-            flag |= PolygonFlag.UNKNOWN_3
-            write_queue.append(ft.partial(f.write_float, self.unknown_3))
-        if self.scale is not None:
-            flag |= PolygonFlag.HAS_SCALE
-            write_queue.append(ft.partial(f.write_float, self.scale))
-        if self.normal_direction is not None:
-            flag |= PolygonFlag.HAS_NORMAL_DIRECTION
-            write_queue.append(ft.partial(f.write_byte, self.normal_direction))
-        if self.position is not None:
-            flag |= PolygonFlag.HAS_FIXED_COORDINATES
-            write_queue.append(ft.partial(f.write_float, self.position.x))
-            write_queue.append(ft.partial(f.write_float, self.position.y))
-
-        f.write_bitfield(flag, 1)
-
-        write_queue.append(ft.partial(f.write_int, len(self.vertices)))
-        for vertex in self.vertices:
-            write_queue.append(ft.partial(f.write_float, vertex.x))
-            write_queue.append(ft.partial(f.write_float, vertex.y))
-
-        if file_version >= _FLAG_EXTENDED_MIN_VERSION:
-            flag_extended = PolygonFlagExtended(0)
-
-            if self.unknown_8 is not None:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_8
-                write_queue.append(ft.partial(f.write_byte, self.unknown_8))
-            if self.grow_type is not None:
-                flag_extended |= PolygonFlagExtended.HAS_GROW_TYPE
-                write_queue.append(ft.partial(f.write_int, self.grow_type))
-            if self.unknown_10:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_10
-            if self.unknown_11:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_11
-            if self.unknown_12:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_12
-            if self.unknown_13:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_13
-            if self.unknown_14:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_14
-            if self.unknown_15:
-                flag_extended |= PolygonFlagExtended.UNKNOWN_15
-
-            f.write_bitfield(flag_extended, 1)
-
-        for write_action in write_queue:
-            write_action()
@@ -4,24 +4,39 @@ Created on 2023/12/04
 
 @author: brassbeat
 """
-import dataclasses
-import functools as ft
-import logging
-from collections import deque
+import struct
 from dataclasses import dataclass
-from typing import Self, Callable
+from typing import ClassVar, Self, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation, FlagCodec, FlagField
 from objects.flags import RodFlag
 from objects.point_2d import Point2D
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
 
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
+_POINTS = struct.Struct("<4f")
 
+_FLAG_CODEC = FlagCodec(
+        "Rod",
+        [
+                FlagField(RodFlag.UNKNOWN_0, "unknown_0", "float"),
+                FlagField(RodFlag.UNKNOWN_1, "unknown_1", "float"),
+                FlagField(RodFlag.UNKNOWN_2, "unknown_2", "bool"),
+                FlagField(RodFlag.UNKNOWN_3, "unknown_3", "bool"),
+                FlagField(RodFlag.UNKNOWN_4, "unknown_4", "bool"),
+                FlagField(RodFlag.UNKNOWN_5, "unknown_5", "bool"),
+                FlagField(RodFlag.UNKNOWN_6, "unknown_6", "bool"),
+                FlagField(RodFlag.UNKNOWN_7, "unknown_7", "bool"),
+        ],
+)
 
-@dataclass
-class Rod:
+
+@positional_pickle
+@dataclass(slots=True)
+class Rod(Trackable):
     point_a: Point2D
     point_b: Point2D
     unknown_0: float | None = None
@@ -32,72 +47,87 @@ class Rod:
     unknown_5: bool = False
     unknown_6: bool = False
     unknown_7: bool = False
-    TYPE_VALUE: int = dataclasses.field(default=2, init=False, repr=False)
+    TYPE_VALUE: ClassVar[int] = 2
 
     @classmethod
-    def read_data(cls, _: int, f: PeggleDataReader, **kwargs) -> Self:
-        flag = RodFlag(f.read_bitfield(1))
-
-        point_a = Point2D(f.read_float(), f.read_float())
-        point_b = Point2D(f.read_float(), f.read_float())
-
-        if RodFlag.UNKNOWN_0 in flag:
-            unknown_0 = f.read_float()
-        else:
-            unknown_0 = None
-        if RodFlag.UNKNOWN_1 in flag:
-            unknown_1 = f.read_float()
-        else:
-            unknown_1 = None
+    def read_data(cls, file_version: int, f: PeggleDataReader, **kwargs) -> Self:
+        if TRACE_ENABLED:
+            f.label("flag")
+        flag = f.read_bitfield(1)
 
-        unknown_2 = RodFlag.UNKNOWN_2 in flag
-        unknown_3 = RodFlag.UNKNOWN_3 in flag
-        unknown_4 = RodFlag.UNKNOWN_4 in flag
-        unknown_5 = RodFlag.UNKNOWN_5 in flag
-        unknown_6 = RodFlag.UNKNOWN_6 in flag
-        unknown_7 = RodFlag.UNKNOWN_7 in flag
+        if TRACE_ENABLED:
+            f.label("points")
+        a_x, a_y, b_x, b_y = f.read_struct(_POINTS)
 
         return cls(
-                point_a=point_a,
-                point_b=point_b,
-                unknown_0=unknown_0,
-                unknown_1=unknown_1,
-                unknown_2=unknown_2,
-                unknown_3=unknown_3,
-                unknown_4=unknown_4,
-                unknown_5=unknown_5,
-                unknown_6=unknown_6,
-                unknown_7=unknown_7,
+                point_a=Point2D(a_x, a_y),
+                point_b=Point2D(b_x, b_y),
+                **_FLAG_CODEC.read(file_version, f, flag, {}),
         )
 
-    def write_data(self, _: int, f: PeggleDataWriter) -> None:
-        write_queue: deque[Callable[[], None]] = deque()
-        flag = RodFlag(0)
+    @classmethod
+    def scan_data(cls, file_version: int, f: PeggleDataReader, row: dict[str, Any], **kwargs) -> None:
+        """
+        Skip over rod data in the data stream, only storing what `LevelColumns` needs in `row`. The position of a rod
+        is the midpoint between its end points.
+        """
+        flag = f.read_bitfield(1)
+        a_x, a_y, b_x, b_y = f.read_struct(_POINTS)
+        row["x"], row["y"] = (a_x + b_x) / 2, (a_y + b_y) / 2
+        _FLAG_CODEC.skip(file_version, f, flag)
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            **kwargs
+    ) -> None:
+        """
+        Skip over rod data in the data stream, storing where its fields are in `locations`, see `FlagCodec.locate`.
+        """
+        flag_offset = f.position
+        flag = f.read_bitfield(1)
+        locations[f"{prefix}point_a"] = FieldLocation("point", f.position, optional=False)
+        locations[f"{prefix}point_b"] = FieldLocation("point", f.position + 8, optional=False)
+        f.skip(_POINTS.size)
+        _FLAG_CODEC.locate(file_version, f, flag, flag_offset, 1, prefix, locations)
+
+    def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
+        flag_offset = f.reserve(1)
+        f.write_struct(_POINTS, self.point_a.x, self.point_a.y, self.point_b.x, self.point_b.y)
 
-        if self.unknown_0 is not None:
-            flag |= RodFlag.UNKNOWN_0
-            write_queue.append(ft.partial(f.write_float, self.unknown_0))
-        if self.unknown_1 is not None:
-            flag |= RodFlag.UNKNOWN_1
-            write_queue.append(ft.partial(f.write_float, self.unknown_1))
-        if self.unknown_2:
-            flag |= RodFlag.UNKNOWN_2
-        if self.unknown_3:
-            flag |= RodFlag.UNKNOWN_3
-        if self.unknown_4:
-            flag |= RodFlag.UNKNOWN_4
-        if self.unknown_5:
-            flag |= RodFlag.UNKNOWN_5
-        if self.unknown_6:
-            flag |= RodFlag.UNKNOWN_6
-        if self.unknown_7:
-            flag |= RodFlag.UNKNOWN_7
+        flag = _FLAG_CODEC.write(self, file_version, f)
+        f.patch_bitfield(flag_offset, flag, 1)
 
-        f.write_bitfield(flag, 1)
-        f.write_float(self.point_a.x)
-        f.write_float(self.point_a.y)
-        f.write_float(self.point_b.x)
-        f.write_float(self.point_b.y)
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "point_a": self.point_a.to_json(),
+                "point_b": self.point_b.to_json(),
+                "unknown_0": self.unknown_0,
+                "unknown_1": self.unknown_1,
+                "unknown_2": self.unknown_2,
+                "unknown_3": self.unknown_3,
+                "unknown_4": self.unknown_4,
+                "unknown_5": self.unknown_5,
+                "unknown_6": self.unknown_6,
+                "unknown_7": self.unknown_7,
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
 
-        for write_action in write_queue:
-            write_action()
+    @classmethod
+    def from_json(cls, data: dict[str, Any], **kwargs) -> Self:
+        return cls(
+                point_a=Point2D.from_json(data["point_a"]),
+                point_b=Point2D.from_json(data["point_b"]),
+                unknown_0=data["unknown_0"],
+                unknown_1=data["unknown_1"],
+                unknown_2=data["unknown_2"],
+                unknown_3=data["unknown_3"],
+                unknown_4=data["unknown_4"],
+                unknown_5=data["unknown_5"],
+                unknown_6=data["unknown_6"],
+                unknown_7=data["unknown_7"],
+        )
@@ -4,25 +4,50 @@ Created on 2023/12/26
 
 @author: brassbeat
 """
-import dataclasses
-import functools as ft
-import logging
-from collections import deque
+import struct
 from dataclasses import dataclass
-from typing import Self, Callable
+from typing import ClassVar, Self, Callable, Any
 
 from level.level_reader import PeggleDataReader
 from level.level_writer import PeggleDataWriter
+from level.tracing import TRACE_ENABLED
+from objects.flag_codec import FieldLocation, FlagCodec, FlagField
 from objects.flags import TeleportFlag
 from objects.point_2d import Point2D
 from level.protocols import PeggleObjectData
-
-_logger = logging.getLogger(__name__)
-_logger.setLevel(logging.DEBUG)
-
-
-@dataclass
-class Teleport:
+from objects.pickling import positional_pickle
+from objects.tracking import Trackable
+
+# flag, width, height
+_HEADER = struct.Struct("<Bii")
+
+_HAS_EXIT_SUBOBJECT = int(TeleportFlag.HAS_EXIT_SUBOBJECT)
+
+# fields before the exit subobject, which is handled by hand
+_FLAG_CODEC = FlagCodec(
+        "Teleport",
+        [
+                FlagField(TeleportFlag.UNKNOWN_0, "unknown_0", "bool"),
+                FlagField(TeleportFlag.UNKNOWN_1, "unknown_1", "short"),
+                FlagField(TeleportFlag.UNKNOWN_3, "unknown_3", "int"),
+                FlagField(TeleportFlag.UNKNOWN_5, "unknown_5", "int"),
+        ],
+)
+
+# fields after the exit subobject
+_TAIL_FLAG_CODEC = FlagCodec(
+        "Teleport tail",
+        [
+                FlagField(TeleportFlag.HAS_ENTRY_COORDINATES, "entry_coordinates", "point"),
+                FlagField(TeleportFlag.UNKNOWN_6, "unknown_6", "point"),
+                FlagField(TeleportFlag.UNKNOWN_7, "unknown_7", "bool"),
+        ],
+)
+
+
+@positional_pickle
+@dataclass(slots=True)
+class Teleport(Trackable):
     width: int
     height: int
     unknown_0: bool
@@ -35,7 +60,7 @@ class Teleport:
     unknown_6: Point2D | None
     unknown_7: bool
 
-    TYPE_VALUE: int = dataclasses.field(default=8, init=False, repr=False)
+    TYPE_VALUE: ClassVar[int] = 8
 
     @classmethod
     def read_data(
@@ -46,98 +71,119 @@ class Teleport:
             object_callback: Callable[[int, PeggleDataReader], PeggleObjectData],
             **kwargs
     ) -> Self:
-        _logger.debug("Reading in teleport flags...")
-        flag = TeleportFlag(f.read_bitfield(1))
-
-        _logger.debug("Reading in width...")
-        width = f.read_int()
-        _logger.debug("Reading in height...")
-        height = f.read_int()
-
-        unknown_0 = TeleportFlag.UNKNOWN_0 in flag
-        if TeleportFlag.UNKNOWN_1 in flag:
-            _logger.debug("Reading in unknown 1...")
-            unknown_1 = f.read_short()
-        else:
-            unknown_1 = None
-        if TeleportFlag.UNKNOWN_3 in flag:
-            _logger.debug("Reading in unknown 3...")
-            unknown_3 = f.read_int()
-        else:
-            unknown_3 = None
-        if TeleportFlag.UNKNOWN_5 in flag:
-            _logger.debug("Reading in unknown 5...")
-            unknown_5 = f.read_int()
-        else:
-            unknown_5 = None
+        if TRACE_ENABLED:
+            f.label("header")
+        flag, width, height = f.read_struct(_HEADER)
 
-        if TeleportFlag.HAS_EXIT_SUBOBJECT in flag:
-            _logger.debug("Reading in subobject...")
-            subobject = object_callback(file_version, f)
-            subobject_link_id = None
-        else:
-            subobject_link_id = None
-            subobject = None
+        values = _FLAG_CODEC.read(file_version, f, flag, {})
 
-        if TeleportFlag.HAS_ENTRY_COORDINATES in flag:
-            _logger.debug("Reading in entry coordinates...")
-            entry_coordinates = Point2D(f.read_float(), f.read_float())
+        if flag & _HAS_EXIT_SUBOBJECT:
+            if TRACE_ENABLED:
+                f.label("subobject")
+            values["subobject"] = object_callback(file_version, f)
         else:
-            entry_coordinates = None
-        if TeleportFlag.UNKNOWN_6 in flag:
-            _logger.debug("Reading in unknown 6...")
-            unknown_6 = Point2D(f.read_float(), f.read_float())
-        else:
-            unknown_6 = None
-        unknown_7 = TeleportFlag.UNKNOWN_7 in flag
+            values["subobject"] = None
 
-        return cls(
-                width=width,
-                height=height,
-                unknown_0=unknown_0,
-                unknown_1=unknown_1,
-                entry_coordinates=entry_coordinates,
-                unknown_3=unknown_3,
-                subobject=subobject,
-                subobject_link_id=subobject_link_id,
-                unknown_5=unknown_5,
-                unknown_6=unknown_6,
-                unknown_7=unknown_7,
-        )
+        _TAIL_FLAG_CODEC.read(file_version, f, flag, values)
+
+        return cls(width=width, height=height, subobject_link_id=None, **values)
+
+    @classmethod
+    def scan_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            row: dict[str, Any],
+            *,
+            object_callback: Callable[[int, PeggleDataReader], Any],
+            **kwargs
+    ) -> None:
+        """
+        Skip over teleport data in the data stream. The exit subobject is handed to `object_callback`, nothing is stored
+        in `row`.
+        """
+        flag, _, _ = f.read_struct(_HEADER)
+
+        _FLAG_CODEC.skip(file_version, f, flag)
+        if flag & _HAS_EXIT_SUBOBJECT:
+            object_callback(file_version, f)
+        _TAIL_FLAG_CODEC.skip(file_version, f, flag)
+
+    @classmethod
+    def locate_data(
+            cls,
+            file_version: int,
+            f: PeggleDataReader,
+            prefix: str,
+            locations: dict[str, FieldLocation],
+            *,
+            object_callback: Callable[[int, PeggleDataReader], Any],
+            **kwargs
+    ) -> None:
+        """
+        Skip over teleport data in the data stream, storing where its fields are in `locations`, see
+        `FlagCodec.locate`. The exit subobject is handed to `object_callback`.
+        """
+        header_offset = f.position
+        flag, _, _ = f.read_struct(_HEADER)
+        locations[f"{prefix}width"] = FieldLocation("int", header_offset + 1, optional=False)
+        locations[f"{prefix}height"] = FieldLocation("int", header_offset + 5, optional=False)
+
+        _FLAG_CODEC.locate(file_version, f, flag, header_offset, 1, prefix, locations)
+        if flag & _HAS_EXIT_SUBOBJECT:
+            object_callback(file_version, f)
+        _TAIL_FLAG_CODEC.locate(file_version, f, flag, header_offset, 1, prefix, locations)
 
     def write_data(self, file_version: int, f: PeggleDataWriter) -> None:
-        write_queue: deque[Callable[[], None]] = deque()
-
-        flag = TeleportFlag(0)
-
-        if self.unknown_0:
-            flag |= TeleportFlag.UNKNOWN_0
-        if self.unknown_1 is not None:
-            flag |= TeleportFlag.UNKNOWN_1
-            write_queue.append(ft.partial(f.write_short, self.unknown_1))
-        if self.unknown_3 is not None:
-            flag |= TeleportFlag.UNKNOWN_3
-            write_queue.append(ft.partial(f.write_int, self.unknown_3))
-        if self.unknown_5 is not None:
-            flag |= TeleportFlag.UNKNOWN_5
-            write_queue.append(ft.partial(f.write_int, self.unknown_5))
+        header_offset = f.reserve(_HEADER.size)
+
+        flag = _FLAG_CODEC.write(self, file_version, f)
+
         if self.subobject_link_id is not None:
-            flag |= TeleportFlag.HAS_EXIT_SUBOBJECT
-            write_queue.append(ft.partial(f.write_int, self.subobject_link_id))
-        if self.entry_coordinates is not None:
-            flag |= TeleportFlag.HAS_ENTRY_COORDINATES
-            write_queue.append(ft.partial(f.write_float, self.entry_coordinates.x))
-            write_queue.append(ft.partial(f.write_float, self.entry_coordinates.y))
-        if self.unknown_6 is not None:
-            flag |= TeleportFlag.UNKNOWN_6
-            write_queue.append(ft.partial(f.write_float, self.unknown_6.x))
-            write_queue.append(ft.partial(f.write_float, self.unknown_6.y))
-        if self.unknown_7:
-            flag |= TeleportFlag.UNKNOWN_7
-
-        f.write_bitfield(flag, 1)
-        f.write_int(self.width)
-        f.write_int(self.height)
-
-        for write_action in write_queue:
-            write_action()
+            flag |= _HAS_EXIT_SUBOBJECT
+            f.write_int(self.subobject_link_id)
+
+        flag |= _TAIL_FLAG_CODEC.write(self, file_version, f)
+
+        f.patch_struct(header_offset, _HEADER, flag, self.width, self.height)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+                "width": self.width,
+                "height": self.height,
+                "unknown_0": self.unknown_0,
+                "unknown_1": self.unknown_1,
+                "entry_coordinates": None if self.entry_coordinates is None else self.entry_coordinates.to_json(),
+                "unknown_3": self.unknown_3,
+                "subobject": None if self.subobject is None else self.subobject.to_json(),
+                "subobject_link_id": self.subobject_link_id,
+                "unknown_5": self.unknown_5,
+                "unknown_6": None if self.unknown_6 is None else self.unknown_6.to_json(),
+                "unknown_7": self.unknown_7,
+                "TYPE_VALUE": self.TYPE_VALUE,
+        }
+
+    @classmethod
+    def from_json(
+            cls,
+            data: dict[str, Any],
+            *,
+            object_callback: Callable[[dict[str, Any]], PeggleObjectData],
+            **kwargs
+    ) -> Self:
+        return cls(
+                width=data["width"],
+                height=data["height"],
+                unknown_0=data["unknown_0"],
+                unknown_1=data["unknown_1"],
+                entry_coordinates=(
+                        None if data["entry_coordinates"] is None
+                        else Point2D.from_json(data["entry_coordinates"])
+                ),
+                unknown_3=data["unknown_3"],
+                subobject=None if data["subobject"] is None else object_callback(data["subobject"]),
+                subobject_link_id=data["subobject_link_id"],
+                unknown_5=data["unknown_5"],
+                unknown_6=None if data["unknown_6"] is None else Point2D.from_json(data["unknown_6"]),
+                unknown_7=data["unknown_7"],
+        )
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Change tracking for the object model, used to tell whether an object was modified since it was read.
+
+`track` hands an object and everything stored inline in it an owner, and makes every later modification set the
+owner's `dirty` flag:
+
+- dataclasses deriving from `Trackable` get their class swapped for a tracked subclass of the same layout, whose
+  `__setattr__` sets the flag and swaps the class back, so only the first assignment pays for the check;
+- lists and arrays are replaced with `TrackedList` and `TrackedArray`, which set the flag from every mutating method.
+
+Objects that are never tracked keep their plain classes and pay nothing. Teleport exits and submovements, and their
+link ids, are left alone: they are written as link ids which `Level.write_data` checks on its own, and unlinking
+them on every write must not count as a modification. Tracked values pickle and copy as their plain classes.
+"""
+import dataclasses
+import enum
+import operator
+import types
+from array import array
+from collections.abc import Callable
+from typing import Any, Protocol
+
+# nested entries stored as link ids, and the link ids themselves, which change whenever the level is written
+_LINK_FIELDS = frozenset({"submovement_", "submovement_link_id", "subobject", "subobject_link_id"})
+
+_IMMUTABLE_TYPES = (bool, int, float, str, types.NoneType)
+
+
+class Owner(Protocol):
+    dirty: bool
+
+
+class Trackable:
+    """
+    Base of the object model dataclasses, reserving the slot `track` stores the owner in.
+    """
+    __slots__ = ("_owner",)
+
+
+def _invalidating(method: Callable) -> Callable:
+    def invalidating(self, *args, **kwargs):
+        self._owner.dirty = True
+        return method(self, *args, **kwargs)
+
+    invalidating.__name__ = method.__name__
+    return invalidating
+
+
+class TrackedList(list):
+    """
+    List setting the `dirty` flag of its owner whenever it is modified.
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, values: list, owner: Owner):
+        super().__init__(values)
+        self._owner = owner
+
+    def __reduce__(self) -> tuple[type, tuple[list]]:
+        return list, (list(self),)
+
+
+class TrackedArray(array):
+    """
+    Array setting the `dirty` flag of its owner whenever it is modified.
+    """
+    __slots__ = ("_owner",)
+
+    def __new__(cls, values: array, owner: Owner):
+        self = super().__new__(cls, values.typecode, values)
+        self._owner = owner
+        return self
+
+    def __reduce__(self) -> tuple[type, tuple[str, bytes]]:
+        return array, (self.typecode, self.tobytes())
+
+
+for _tracked_type, _names in [
+        (TrackedList, ["append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse"]),
+        (TrackedArray, ["append", "extend", "insert", "pop", "remove", "reverse", "byteswap", "frombytes", "fromfile",
+                        "fromlist", "fromunicode"]),
+]:
+    for _name in ["__setitem__", "__delitem__", "__iadd__", "__imul__", *_names]:
+        setattr(_tracked_type, _name, _invalidating(getattr(_tracked_type.__base__, _name)))
+del _tracked_type, _names, _name
+
+
+def _is_immutable(annotation: Any) -> bool:
+    if isinstance(annotation, types.UnionType):
+        return all(map(_is_immutable, annotation.__args__))
+    return annotation in _IMMUTABLE_TYPES or isinstance(annotation, type) and issubclass(annotation, enum.Enum)
+
+
+def _make_tracked_class(cls: type) -> tuple[type, list[str]]:
+    fields = dataclasses.fields(cls)
+    compared = [field.name for field in fields if field.compare]
+    get_values = operator.attrgetter(*compared) if compared else lambda _: ()
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name not in _LINK_FIELDS:
+            self._owner.dirty = True
+            object.__setattr__(self, "__class__", cls)
+
+    def __eq__(self, other: Any) -> bool:
+        # the dataclass `__eq__` only compares instances of the exact same class
+        if isinstance(other, cls):
+            return get_values(self) == get_values(other)
+        return NotImplemented
+
+    tracked_class = type(cls.__name__, (cls,), {
+            "__slots__": (),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__setattr__": __setattr__,
+            "__eq__": __eq__,
+    })
+    # fields that can hold something to track
+    nested = [field.name for field in fields if field.name not in _LINK_FIELDS and not _is_immutable(field.type)]
+    return tracked_class, nested
+
+
+_TRACKED_CLASSES: dict[type, tuple[type, list[str]]] = {}
+
+
+def track(value: Trackable, owner: Owner) -> None:
+    """
+    Make any modification of `value`, or of what is stored inline in it, set `owner.dirty`.
+    """
+    cls = type(value)
+    tracking = _TRACKED_CLASSES.get(cls)
+    if tracking is None:
+        tracking = _TRACKED_CLASSES[cls] = _make_tracked_class(cls)
+        _TRACKED_CLASSES[tracking[0]] = tracking
+    tracked_class, nested = tracking
+
+    # set through `object` so that tracking a value again does not count as modifying it
+    object.__setattr__(value, "_owner", owner)
+    for name in nested:
+        nested_value = getattr(value, name)
+        if nested_value is None:
+            continue
+        if isinstance(nested_value, Trackable):
+            track(nested_value, owner)
+        elif isinstance(nested_value, (TrackedList, TrackedArray)):
+            nested_value._owner = owner
+        elif type(nested_value) is list:
+            object.__setattr__(value, name, TrackedList(nested_value, owner))
+        elif type(nested_value) is array:
+            object.__setattr__(value, name, TrackedArray(nested_value, owner))
+    object.__setattr__(value, "__class__", tracked_class)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
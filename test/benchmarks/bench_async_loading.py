@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Load benchmark of `Level.aread`: fires batches of concurrent requests at a set of synthetic level files and reports
+throughput together with the worst event loop stall seen by a heartbeat task, against decoding inline in the
+coroutine with `Level.read_data`.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_async_loading
+"""
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from level.async_loading import AsyncLevelLoader
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level_tests.synthetic import build_level_data
+
+_FILE_COUNT = 20
+_OBJECT_COUNT = 1_000
+_REQUESTS = 200
+_CONCURRENCY = 50
+_HEARTBEAT = 0.001
+
+
+async def _read_blocking(path: Path) -> Level:
+    return Level.read_data(PeggleBufferReader(path.read_bytes()))
+
+
+async def _hammer(read, paths: list[Path]) -> tuple[float, float]:
+    stall = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(_HEARTBEAT)
+            stall = max(stall, time.perf_counter() - start - _HEARTBEAT)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    semaphore = asyncio.Semaphore(_CONCURRENCY)
+
+    async def request(i: int):
+        async with semaphore:
+            await read(paths[i % len(paths)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*map(request, range(_REQUESTS)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await beat
+    return _REQUESTS / elapsed, stall
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for seed in range(_FILE_COUNT):
+            path = Path(directory) / f"{seed}.dat"
+            path.write_bytes(build_level_data(_OBJECT_COUNT, seed=seed))
+            paths.append(path)
+
+        thread_loader = AsyncLevelLoader()
+        process_loader = AsyncLevelLoader(ProcessPoolExecutor(os.cpu_count()))
+        cases = [
+            ("inline read_data", _read_blocking),
+            ("aread, threads", lambda path: Level.aread(path, thread_loader)),
+            ("aread, processes", lambda path: Level.aread(path, process_loader)),
+        ]
+
+        print(f"{_REQUESTS} requests, {_CONCURRENCY} concurrent, {_OBJECT_COUNT} objects per level")
+        print(f"{'mode':<24}{'requests/s':>12}{'worst stall':>14}")
+        for name, read in cases:
+            throughput, stall = asyncio.run(_hammer(read, paths))
+            print(f"{name:<24}{throughput:>12.1f}{stall * 1e3:>12.1f}ms")
+
+        thread_loader.close()
+        process_loader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Micro-benchmark of the per-object cost of flag handling: decoding every bit of a flag through `IntFlag` construction
+and membership tests, as the object decoders used to, versus plain int bit tests with `FlipperFlag` and
+`CircleExtendedFlag` only constructed on access. Also reports the full per-object decode cost of a generic object
+with flipper flags, a circle and a brick.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_flag_decoding
+"""
+import dataclasses
+import io
+import timeit
+
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import SYNTHETIC_FILE_VERSION, build_level
+from objects.flags import BrickFlagB, CircleExtendedFlag, CircleFlag, FlipperFlag, GenericFlag
+from objects.object import PeggleObject
+from objects.specific.brick import Brick
+
+_NUMBER = 20_000
+
+_GENERIC_BITS = [int(member) for member in GenericFlag]
+_CIRCLE_BITS = [int(member) for member in CircleFlag]
+_BRICK_B_BITS = [int(member) for member in BrickFlagB]
+
+
+def _generic_intflag(raw: int, flipper_raw: int):
+    flag = GenericFlag(raw)
+    return [member in flag for member in GenericFlag], FlipperFlag(flipper_raw)
+
+
+def _generic_int(raw: int, flipper_raw: int):
+    return [raw & bit != 0 for bit in _GENERIC_BITS], flipper_raw
+
+
+def _circle_intflag(raw: int, extended_raw: int):
+    flag = CircleFlag(raw)
+    return [member in flag for member in CircleFlag], CircleExtendedFlag(extended_raw)
+
+
+def _circle_int(raw: int, extended_raw: int):
+    return [raw & bit != 0 for bit in _CIRCLE_BITS], extended_raw
+
+
+def _brick_intflag(raw: int, _: int):
+    flag = BrickFlagB(raw)
+    return [member in flag for member in BrickFlagB]
+
+
+def _brick_int(raw: int, _: int):
+    return [raw & bit != 0 for bit in _BRICK_B_BITS]
+
+
+def _sample_objects() -> list[tuple[str, PeggleObject]]:
+    level = build_level(16)
+    generic_data = dataclasses.replace(
+            level.level_objects[0].generic_data,
+            movement_data=None,
+            movement_link_id=None,
+            flipper_flags=FlipperFlag.UNKNOWN_0 | FlipperFlag.UNKNOWN_3,
+    )
+    circle = PeggleObject(
+            generic_data,
+            dataclasses.replace(level.level_objects[0].specific_data, extended_flag=CircleExtendedFlag.UNKNOWN_1),
+    )
+    brick = PeggleObject(
+            generic_data,
+            Brick(
+                    length=30.0, rotation_angle=0.5, unknown_bytes=[0, 0, 0, 0],
+                    unknown_a0=False, unknown_a1=None, unknown_a2=None, unknown_a3=None, position=None,
+                    unknown_a5=None, unknown_a6=False, unknown_a7=False, unknown_a8=None, unknown_a9=None,
+                    unknown_a10=None, unknown_a11=False, unknown_a12=False, unknown_a13=False, unknown_a14=False,
+                    unknown_a15=False, unknown_b0=False, unknown_b1=False, unknown_b2=None, curve_points=5,
+                    sector_angle=1.0, left_slant=None, unknown_b6=None, right_slant=None, width=20.0,
+                    unknown_b8=None, unknown_b9=None, is_flipped_texture=True, unknown_b11=False,
+                    unknown_b12=False, unknown_b13=False, unknown_b14=False, unknown_b15=False,
+            ),
+    )
+    return [("circle with flipper flags", circle), ("brick", brick)]
+
+
+def main():
+    flag_cases = [
+        ("generic flag", 0x0800_4123, 0x09, _generic_intflag, _generic_int),
+        ("circle flags", 0x42, 0x02, _circle_intflag, _circle_int),
+        ("brick flag B", 0x1204, 0, _brick_intflag, _brick_int),
+    ]
+    print(f"{'decode':<32}{'IntFlag':>14}{'int':>14}{'speedup':>10}")
+    for name, raw, extra_raw, with_intflag, with_int in flag_cases:
+        old = min(timeit.repeat(lambda: with_intflag(raw, extra_raw), number=_NUMBER, repeat=5)) / _NUMBER
+        new = min(timeit.repeat(lambda: with_int(raw, extra_raw), number=_NUMBER, repeat=5)) / _NUMBER
+        print(f"{name:<32}{old * 1e6:>12.2f}us{new * 1e6:>12.2f}us{old / new:>9.1f}x")
+
+    print()
+    print(f"{'object':<32}{'read':>14}{'write':>14}")
+    for name, obj in _sample_objects():
+        buffer = io.BytesIO()
+        obj.write_data(SYNTHETIC_FILE_VERSION, PeggleDataWriter(buffer))
+        data = buffer.getvalue()
+
+        def read():
+            PeggleObject.read_data(SYNTHETIC_FILE_VERSION, PeggleBufferReader(data), movement_callback=None)
+
+        writer = PeggleDataWriter(io.BytesIO())
+        read_time = min(timeit.repeat(read, number=_NUMBER, repeat=5)) / _NUMBER
+        write_time = min(timeit.repeat(
+                lambda: obj.write_data(SYNTHETIC_FILE_VERSION, writer), number=_NUMBER, repeat=5,
+        )) / _NUMBER
+        print(f"{name:<32}{read_time * 1e6:>12.2f}us{write_time * 1e6:>12.2f}us")
+
+
+if __name__ == "__main__":
+    main()
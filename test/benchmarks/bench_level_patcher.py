@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Benchmark of fixes on a level file: nudging the position of circles and making their pegs orange, once by decoding,
+editing and encoding the whole level, and once in place with `LevelPatcher`. Every object is edited in the bulk case,
+one in a hundred in the sparse case.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_level_patcher
+"""
+import io
+import os
+import tempfile
+import timeit
+
+from level.level_data import Level
+from level.level_patcher import LevelPatcher
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+from objects.point_2d import Point2D
+from objects.specific.circle import Circle
+
+_OBJECT_COUNT = 10_000
+_SPARSE_STEP = 100
+_NUMBER = 3
+
+
+def _reencode(path: str, step: int) -> None:
+    with open(path, "rb") as f:
+        level = Level.read_data(PeggleBufferReader(f.read()))
+    for obj in level.level_objects[::step]:
+        if isinstance(obj.specific_data, Circle):
+            obj.specific_data.position.x += 1.0
+        obj.generic_data.peg_data.can_be_orange = True
+
+    buffer = io.BytesIO()
+    level.write_data(PeggleDataWriter(buffer))
+    with open(path, "wb") as f:
+        f.write(buffer.getbuffer())
+
+
+def _patch(path: str, step: int) -> None:
+    with LevelPatcher(path) as patcher:
+        for row in range(0, len(patcher), step):
+            if "specific_data.position" in patcher.locate(row):
+                position = patcher.get(row, "specific_data.position")
+                patcher.set(row, "specific_data.position", Point2D(position.x + 1.0, position.y))
+            patcher.set(row, "generic_data.peg_data.can_be_orange", True)
+
+
+def main():
+    data = build_level_data(_OBJECT_COUNT)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "level.dat")
+        print(f"{_OBJECT_COUNT} objects")
+        for case, step in [("bulk", 1), ("sparse", _SPARSE_STEP)]:
+            for name, fix in [("decode and re-encode", _reencode), ("patch in place", _patch)]:
+                with open(path, "wb") as f:
+                    f.write(data)
+                duration = min(timeit.repeat(lambda: fix(path, step), number=_NUMBER, repeat=3)) / _NUMBER
+                print(f"{case:<8}{name:<24}{duration * 1e3:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
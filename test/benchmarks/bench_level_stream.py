@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Benchmark of copying a level, once by reading it into a `Level` and writing that, and once by passing
+`Level.iter_objects` straight to `Level.write_objects`, and of only going through the objects of a level, from
+`Level.read_data` and from `Level.iter_objects` with and without `release_entries`. Reports the time and the peak
+of traced allocations.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_level_stream
+"""
+import io
+import timeit
+import tracemalloc
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+_OBJECT_COUNT = 10_000
+_NUMBER = 3
+
+
+def _copy_level(data: bytes) -> bytes:
+    stream = io.BytesIO()
+    Level.read_data(PeggleBufferReader(data)).write_data(PeggleDataWriter(stream))
+    return stream.getvalue()
+
+
+def _copy_stream(data: bytes) -> bytes:
+    stream = io.BytesIO()
+    objects = Level.iter_objects(PeggleBufferReader(data))
+    Level.write_objects(PeggleDataWriter(stream), objects.file_version, objects)
+    return stream.getvalue()
+
+
+def _count_level(data: bytes) -> int:
+    return len(Level.read_data(PeggleBufferReader(data)).level_objects)
+
+
+def _count_stream(data: bytes) -> int:
+    return sum(1 for _ in Level.iter_objects(PeggleBufferReader(data)))
+
+
+def _count_released_stream(data: bytes) -> int:
+    return sum(1 for _ in Level.iter_objects(PeggleBufferReader(data), release_entries=True))
+
+
+def main():
+    data = build_level_data(_OBJECT_COUNT)
+    print(f"{_OBJECT_COUNT} objects")
+    for name, run in [
+            ("read_data, write_data", _copy_level),
+            ("iter_objects, write_objects", _copy_stream),
+            ("read_data only", _count_level),
+            ("iter_objects only", _count_stream),
+            ("iter_objects, release_entries", _count_released_stream),
+    ]:
+        if run in (_copy_level, _copy_stream):
+            assert run(data) == data
+
+        duration = min(timeit.repeat(lambda: run(data), number=_NUMBER, repeat=3)) / _NUMBER
+        tracemalloc.start()
+        run(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<32}{duration * 1e3:>10.1f}ms{peak / 2 ** 20:>10.1f}MiB peak")
+
+
+if __name__ == "__main__":
+    main()
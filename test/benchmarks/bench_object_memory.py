@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Memory benchmark of the object model: reads a synthetic 50k-object level and reports the growth of the resident set
+size, and the Python heap allocated for the level as measured by `tracemalloc`, in total and per object. The level
+is built in this process and read back in a fresh one, so memory freed by the builder does not hide RSS growth.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_object_memory
+"""
+import gc
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level_tests.synthetic import build_level_data
+
+_OBJECT_COUNT = 50_000
+
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # peak rather than current RSS, still fine for a single measurement in a fresh process
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _measure(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    gc.collect()
+
+    before = _rss()
+    level = Level.read_data(PeggleBufferReader(data))
+    gc.collect()
+    rss = _rss() - before
+    del level
+    gc.collect()
+
+    tracemalloc.start()
+    level = Level.read_data(PeggleBufferReader(data))
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(level.level_objects)
+    print(f"{'objects':<16}{count:>14}")
+    print(f"{'RSS growth':<16}{rss / 2 ** 20:>11.1f}MiB{rss / count:>10.0f}B/object")
+    print(f"{'heap':<16}{heap / 2 ** 20:>11.1f}MiB{heap / count:>10.0f}B/object")
+
+
+def main():
+    if len(sys.argv) > 1:
+        _measure(sys.argv[1])
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".dat", delete=False) as f:
+        f.write(build_level_data(_OBJECT_COUNT))
+    try:
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_object_memory", f.name], check=True)
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
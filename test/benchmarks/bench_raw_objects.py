@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Benchmark of saving a level after a small edit: a synthetic level is read with and without `keep_raw`, one object is
+moved, and the level is written back. Reading with `keep_raw` is timed as well, since it pays for tracking changes.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_raw_objects
+"""
+import io
+import timeit
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+_OBJECT_COUNT = 10_000
+_NUMBER = 5
+
+
+def _edit_and_save(data: bytes, keep_raw: bool) -> tuple[Level, bytes]:
+    level = Level.read_data(PeggleBufferReader(data), keep_raw=keep_raw)
+    level.level_objects[len(level.level_objects) // 2].specific_data.position.x += 1.0
+    buffer = io.BytesIO()
+    level.write_data(PeggleDataWriter(buffer))
+    return level, buffer.getvalue()
+
+
+def main():
+    data = build_level_data(_OBJECT_COUNT)
+    _, expected = _edit_and_save(data, keep_raw=False)
+
+    print(f"{_OBJECT_COUNT} objects, one of them modified")
+    for keep_raw in (False, True):
+        level, saved = _edit_and_save(data, keep_raw)
+        assert saved == expected
+
+        read = min(timeit.repeat(
+                lambda: Level.read_data(PeggleBufferReader(data), keep_raw=keep_raw),
+                number=_NUMBER,
+                repeat=3,
+        )) / _NUMBER
+        write = min(timeit.repeat(
+                lambda: level.write_data(PeggleDataWriter(io.BytesIO())),
+                number=_NUMBER,
+                repeat=3,
+        )) / _NUMBER
+        print(f"{f'keep_raw={keep_raw}':<24}read {read * 1e3:>8.1f}ms    write {write * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
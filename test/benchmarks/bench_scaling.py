@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Benchmark of how reading, writing, dumping to JSON and unlinking scale with the size of a level, on synthetic levels
+mixing every kind of object (see `build_mixed_level`). Throughput should stay roughly flat from one size to the next;
+a drop points at work that grows faster than the object count. The time ratios between consecutive sizes are
+reported as well, linear scaling gives 10 and quadratic scaling 100.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_scaling
+"""
+import io
+import time
+from collections.abc import Callable
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+_OBJECT_COUNTS = [100, 1_000, 10_000, 100_000]
+# every operation is repeated until it has run for at least this long, and the fastest run is reported
+_MIN_DURATION = 0.5
+
+
+def _time(run: Callable[[], None], prepare: Callable[[], None] = lambda: None) -> float:
+    best = float("inf")
+    total = 0.0
+    while total < _MIN_DURATION:
+        prepare()
+        start = time.perf_counter()
+        run()
+        duration = time.perf_counter() - start
+        best = min(best, duration)
+        total += duration
+    return best
+
+
+def main():
+    header = f"{'objects':>8}{'read':>16}{'write':>16}{'dump_json':>16}{'unlink':>16}"
+    print(f"{header}    (objects/s)")
+    all_durations = []
+    for object_count in _OBJECT_COUNTS:
+        data = build_level_data(object_count, mixed=True)
+        level = Level.read_data(PeggleBufferReader(data))
+
+        durations = [
+                _time(lambda: Level.read_data(PeggleBufferReader(data))),
+                # writing and unlinking replace nested entries with link ids, each run starts from a linked level
+                _time(lambda: level.write_data(PeggleDataWriter(io.BytesIO())), level.link_nested_objects),
+                _time(lambda: level.dump_json(io.StringIO()), level.link_nested_objects),
+                _time(level.unlink_nested_objects, level.link_nested_objects),
+        ]
+        print(f"{object_count:>8}" + "".join(f"{object_count / duration:>16,.0f}" for duration in durations))
+        all_durations.append(durations)
+
+    print(f"\n{header}    (time ratio to the previous size)")
+    for object_count, previous, durations in zip(_OBJECT_COUNTS[1:], all_durations, all_durations[1:]):
+        ratios = [duration / before for before, duration in zip(previous, durations)]
+        print(f"{object_count:>8}" + "".join(f"{ratio:>16.1f}" for ratio in ratios))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Benchmark of string handling: a synthetic level where every object has an image name out of a small pool, like a
+real level pack, timed for reading and writing, with the heap held by the decoded level as measured by
+`tracemalloc`.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_strings
+"""
+import gc
+import io
+import timeit
+import tracemalloc
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level
+
+_OBJECT_COUNT = 10_000
+_IMAGE_NAMES = [f"images/levels/bjorn1/peg_{i:02}.png" for i in range(20)]
+_NUMBER = 5
+
+
+def _encode(level: Level) -> bytes:
+    buffer = io.BytesIO()
+    level.write_data(PeggleDataWriter(buffer))
+    return buffer.getvalue()
+
+
+def main():
+    level = build_level(_OBJECT_COUNT)
+    for i, obj in enumerate(level.level_objects):
+        obj.generic_data.image_name = _IMAGE_NAMES[i % len(_IMAGE_NAMES)]
+        obj.generic_data.logic = "peg"
+    data = _encode(level)
+
+    read = min(timeit.repeat(lambda: Level.read_data(PeggleBufferReader(data)), number=_NUMBER, repeat=3)) / _NUMBER
+    decoded = Level.read_data(PeggleBufferReader(data))
+    write = min(timeit.repeat(lambda: _encode(decoded), number=_NUMBER, repeat=3)) / _NUMBER
+
+    del decoded
+    gc.collect()
+    tracemalloc.start()
+    decoded = Level.read_data(PeggleBufferReader(data))
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    strings = {id(obj.generic_data.image_name) for obj in decoded.level_objects}
+    print(f"{_OBJECT_COUNT} objects, {len(_IMAGE_NAMES)} distinct image names")
+    print(f"{'read':<24}{read * 1e3:>10.1f}ms")
+    print(f"{'write':<24}{write * 1e3:>10.1f}ms")
+    print(f"{'heap':<24}{heap / 2 ** 20:>10.1f}MiB")
+    print(f"{'image name objects':<24}{len(strings):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Micro-benchmark of decoding/encoding the fixed-width runs of `Rod` and `Movement` with one precompiled
+`struct.Struct`, and `Polygon` vertices as one compact array, versus one primitive call per field.
+
+Run from the `test` directory with `src` on the path:
+
+    PYTHONPATH=../src python -m benchmarks.bench_struct_layouts
+"""
+import io
+import timeit
+from array import array
+
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from objects.movement_data import _HEADER as _MOVEMENT_HEADER
+from objects.specific.rod import _POINTS as _ROD_POINTS
+
+_NUMBER = 20_000
+
+_VERTEX_COUNT = 200
+
+
+def _encode(write) -> bytes:
+    buffer = io.BytesIO()
+    write(PeggleDataWriter(buffer))
+    return buffer.getvalue()
+
+
+def _rod_per_field(f: PeggleBufferReader):
+    return f.read_float(), f.read_float(), f.read_float(), f.read_float()
+
+
+def _movement_per_field(f: PeggleBufferReader):
+    return f.read_byte(), f.read_float(), f.read_float(), f.read_short(), f.read_bitfield(2)
+
+
+def _polygon_per_field(f: PeggleBufferReader):
+    return [(f.read_float(), f.read_float()) for _ in range(_VERTEX_COUNT)]
+
+
+def _write_rod_per_field(f: PeggleDataWriter, values):
+    a_x, a_y, b_x, b_y = values
+    f.write_float(a_x)
+    f.write_float(a_y)
+    f.write_float(b_x)
+    f.write_float(b_y)
+
+
+def _write_movement_per_field(f: PeggleDataWriter, values):
+    movement_value, anchor_x, anchor_y, time_period, flag = values
+    f.write_byte(movement_value)
+    f.write_float(anchor_x)
+    f.write_float(anchor_y)
+    f.write_short(time_period)
+    f.write_bitfield(flag, 2)
+
+
+def _write_polygon_per_field(f: PeggleDataWriter, values):
+    for value in values:
+        f.write_float(value)
+
+
+def _time_read(data: bytes, read) -> float:
+    return min(timeit.repeat(lambda: read(PeggleBufferReader(data)), number=_NUMBER, repeat=5)) / _NUMBER
+
+
+def _time_write(write) -> float:
+    return min(timeit.repeat(write, number=_NUMBER, repeat=5)) / _NUMBER
+
+
+def main():
+    rod_values = (1.0, 2.0, 3.0, 4.0)
+    movement_values = (-3, 10.0, 20.0, 300, 0x1234)
+    vertices = array("f", (float(n) for n in range(2 * _VERTEX_COUNT)))
+    cases = [
+        (
+                "Rod points",
+                rod_values,
+                _rod_per_field,
+                lambda f: f.read_struct(_ROD_POINTS),
+                _write_rod_per_field,
+                lambda f, values: f.write_struct(_ROD_POINTS, *values),
+        ),
+        (
+                "Movement header",
+                movement_values,
+                _movement_per_field,
+                lambda f: f.read_struct(_MOVEMENT_HEADER),
+                _write_movement_per_field,
+                lambda f, values: f.write_struct(_MOVEMENT_HEADER, *values),
+        ),
+        (
+                f"Polygon {_VERTEX_COUNT} vertices",
+                vertices,
+                _polygon_per_field,
+                lambda f: f.read_array("f", 2 * _VERTEX_COUNT),
+                _write_polygon_per_field,
+                lambda f, values: f.write_array(values),
+        ),
+    ]
+
+    print(f"{'run':<28}{'per field':>14}{'fused':>14}{'speedup':>10}")
+    for name, values, read_per_field, read_fused, write_per_field, write_fused in cases:
+        data = _encode(lambda f: write_fused(f, values))
+        old = _time_read(data, read_per_field)
+        new = _time_read(data, read_fused)
+        print(f"{'read ' + name:<28}{old * 1e6:>12.2f}us{new * 1e6:>12.2f}us{old / new:>9.1f}x")
+
+        writer = PeggleDataWriter(io.BytesIO())
+        old = _time_write(lambda: write_per_field(writer, values))
+        new = _time_write(lambda: write_fused(writer, values))
+        print(f"{'write ' + name:<28}{old * 1e6:>12.2f}us{new * 1e6:>12.2f}us{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
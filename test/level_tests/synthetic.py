@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+
+Builders for synthetic levels of arbitrary size, for tests that need more objects than the sample levels provide.
+"""
+import math
+import random
+from array import array
+from io import BytesIO
+
+from level.level_data import Level
+from level.level_writer import PeggleDataWriter
+from objects.enums import MovementType
+from objects.flags import CircleExtendedFlag
+from objects.generic import GenericObject
+from objects.movement_data import Movement
+from objects.object import PeggleObject
+from objects.peg_info import PegInfo
+from objects.point_2d import Point2D
+from objects.specific.brick import Brick
+from objects.specific.circle import Circle
+from objects.specific.polygon import Polygon
+from objects.specific.rod import Rod
+from objects.specific.teleport import Teleport
+
+SYNTHETIC_FILE_VERSION = 0x52
+
+# kind of object: relative weight, for `build_mixed_level`
+DEFAULT_MIX: dict[str, float] = {
+        "circle": 0.5,
+        "brick": 0.25,
+        "rod": 0.05,
+        "polygon": 0.1,
+        "teleport": 0.1,
+}
+
+_MOVEMENT_TYPES = [
+        MovementType.VERTICAL_CYCLE,
+        MovementType.HORIZONTAL_CYCLE,
+        MovementType.CIRCLE,
+        MovementType.ROTATE,
+        MovementType.HORIZONTAL_INFINITY,
+]
+
+
+def _point(rng: random.Random) -> Point2D:
+    return Point2D(float(rng.randint(-400, 400)), float(rng.randint(-300, 300)))
+
+
+def _movement(rng: random.Random) -> Movement:
+    return Movement(
+            main_link_id=1,
+            is_reversed=rng.random() < 0.5,
+            movement_type=MovementType.CIRCLE,
+            anchor_point=_point(rng),
+            time_period=rng.randint(100, 1000),
+            initial_frame=None,
+            radius_1=rng.randint(10, 100),
+            radius_2=None,
+            initial_phase=None,
+            move_rotation=None,
+            pause_1_duration=None,
+            pause_2_duration=None,
+            pause_1_phase_percentage=None,
+            pause_2_phase_percentage=None,
+            post_delay_phase=None,
+            max_angle=None,
+            unknown_11=None,
+            rotation_value=None,
+            submovement_offset=None,
+            submovement_link_id=None,
+            submovement_=None,
+            mystery_point=None,
+            unknown_15=False,
+    )
+
+
+def _generic(rng: random.Random, movement: Movement | None) -> GenericObject:
+    return GenericObject(
+            rolliness=None,
+            bounciness=None,
+            peg_data=PegInfo(
+                    type=1,
+                    unknown_0=False,
+                    can_be_orange=rng.random() < 0.25,
+                    unknown_2=None,
+                    can_quick_disappear=False,
+                    unknown_4=None,
+                    unknown_5=None,
+                    unknown_6=False,
+                    unknown_7=None,
+            ),
+            movement_data=movement,
+            unknown_4=None,
+            has_collision=True,
+            is_visible=True,
+            can_move=movement is not None,
+            fill_color=None,
+            outline_color=None,
+            image_name=None,
+            image_dx=None,
+            image_dy=None,
+            image_rotation=None,
+            is_background=False,
+            is_base_object=False,
+            unknown_16=None,
+            id=None,
+            unknown_18=None,
+            sound=None,
+            is_ball_stop_reset=False,
+            logic=None,
+            is_foreground=False,
+            max_bounce_velocity=None,
+            is_draw_sort=False,
+            is_foreground2=False,
+            sub_id=None,
+            flipper_flags=None,
+            is_draw_float=False,
+            unknown_29=False,
+            has_shadow=True,
+            unknown_31=False,
+    )
+
+
+def _circle(rng: random.Random) -> Circle:
+    return Circle(
+            radius=10.0,
+            has_normal_physics=False,
+            position=_point(rng),
+            unknown_2=False,
+            unknown_3=False,
+            unknown_4=False,
+            unknown_5=False,
+            unknown_6=False,
+            unknown_7=False,
+            extended_flag=CircleExtendedFlag(0),
+    )
+
+
+def _teleport(rng: random.Random, exit_object: PeggleObject) -> Teleport:
+    return Teleport(
+            width=20,
+            height=20,
+            unknown_0=False,
+            unknown_1=None,
+            entry_coordinates=_point(rng),
+            unknown_3=None,
+            subobject=exit_object,
+            subobject_link_id=None,
+            unknown_5=None,
+            unknown_6=None,
+            unknown_7=False,
+    )
+
+
+def _mixed_movement(rng: random.Random) -> Movement:
+    movement = _movement(rng)
+    movement.movement_type = rng.choice(_MOVEMENT_TYPES)
+    if rng.random() < 0.5:
+        movement.initial_phase = rng.randint(0, 100)
+    if rng.random() < 0.25:
+        movement.pause_1_duration = rng.randint(0, 50)
+        movement.pause_1_phase_percentage = rng.randint(0, 100)
+    return movement
+
+
+def _brick(rng: random.Random) -> Brick:
+    is_curved = rng.random() < 0.5
+    return Brick(
+            length=float(rng.randint(20, 80)),
+            rotation_angle=float(rng.randint(0, 359)),
+            unknown_bytes=[0, 0, 0, 0],
+            unknown_a0=False,
+            unknown_a1=None,
+            unknown_a2=None,
+            unknown_a3=None,
+            position=_point(rng),
+            unknown_a5=None,
+            unknown_a6=False,
+            unknown_a7=False,
+            unknown_a8=None,
+            unknown_a9=None,
+            unknown_a10=None,
+            unknown_a11=False,
+            unknown_a12=False,
+            unknown_a13=False,
+            unknown_a14=False,
+            unknown_a15=False,
+            unknown_b0=False,
+            unknown_b1=False,
+            unknown_b2=None,
+            curve_points=rng.randint(3, 8) if is_curved else 2,
+            sector_angle=rng.randint(10, 90) if is_curved else None,
+            left_slant=None,
+            unknown_b6=None,
+            right_slant=None,
+            width=20.0,
+            unknown_b8=None,
+            unknown_b9=None,
+            is_flipped_texture=rng.random() < 0.5,
+            unknown_b11=False,
+            unknown_b12=False,
+            unknown_b13=False,
+            unknown_b14=False,
+            unknown_b15=False,
+    )
+
+
+def _rod(rng: random.Random) -> Rod:
+    return Rod(point_a=_point(rng), point_b=_point(rng))
+
+
+def _polygon(rng: random.Random) -> Polygon:
+    # a regular polygon, with vertices rounded to values float32 holds exactly
+    corner_count = rng.randint(3, 8)
+    radius = rng.randint(10, 60)
+    vertices = array("f")
+    for corner in range(corner_count):
+        angle = 2 * math.pi * corner / corner_count
+        vertices.extend((round(radius * math.cos(angle)), round(radius * math.sin(angle))))
+    return Polygon(
+            vertices=vertices,
+            unknown_0=False,
+            normal_direction=None,
+            rotation_angle=float(rng.randint(0, 359)) if rng.random() < 0.5 else None,
+            unknown_3=None,
+            position=_point(rng),
+            scale=None,
+            unknown_6=False,
+            unknown_7=False,
+            unknown_8=None,
+            grow_type=None,
+            unknown_10=False,
+            unknown_11=False,
+            unknown_12=False,
+            unknown_13=False,
+            unknown_14=False,
+            unknown_15=False,
+    )
+
+
+def build_level(object_count: int, seed: int = 0) -> Level:
+    """
+    Build a level of round pegs, a quarter of which move, with every eighth moving peg riding on the movement of an
+    earlier peg and every sixteenth object being a teleport to an earlier static peg.
+    :param object_count: Number of top-level objects in the level.
+    :param seed: Seed for the positions and movement parameters.
+    :return: Level with all nested objects still linked.
+    """
+    rng = random.Random(seed)
+    objects: list[PeggleObject] = []
+    moving: list[PeggleObject] = []
+    static: list[PeggleObject] = []
+
+    for i in range(object_count):
+        if i % 16 == 15 and static:
+            obj = PeggleObject(_generic(rng, None), _teleport(rng, rng.choice(static)))
+            objects.append(obj)
+            continue
+
+        movement = _movement(rng) if i % 4 == 0 else None
+        if movement is not None and i % 32 == 0 and moving:
+            movement.submovement_ = rng.choice(moving).movement_data
+            movement.submovement_offset = _point(rng)
+
+        obj = PeggleObject(_generic(rng, movement), _circle(rng))
+        objects.append(obj)
+        (moving if movement is not None else static).append(obj)
+
+    return Level(SYNTHETIC_FILE_VERSION, objects)
+
+
+def build_mixed_level(
+        object_count: int,
+        seed: int = 0,
+        mix: dict[str, float] | None = None,
+        moving_share: float = 0.25,
+        submovement_share: float = 0.125,
+) -> Level:
+    """
+    Build a level of objects of every kind, drawn at random with the weights in `mix`. Moving objects may ride on
+    the movement of an earlier moving object, which may itself ride on another, and teleports lead to an earlier
+    static object. The same arguments always give the same level.
+    :param object_count: Number of top-level objects in the level.
+    :param seed: Seed for the kinds of the objects and all of their values.
+    :param mix: Relative weight of every kind of object, by "circle", "brick", "rod", "polygon" and "teleport".
+    Defaults to `DEFAULT_MIX`.
+    :param moving_share: Share of objects, other than teleports, that move.
+    :param submovement_share: Share of moving objects whose movement has a submovement.
+    :return: Level with all nested objects still linked.
+    """
+    if mix is None:
+        mix = DEFAULT_MIX
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=object_count)
+    builders = {"circle": _circle, "brick": _brick, "rod": _rod, "polygon": _polygon}
+    objects: list[PeggleObject] = []
+    moving: list[PeggleObject] = []
+    static: list[PeggleObject] = []
+
+    for kind in kinds:
+        if kind == "teleport" and static:
+            objects.append(PeggleObject(_generic(rng, None), _teleport(rng, rng.choice(static))))
+            continue
+
+        movement = _mixed_movement(rng) if rng.random() < moving_share else None
+        if movement is not None and moving and rng.random() < submovement_share:
+            movement.submovement_ = rng.choice(moving).movement_data
+            movement.submovement_offset = _point(rng)
+
+        # a teleport without an earlier static object to lead to becomes a circle
+        obj = PeggleObject(_generic(rng, movement), builders.get(kind, _circle)(rng))
+        objects.append(obj)
+        (moving if movement is not None else static).append(obj)
+
+    return Level(SYNTHETIC_FILE_VERSION, objects)
+
+
+def build_level_data(object_count: int, seed: int = 0, mixed: bool = False) -> bytes:
+    """
+    Build a synthetic level as with `build_level`, or `build_mixed_level` if `mixed`, and encode it.
+    :return: Contents of the equivalent .dat file.
+    """
+    stream = BytesIO()
+    level = build_mixed_level(object_count, seed) if mixed else build_level(object_count, seed)
+    level.write_data(PeggleDataWriter(stream))
+    return stream.getvalue()
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import asyncio
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from unittest import TestCase
+
+from level.async_loading import AsyncLevelLoader
+from level.level_data import Level
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+class TestAsyncLoading(TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.levels: dict[Path, bytes] = {}
+        for seed in range(4):
+            path = Path(self.temporary_directory.name) / f"{seed}.dat"
+            self.levels[path] = build_level_data(100, seed=seed)
+            path.write_bytes(self.levels[path])
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def check_levels(self, levels: list[Level]):
+        for level, data in zip(levels, self.levels.values()):
+            stream = BytesIO()
+            level.write_data(PeggleDataWriter(stream))
+            self.assertEqual(stream.getvalue(), data)
+
+    def test_aread(self):
+        async def read_all():
+            return await asyncio.gather(*map(Level.aread, self.levels))
+
+        self.check_levels(asyncio.run(read_all()))
+
+    def test_process_pool(self):
+        loader = AsyncLevelLoader(ProcessPoolExecutor(2))
+
+        async def read_all():
+            return await asyncio.gather(*(Level.aread(path, loader) for path in self.levels))
+
+        try:
+            self.check_levels(asyncio.run(read_all()))
+        finally:
+            loader.close()
+
+    def test_backpressure_and_cancellation(self):
+        loader = AsyncLevelLoader(max_pending=2)
+        lock = threading.Lock()
+        running = peak = 0
+
+        def decode(data: bytes) -> int:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return len(data)
+
+        async def load_all():
+            tasks = [asyncio.create_task(loader.load(path, decode)) for path in self.levels]
+            await asyncio.sleep(0)
+            tasks[-1].cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            results = asyncio.run(load_all())
+        finally:
+            loader.close()
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(results[:-1], [len(data) for data in list(self.levels.values())[:-1]])
+        self.assertIsInstance(results[-1], asyncio.CancelledError)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from level.batch import ConversionResult, convert_directory, convert_file
+from level.level_data import Level
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+def _crash_on_broken(source: Path, destination: Path, output_format: str) -> ConversionResult:
+    if source.name == "broken.dat":
+        os._exit(1)
+    return convert_file(source, destination, output_format)
+
+
+def _dump_partially(_, f):
+    f.write("{")
+    raise RuntimeError("dump failed")
+
+
+class TestBatch(TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        root = Path(self.temporary_directory.name)
+        self.source = root / "levels"
+        self.destination = root / "dumps"
+
+        self.levels = {
+            Path("a.dat"): build_level_data(50, seed=1),
+            Path("nested/b.dat"): build_level_data(80, seed=2),
+        }
+        for path, data in self.levels.items():
+            (self.source / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.source / path).write_bytes(data)
+        (self.source / "nested/broken.dat").write_bytes(b"\x52\x00\x00\x00\x01\x05\x00\x00\x00")
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_convert_json(self):
+        results = {
+            result.source.relative_to(self.source): result
+            for result in convert_directory(self.source, self.destination, "json", max_workers=2)
+        }
+        self.assertEqual(set(results), set(self.levels) | {Path("nested/broken.dat")})
+        self.assertIsNotNone(results[Path("nested/broken.dat")].error)
+
+        for path, data in self.levels.items():
+            self.assertIsNone(results[path].error)
+            self.assertEqual(results[path].size, len(data))
+            with open(self.destination / path.with_suffix(".json")) as f:
+                level = Level.load_json(f)
+            stream = BytesIO()
+            level.write_data(PeggleDataWriter(stream))
+            self.assertEqual(stream.getvalue(), data)
+
+    def test_convert_dat(self):
+        for result in convert_directory(self.source, self.destination, "dat", max_workers=2):
+            path = result.source.relative_to(self.source)
+            if path in self.levels:
+                self.assertEqual((self.destination / path).read_bytes(), self.levels[path])
+
+    def test_worker_crash(self):
+        # workers are forked, so they see the patched function
+        with patch("level.batch.convert_file", _crash_on_broken):
+            results = list(convert_directory(self.source, self.destination, "dat", max_workers=2))
+
+        results = {result.source.relative_to(self.source): result for result in results}
+        self.assertEqual(set(results), set(self.levels) | {Path("nested/broken.dat")})
+        self.assertIn("BrokenProcessPool", results[Path("nested/broken.dat")].error)
+
+    def test_no_partial_file(self):
+        destination = self.destination / "a.json"
+        with patch.object(Level, "dump_json", _dump_partially):
+            result = convert_file(self.source / "a.dat", destination)
+
+        self.assertIn("dump failed", result.error)
+        self.assertEqual(list(self.destination.iterdir()), [])
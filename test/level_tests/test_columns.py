@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import math
+from array import array
+from unittest import TestCase
+
+from level.level_columns import LevelColumns
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level_tests.synthetic import build_level_data
+
+
+def _float32(value: float) -> float:
+    return array("f", [value])[0]
+
+
+class TestLevelColumns(TestCase):
+    def test_matches_objects(self):
+        data = build_level_data(500, seed=3)
+        level = Level.read_data(PeggleBufferReader(data))
+        columns = LevelColumns.read_data(PeggleBufferReader(data))
+
+        self.assertEqual(len(columns), len(level.level_objects))
+        for i, obj in enumerate(level.level_objects):
+            with self.subTest(i=i):
+                generic_data, specific_data = obj.generic_data, obj.specific_data
+                self.assertEqual(columns.object_type[i], specific_data.TYPE_VALUE)
+
+                position = getattr(specific_data, "position", None)
+                if position is None:
+                    self.assertTrue(math.isnan(columns.x[i]) and math.isnan(columns.y[i]))
+                else:
+                    self.assertEqual((columns.x[i], columns.y[i]), (_float32(position.x), _float32(position.y)))
+
+                radius = getattr(specific_data, "radius", None)
+                if radius is None:
+                    self.assertTrue(math.isnan(columns.radius[i]))
+                else:
+                    self.assertEqual(columns.radius[i], _float32(radius))
+
+                peg_data = generic_data.peg_data
+                self.assertEqual(columns.peg_type[i], -1 if peg_data is None else peg_data.type)
+                self.assertEqual(columns.can_be_orange[i], peg_data is not None and peg_data.can_be_orange)
+
+                movement = generic_data.movement_data
+                self.assertEqual(columns.movement_type[i], 0 if movement is None else int(movement.movement_type))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import TestCase
+
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level
+from objects.flag_codec import FlagCodec, FlagField
+from objects.flags import FlipperFlag
+
+_CODEC = FlagCodec(
+        "test",
+        [
+                FlagField(1, "maybe_int", "int"),
+                FlagField(2, "is_set", "bool"),
+                FlagField(4, ("first", "second"), "float"),
+                FlagField(8, "count", "byte", default=2),
+                FlagField(16, "is_new", "bool", default=True, min_version=10),
+        ],
+)
+
+
+class TestFlagCodec(TestCase):
+    @staticmethod
+    def round_trip(obj: SimpleNamespace, file_version: int) -> tuple[int, dict]:
+        stream = BytesIO()
+        flag = _CODEC.write(obj, file_version, PeggleDataWriter(stream))
+        reader = PeggleBufferReader(stream.getvalue())
+        values = _CODEC.read(file_version, reader, flag, {})
+        assert reader.position == len(stream.getvalue())
+        return flag, values
+
+    def test_all_set(self):
+        obj = SimpleNamespace(maybe_int=-7, is_set=True, first=1.5, second=-2.0, count=5, is_new=True)
+        flag, values = self.round_trip(obj, 10)
+        self.assertEqual(flag, 31)
+        self.assertEqual(values, vars(obj))
+
+    def test_defaults(self):
+        obj = SimpleNamespace(maybe_int=None, is_set=False, first=None, second=None, count=2, is_new=False)
+        flag, values = self.round_trip(obj, 10)
+        self.assertEqual(flag, 0)
+        self.assertEqual(values, vars(obj))
+
+    def test_version_gate(self):
+        obj = SimpleNamespace(maybe_int=None, is_set=False, first=None, second=None, count=2, is_new=True)
+        flag, values = self.round_trip(obj, 9)
+        self.assertEqual(flag, 0)
+        self.assertTrue(values["is_new"])
+
+
+class TestLazyFlags(TestCase):
+    def test_raw_value(self):
+        generic_data = build_level(1).level_objects[0].generic_data
+        generic_data.flipper_flags = FlipperFlag.UNKNOWN_0 | FlipperFlag.UNKNOWN_3
+        self.assertIs(type(generic_data._flipper_flags), int)
+        self.assertEqual(generic_data._flipper_flags, 9)
+        self.assertEqual(generic_data.flipper_flags, FlipperFlag.UNKNOWN_0 | FlipperFlag.UNKNOWN_3)
+        self.assertIsInstance(generic_data.flipper_flags, FlipperFlag)
+
+        generic_data.flipper_flags = None
+        self.assertIsNone(generic_data._flipper_flags)
+        self.assertIsNone(generic_data.flipper_flags)
+        self.assertFalse(hasattr(generic_data, "__dict__"))
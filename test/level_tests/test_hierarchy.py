@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from unittest import TestCase
+
+from level_tests.synthetic import build_level
+from objects.errors import HierarchyCycleError
+
+
+class TestHierarchy(TestCase):
+    def test_depths_match_complexity(self):
+        level = build_level(500)
+        depths = level.get_hierarchy_depths()
+        for obj in level.level_objects:
+            self.assertEqual(depths[id(obj)], obj.complexity)
+
+    def test_movement_cycle_is_detected(self):
+        level = build_level(100)
+        movements = [obj.movement_data for obj in level.level_objects if obj.movement_data is not None]
+        movements[0].submovement_ = movements[1]
+        movements[1].submovement_ = movements[0]
+        with self.assertRaises(HierarchyCycleError):
+            level.sort_level_objects()
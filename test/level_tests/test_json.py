@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+class TestJson(TestCase):
+    @staticmethod
+    def recompile(level: Level) -> bytes:
+        stream = BytesIO()
+        level.write_data(PeggleDataWriter(stream))
+        return stream.getvalue()
+
+    def test_load_linked_dump(self):
+        data = build_level_data(300)
+        dump = StringIO()
+        Level.read_data(PeggleBufferReader(data)).dump_json(dump)
+
+        dump.seek(0)
+        level = Level.load_json(dump)
+        self.assertEqual(self.recompile(level), data)
+
+    def test_load_unlinked_dump(self):
+        data = build_level_data(300)
+        level = Level.read_data(PeggleBufferReader(data))
+        dump = StringIO()
+        level.write_data(PeggleDataWriter(BytesIO()), json_dump=dump)
+
+        dump.seek(0)
+        level = Level.load_json(dump)
+        self.assertEqual(self.recompile(level), data)
@@ -10,11 +10,12 @@ from io import BytesIO
 from unittest import TestCase
 
 from level.level_data import Level
-from level.level_reader import PeggleDataReader
+from level.level_reader import PeggleDataReader, PeggleBufferReader
 
 import logging
 
 from level.level_writer import PeggleDataWriter
+from level.tracing import TracingReader
 
 _LOGS_PATH = "./logs/logs.txt"
 
@@ -81,6 +82,29 @@ class TestLevel(TestCase):
 
                 self.assertEqual(data, data2)
 
+    def read_buffered_and_compare(self, level_directory: str):
+        for f, filename in self.get_levels(level_directory):
+            with self.subTest(filename=filename):
+                level = Level.read_data(PeggleBufferReader.from_file(f))
+                f.seek(0)
+                level2 = Level.read_data(PeggleDataReader(f))
+
+                self.assertEqual(level.file_version, level2.file_version)
+                self.assertEqual(level.level_objects, level2.level_objects)
+
+    def read_traced_and_compare(self, level_directory: str):
+        for f, filename in self.get_levels(level_directory):
+            with self.subTest(filename=filename):
+                data = f.read()
+                reader = TracingReader(PeggleBufferReader(data))
+                level = Level.read_data(reader)
+                level2 = Level.read_data(PeggleBufferReader(data))
+
+                self.assertEqual(level.level_objects, level2.level_objects)
+                offsets = [entry.offset for entry in reader.trace]
+                self.assertEqual(offsets, sorted(offsets))
+                self.assertEqual(reader.position, len(data))
+
     def read_and_export_data_twice(self, level_directory: str):
         for f, filename in self.get_levels(level_directory):
             with self.subTest(filename=filename):
@@ -202,6 +226,14 @@ class TestLevel(TestCase):
         level_directory = "./level_tests/levels/7) submovements"
         self.read_and_export_data_twice(level_directory)
 
+    def test_read_buffered_submovements(self):
+        level_directory = "./level_tests/levels/7) submovements"
+        self.read_buffered_and_compare(level_directory)
+
+    def test_read_traced_teleports(self):
+        level_directory = "./level_tests/levels/8) teleports"
+        self.read_traced_and_compare(level_directory)
+
     def test_read_data_teleports(self):
         level_directory = "./level_tests/levels/8) teleports"
         self.read_and_dump_data(level_directory)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import TestCase
+
+from level.level_cache import LevelCache
+from level.level_data import Level
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+class TestLevelCache(TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache = LevelCache(self.temporary_directory.name)
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def entries(self) -> list[Path]:
+        return sorted(Path(self.temporary_directory.name).glob("*.pickle"))
+
+    def test_hit(self):
+        data = build_level_data(200, seed=4)
+        self.cache.read_bytes(data)
+        self.assertEqual(len(self.entries()), 1)
+
+        level = self.cache.read_bytes(data)
+        self.assertEqual(len(self.entries()), 1)
+
+        # shared entries keep their identity through the cache
+        self.assertEqual(level.add_to_joint_object_order(level.level_objects[0]), None)
+        self.assertEqual(len(level.movement_pool), len({id(movement) for movement in level.movement_pool}))
+
+        stream = BytesIO()
+        level.write_data(PeggleDataWriter(stream))
+        self.assertEqual(stream.getvalue(), data)
+
+    def test_eviction(self):
+        first, second = build_level_data(100, seed=1), build_level_data(100, seed=2)
+        self.cache.read_bytes(first)
+        (entry,) = self.entries()
+        self.cache.max_bytes = entry.stat().st_size * 3 // 2
+        os.utime(entry, (0, 0))
+
+        self.cache.read_bytes(second)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertNotEqual(self.entries(), [entry])
+
+    def test_corrupt_entry(self):
+        data = build_level_data(50, seed=3)
+        self.cache.read_bytes(data)
+        (entry,) = self.entries()
+        entry.write_bytes(b"not a pickle")
+
+        self.assertIsInstance(self.cache.read_bytes(data), Level)
+        self.assertNotEqual(entry.read_bytes(), b"not a pickle")
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from io import BytesIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_index import LazyLevel
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+class TestLazyLevel(TestCase):
+    def setUp(self) -> None:
+        self.data = build_level_data(300, seed=5)
+        self.level = Level.read_data(PeggleBufferReader(self.data))
+        self.lazy_level = LazyLevel.read_data(PeggleBufferReader(self.data))
+
+    def test_random_access(self):
+        self.assertEqual(len(self.lazy_level), len(self.level.level_objects))
+        for i in reversed(range(len(self.lazy_level))):
+            self.assertEqual(self.lazy_level[i], self.level.level_objects[i])
+        self.assertIs(self.lazy_level[-1], self.lazy_level[len(self.lazy_level) - 1])
+
+    def test_to_level(self):
+        level = self.lazy_level.to_level()
+        self.assertEqual(len(level.joint_object_order), len(self.level.joint_object_order))
+        self.assertEqual(len(level.movement_pool), len(self.level.movement_pool))
+
+        stream = BytesIO()
+        level.write_data(PeggleDataWriter(stream))
+        self.assertEqual(stream.getvalue(), self.data)
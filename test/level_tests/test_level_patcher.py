@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from level.level_data import Level
+from level.level_patcher import LevelPatcher
+from level.level_reader import PeggleBufferReader
+from level_tests.synthetic import build_level_data
+from objects.object import PeggleObject
+from objects.point_2d import Point2D
+from objects.specific.circle import Circle
+
+
+class TestLevelPatcher(TestCase):
+    def setUp(self) -> None:
+        self.data = build_level_data(200, seed=6)
+        with tempfile.NamedTemporaryFile(suffix=".dat", delete=False) as f:
+            f.write(self.data)
+        self.path = f.name
+        self.level = Level.read_data(PeggleBufferReader(self.data))
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def read_patched(self) -> Level:
+        with open(self.path, "rb") as f:
+            return Level.read_data(PeggleBufferReader(f.read()))
+
+    def test_locate(self):
+        with LevelPatcher(self.path) as patcher:
+            for row, obj in enumerate(self.level.level_objects):
+                peg_data = obj.generic_data.peg_data
+                self.assertEqual(patcher.get(row, "generic_data.peg_data.type"), peg_data.type)
+                self.assertEqual(patcher.get(row, "generic_data.peg_data.can_be_orange"), peg_data.can_be_orange)
+                if isinstance(obj.specific_data, Circle):
+                    self.assertEqual(patcher.get(row, "specific_data.position"), obj.specific_data.position)
+                    self.assertEqual(patcher.get(row, "specific_data.radius"), obj.specific_data.radius)
+
+    def test_single_scan(self):
+        locate_data = PeggleObject.locate_data
+        with patch.object(PeggleObject, "locate_data", side_effect=locate_data) as scan:
+            with LevelPatcher(self.path) as patcher:
+                for row in range(len(patcher)):
+                    patcher.set(row, "generic_data.peg_data.can_be_orange", True)
+        self.assertEqual(scan.call_count, len(self.level.level_objects))
+
+    def test_in_place(self):
+        circles = [row for row, obj in enumerate(self.level.level_objects) if isinstance(obj.specific_data, Circle)]
+        with LevelPatcher(self.path) as patcher:
+            for row in circles:
+                position = patcher.get(row, "specific_data.position")
+                self.assertTrue(patcher.set(row, "specific_data.position", Point2D(position.x + 1.0, position.y)))
+                self.assertTrue(patcher.set(row, "generic_data.peg_data.can_be_orange", True))
+                self.assertTrue(patcher.set(row, "generic_data.peg_data.type", 2))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(len(f.read()), len(self.data))
+        patched_objects = self.read_patched().level_objects
+        for row in circles:
+            obj, patched = self.level.level_objects[row], patched_objects[row]
+            self.assertEqual(patched.specific_data.position.x, obj.specific_data.position.x + 1.0)
+            self.assertTrue(patched.generic_data.peg_data.can_be_orange)
+            self.assertEqual(patched.generic_data.peg_data.type, 2)
+
+    def test_layout_change(self):
+        with LevelPatcher(self.path) as patcher:
+            self.assertFalse(patcher.set(3, "generic_data.image_name", "peg.png"))
+            self.assertFalse(patcher.set(3, "generic_data.is_visible", False))
+            self.assertEqual(patcher.get(3, "generic_data.image_name"), "peg.png")
+            patcher.flush()
+            self.assertEqual(patcher.get(3, "generic_data.image_name"), "peg.png")
+
+        patched = self.read_patched().level_objects[3]
+        self.assertEqual(patched.generic_data.image_name, "peg.png")
+        self.assertFalse(patched.generic_data.is_visible)
+
+    def test_failed_flush(self):
+        with self.assertRaises(UnicodeEncodeError):
+            with LevelPatcher(self.path) as patcher:
+                patcher.set(3, "generic_data.image_name", "p\u00e9g.png")
+
+        self.assertTrue(patcher._mapping.closed)
+        self.assertTrue(patcher._file.closed)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
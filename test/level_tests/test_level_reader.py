@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import os
+import tempfile
+from io import BytesIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader, PeggleMappedReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+
+
+class TestMappedReader(TestCase):
+    def setUp(self) -> None:
+        self.data = build_level_data(200, seed=7)
+        with tempfile.NamedTemporaryFile(suffix=".dat", delete=False) as f:
+            f.write(self.data)
+        self.path = f.name
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def test_read(self):
+        with PeggleMappedReader(self.path) as f:
+            level = Level.read_data(f)
+            self.assertEqual(f.position, len(self.data))
+
+        stream = BytesIO()
+        level.write_data(PeggleDataWriter(stream))
+        self.assertEqual(stream.getvalue(), self.data)
+
+    def test_empty_file(self):
+        with open(self.path, "wb"):
+            pass
+        with PeggleMappedReader(self.path) as f:
+            self.assertEqual(len(f.buffer), 0)
+
+
+class TestStrings(TestCase):
+    def test_shared_table(self):
+        stream = BytesIO()
+        writer = PeggleDataWriter(stream)
+        for name in ["peg.png", "brick.png", "peg.png"]:
+            writer.write_string(name)
+        data = stream.getvalue()
+        self.assertEqual(data[:9], b"\x07\x00peg.png")
+
+        strings: dict[bytes, str] = {}
+        first, second = PeggleBufferReader(data, strings=strings), PeggleBufferReader(data, strings=strings)
+        names = [first.read_string() for _ in range(3)]
+        self.assertEqual(names, ["peg.png", "brick.png", "peg.png"])
+        self.assertIs(names[0], names[2])
+        self.assertIs(second.read_string(), names[0])
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from io import BytesIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader, PeggleDataReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+from objects.specific.teleport import Teleport
+
+
+class TestLevelStream(TestCase):
+    def setUp(self) -> None:
+        self.data = build_level_data(300, seed=9)
+        self.level = Level.read_data(PeggleBufferReader(self.data))
+
+    def test_iter_objects(self):
+        stream = Level.iter_objects(PeggleBufferReader(self.data))
+        self.assertEqual(stream.file_version, self.level.file_version)
+        self.assertEqual(stream.object_count, len(self.level.level_objects))
+
+        objects = list(stream)
+        self.assertEqual([obj.to_json() for obj in objects], [obj.to_json() for obj in self.level.level_objects])
+
+        # nested entries are the objects yielded earlier, not copies
+        ids = {id(obj) for obj in objects}
+        movement_ids = {id(obj.movement_data) for obj in objects if obj.movement_data is not None}
+        for obj in objects:
+            if isinstance(obj.specific_data, Teleport):
+                self.assertIn(id(obj.specific_data.subobject), ids)
+            if obj.movement_data is not None and obj.movement_data.submovement_ is not None:
+                self.assertIn(id(obj.movement_data.submovement_), movement_ids)
+
+    def test_release_entries(self):
+        expected = [obj.to_json() for obj in self.level.level_objects]
+        released = Level.iter_objects(PeggleBufferReader(self.data), release_entries=True)
+        self.assertEqual([obj.to_json() for obj in released], expected)
+        # every link id was resolved, so nothing is left to refer to
+        self.assertEqual(released.retained_count, 0)
+
+        kept = Level.iter_objects(PeggleDataReader(BytesIO(self.data)))
+        self.assertEqual([obj.to_json() for obj in kept], expected)
+        self.assertGreaterEqual(kept.retained_count, len(expected))
+
+        with self.assertRaises(ValueError):
+            Level.iter_objects(PeggleDataReader(BytesIO(self.data)), release_entries=True)
+
+    def test_write_objects(self):
+        stream = BytesIO()
+        count = Level.write_objects(PeggleDataWriter(stream), self.level.file_version, iter(self.level.level_objects))
+        self.assertEqual(count, len(self.level.level_objects))
+        self.assertEqual(stream.getvalue(), self.data)
+
+    def test_write_filtered(self):
+        objects = Level.iter_objects(PeggleBufferReader(self.data))
+        teleports = (obj for obj in objects if isinstance(obj.specific_data, Teleport))
+        stream = BytesIO()
+        count = Level.write_objects(PeggleDataWriter(stream), objects.file_version, teleports)
+
+        # exits are written along with their teleports
+        level = Level.read_data(PeggleBufferReader(stream.getvalue()))
+        self.assertEqual(len(level.level_objects), count)
+        teleports = [obj for obj in level.level_objects if isinstance(obj.specific_data, Teleport)]
+        exits = {id(obj.specific_data.subobject) for obj in teleports}
+        self.assertEqual(len(level.level_objects), len(teleports) + len(exits))
+
+    def test_write_unwritten_submovement(self):
+        moving = [obj for obj in self.level.level_objects if obj.movement_data is not None]
+        moving[0].movement_data.submovement_ = moving[1].movement_data
+        with self.assertRaises(ValueError):
+            Level.write_objects(PeggleDataWriter(BytesIO()), self.level.file_version, moving)
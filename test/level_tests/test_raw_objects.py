@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+import pickle
+from io import BytesIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader, PeggleDataReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data
+from objects.flags import FlipperFlag
+from objects.object import PeggleObject
+from objects.specific.brick import Brick
+from objects.specific.polygon import Polygon
+
+
+def _encode(level: Level) -> bytes:
+    stream = BytesIO()
+    level.write_data(PeggleDataWriter(stream))
+    return stream.getvalue()
+
+
+class TestRawObjects(TestCase):
+    def setUp(self) -> None:
+        self.data = build_level_data(300, seed=8)
+        self.level = Level.read_data(PeggleBufferReader(self.data), keep_raw=True)
+        self.reference = Level.read_data(PeggleBufferReader(self.data))
+
+    def test_unmodified(self):
+        self.assertEqual(len(self.level.raw_objects), len(self.level.level_objects))
+        self.assertEqual(_encode(self.level), self.data)
+        self.assertEqual(_encode(self.reference), self.data)
+        # link ids of the second write differ from the file, see `Level.sort_level_objects`
+        self.assertEqual(_encode(self.level), _encode(self.reference))
+
+    def test_stream_reader(self):
+        level = Level.read_data(PeggleDataReader(BytesIO(self.data)), keep_raw=True)
+        self.assertEqual(len(level.raw_objects), len(level.level_objects))
+        self.assertEqual(_encode(level), self.data)
+
+    def test_modified(self):
+        for level in (self.level, self.reference):
+            level.level_objects[10].specific_data.position.x += 1.0
+            level.level_objects[20].generic_data.is_visible = False
+            level.level_objects[30].generic_data.peg_data.can_be_orange ^= True
+
+        data = _encode(self.level)
+        self.assertEqual(data, _encode(self.reference))
+        self.assertNotEqual(data, self.data)
+        self.assertEqual(len(self.level.raw_objects), len(self.level.level_objects) - 3)
+
+    def test_file_version(self):
+        self.level.file_version = self.reference.file_version = 4
+        self.assertEqual(_encode(self.level), _encode(self.reference))
+
+    def test_tracked_edits(self):
+        data = build_level_data(300, seed=8, mixed=True)
+        reference = Level.read_data(PeggleBufferReader(data))
+        # colors are not generated, give one object some to edit
+        reference.level_objects[0].generic_data.fill_color = [1, 2, 3, 4]
+        data = _encode(reference)
+        level = Level.read_data(PeggleBufferReader(data), keep_raw=True)
+        reference = Level.read_data(PeggleBufferReader(data))
+
+        used = set()
+
+        def pick(predicate) -> int:
+            row = next(row for row, obj in enumerate(level.level_objects) if row not in used and predicate(obj))
+            used.add(row)
+            return row
+
+        def color(obj: PeggleObject):
+            obj.generic_data.fill_color[0] = 9
+
+        def peg(obj: PeggleObject):
+            peg_data = obj.generic_data.peg_data
+            peg_data.can_be_orange = not peg_data.can_be_orange
+
+        def anchor(obj: PeggleObject):
+            obj.movement_data.anchor_point.x += 1.0
+
+        def width(obj: PeggleObject):
+            obj.specific_data.width += 1.0
+
+        def unknown_byte(obj: PeggleObject):
+            obj.specific_data.unknown_bytes[0] ^= 1
+
+        def vertex(obj: PeggleObject):
+            obj.specific_data.vertices[0] += 1.0
+
+        def is_brick(obj: PeggleObject) -> bool:
+            return isinstance(obj.specific_data, Brick)
+
+        edits = [
+                (pick(lambda obj: obj.generic_data.fill_color), color),
+                (pick(bool), lambda obj: setattr(obj.generic_data, "is_visible", False)),
+                (pick(bool), lambda obj: setattr(obj.generic_data, "flipper_flags", FlipperFlag(1))),
+                (pick(lambda obj: obj.generic_data.peg_data), peg),
+                (pick(lambda obj: obj.movement_data), anchor),
+                (pick(is_brick), unknown_byte),
+                (pick(is_brick), width),
+                (pick(lambda obj: isinstance(obj.specific_data, Polygon)), vertex),
+        ]
+        for row, edit in edits:
+            with self.subTest(row=row):
+                raw = level.raw_objects[id(level.level_objects[row])]
+                self.assertFalse(raw.dirty)
+                edit(level.level_objects[row])
+                edit(reference.level_objects[row])
+                self.assertTrue(raw.dirty)
+
+        dirty = sum(raw.dirty for raw in level.raw_objects.values())
+        self.assertEqual(dirty, len(edits))
+        self.assertEqual(_encode(level), _encode(reference))
+
+    def test_unlinking(self):
+        data = build_level_data(300, seed=8, mixed=True)
+        level = Level.read_data(PeggleBufferReader(data), keep_raw=True)
+        reference = Level.read_data(PeggleBufferReader(data))
+        for _ in range(2):
+            level.link_nested_objects()
+            self.assertEqual(_encode(level), data)
+        level.link_nested_objects()
+        self.assertFalse(any(raw.dirty for raw in level.raw_objects.values()))
+        # tracked objects still compare equal to plain ones
+        self.assertEqual(level.level_objects, reference.level_objects)
+
+    def test_pickle(self):
+        level = pickle.loads(pickle.dumps(self.level))
+        obj = level.level_objects[10]
+        self.assertIs(type(pickle.loads(pickle.dumps(obj))), PeggleObject)
+        obj.specific_data.position.x += 1.0
+        self.reference.level_objects[10].specific_data.position.x += 1.0
+        self.assertTrue(level.raw_objects[id(obj)].dirty)
+        self.assertEqual(_encode(level), _encode(self.reference))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from collections.abc import Callable
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level_tests.synthetic import build_level_data
+from objects.movement_data import Movement
+from objects.object import PeggleObject
+
+_OBJECT_COUNT = 10_000
+
+
+def _counting(eq: Callable[[Any, Any], bool], counts: list[int]) -> Callable[[Any, Any], bool]:
+    def __eq__(self, other):
+        counts[0] += 1
+        return eq(self, other)
+
+    return __eq__
+
+
+class TestScaling(TestCase):
+    def test_read_compares_nothing(self):
+        # membership tests on the joint object order used to compare every object with the ones before it, making
+        # reads quadratic; with the identity set, reading compares no objects at all
+        data = build_level_data(_OBJECT_COUNT, mixed=True)
+        counts = [0]
+        with (
+                patch.object(PeggleObject, "__eq__", _counting(PeggleObject.__eq__, counts)),
+                patch.object(Movement, "__eq__", _counting(Movement.__eq__, counts)),
+        ):
+            level = Level.read_data(PeggleBufferReader(data))
+
+        self.assertEqual(len(level.level_objects), _OBJECT_COUNT)
+        self.assertEqual(counts[0], 0)
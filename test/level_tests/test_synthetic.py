@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026/10/18
+
+@author: brassbeat
+"""
+from io import BytesIO
+from unittest import TestCase
+
+from level.level_data import Level
+from level.level_reader import PeggleBufferReader
+from level.level_writer import PeggleDataWriter
+from level_tests.synthetic import build_level_data, build_mixed_level
+
+
+class TestSynthetic(TestCase):
+    def test_deterministic(self):
+        self.assertEqual(build_level_data(500, seed=3, mixed=True), build_level_data(500, seed=3, mixed=True))
+        self.assertNotEqual(build_level_data(500, seed=3, mixed=True), build_level_data(500, seed=4, mixed=True))
+
+    def test_round_trip(self):
+        for seed in range(4):
+            with self.subTest(seed=seed):
+                level = build_mixed_level(1000, seed)
+                stream = BytesIO()
+                level.write_data(PeggleDataWriter(stream))
+
+                decoded = Level.read_data(PeggleBufferReader(stream.getvalue()))
+                kinds = {type(obj.specific_data).__name__ for obj in decoded.level_objects}
+                self.assertEqual(kinds, {"Circle", "Brick", "Rod", "Polygon", "Teleport"})
+                self.assertGreater(max(decoded.get_hierarchy_depths().values()), 2)
+
+                decoded.unlink_nested_objects()
+                self.assertEqual(
+                        [obj.to_json() for obj in decoded.level_objects],
+                        [obj.to_json() for obj in level.level_objects],
+                )